@@ -15,16 +15,32 @@ import json
 import argparse
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Set, Tuple
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
 import requests
 import time
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from schema import SCHEMA_CONSTRAINTS
-from lib.wikidata_search import search_wikidata_for_work, validate_qid
+from lib.wikidata_search import (
+    search_wikidata_for_work, validate_qids, configure_cache, configure_entity_store, get_cache as get_wikidata_cache
+)
+from lib.wikidata_client import get_client as get_wikidata_client
+from lib.import_checkpoint import ImportCheckpoint
+from lib.batch_stream import iter_batch_records, iter_section, chunked
+from lib.adaptive_batch import AdaptiveBatchSizer, payload_size, DEFAULT_TARGET_LATENCY
+from lib.import_metrics import ImportMetrics, timed_stage
+from lib.similarity_cache import SimilarityCache
+from lib.phonetic_keys import METAPHONE_AVAILABLE, phonetic_keys, phonetic_probe
+from lib.work_dedupe import WorkDedupeIndex, YEAR_TOLERANCE as WORK_YEAR_TOLERANCE
+from lib.content_hash import (
+    CONTENT_HASH_PROPERTY, AUDIT_PROPERTIES, content_hash, fetch_node_hashes, fetch_relationship_hashes
+)
 
 # Import similarity detection (will use Levenshtein + phonetic)
 try:
@@ -34,6 +50,13 @@ except ImportError:
     THEFUZZ_AVAILABLE = False
     print("⚠️  Warning: thefuzz not available. Similarity detection will be basic.")
 
+# Similarity cache keys; bump the version whenever the scoring changes
+SIMILARITY_ALGORITHM = "batch_import.enhanced@1"
+FALLBACK_SIMILARITY_ALGORITHM = "batch_import.substring@1"
+
+# Records per UNWIND read when planning an import
+PLAN_READ_SIZE = 5000
+
 
 class BatchImportError(Exception):
     """Raised when batch import encounters an error."""
@@ -50,7 +73,10 @@ class BatchImporter:
     - Wikidata Q-ID validation
     - Batch transaction management
     - Dry-run mode with import preview
+    - Read-only plan mode (create/update/no-op diff from bulk reads)
+    - Content-hash fast path that skips records unchanged since the last import
     - Detailed logging and error reporting
+    - Per-stage timing, round-trip counts and slow-query log (self.metrics)
     - Automatic CREATED_BY attribution
     - Rollback on error
     """
@@ -62,7 +88,11 @@ class BatchImporter:
         pwd: str,
         dry_run: bool = True,
         batch_size: int = 50,
-        agent_name: str = "batch-importer"
+        agent_name: str = "batch-importer",
+        workers: int = 1,
+        adaptive_batching: bool = False,
+        target_latency: float = DEFAULT_TARGET_LATENCY,
+        content_hashing: bool = True
     ):
         """
         Initialize batch importer.
@@ -74,6 +104,13 @@ class BatchImporter:
             dry_run: If True, preview imports without committing
             batch_size: Number of records per transaction
             agent_name: Name of agent creating the data (for CREATED_BY)
+            workers: Number of concurrent sessions committing node chunks
+                (1 = sequential)
+            adaptive_batching: If True, batch_size is only the starting size;
+                chunks grow/shrink per stage from observed commit latency
+            target_latency: Commit latency (seconds) adaptive batching aims for
+            content_hashing: If True, skip records whose stored content_hash
+                matches the input (hashes are written either way)
         """
         # SSL certificate handling for Neo4j Aura
         if uri.startswith("neo4j+s://"):
@@ -83,6 +120,13 @@ class BatchImporter:
         self.dry_run = dry_run
         self.batch_size = batch_size
         self.agent_name = agent_name
+        self.workers = max(1, workers)
+        self.adaptive_batching = adaptive_batching
+        self.target_latency = target_latency
+        self.content_hashing = content_hashing
+
+        # Chunk size controllers, one per write stage (figures/works/relationships)
+        self.batch_sizers: Dict[str, AdaptiveBatchSizer] = {}
 
         # Import tracking
         self.batch_id = f"batch_import_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
@@ -93,10 +137,13 @@ class BatchImporter:
             "figures_created": 0,
             "figures_skipped_duplicate": 0,
             "figures_updated": 0,
+            "figures_unchanged": 0,
             "works_created": 0,
             "works_skipped_duplicate": 0,
             "works_updated": 0,
+            "works_unchanged": 0,
             "relationships_created": 0,
+            "relationships_unchanged": 0,
             "errors": [],
             "warnings": []
         }
@@ -106,26 +153,60 @@ class BatchImporter:
         self.duplicate_works: List[Dict] = []
         self.invalid_qids: List[Dict] = []
 
+        # Import plan by section (see plan_import) and no-op records dropped from the run
+        self.plan: Dict[str, List[Dict]] = {}
+        self.skipped_unchanged: Dict[str, int] = {}
+
+        # Resumable import journal (see attach_checkpoint)
+        self.checkpoint: Optional[ImportCheckpoint] = None
+
+        # Stage timings, Neo4j round trips and Wikidata HTTP calls
+        self.metrics = ImportMetrics()
+
+        # Name-pair scores shared with the other duplicate detectors
+        self.similarity_cache = SimilarityCache()
+
+    def attach_checkpoint(self, checkpoint: ImportCheckpoint):
+        """
+        Record progress in a checkpoint journal.
+
+        A resumed journal carries the original batch_id, so records written on
+        the retry are tagged with the same ingestion_batch as the first attempt.
+        """
+        self.checkpoint = checkpoint
+        self.batch_id = checkpoint.batch_id
+
     def close(self):
-        """Close database connection."""
+        """Close database connection and persist similarity scores."""
+        self.similarity_cache.close()
         self.driver.close()
 
+    @timed_stage("schema")
     def setup_schema(self):
         """Apply schema constraints from schema.py"""
         if self.dry_run:
             print("📋 [DRY RUN] Would verify schema constraints")
             return
 
+        if self.checkpoint and self.checkpoint.is_done("schema"):
+            print("♻️  Schema constraints already verified (checkpoint)")
+            return
+
         with self.driver.session() as session:
             for statement in SCHEMA_CONSTRAINTS.strip().split(';'):
                 if statement.strip():
                     try:
-                        session.run(statement)
+                        with self.metrics.query("schema constraint"):
+                            session.run(statement).consume()
                     except Exception as e:
                         # Constraint may already exist, that's OK
                         pass
         print("✅ Schema constraints verified.")
 
+        if self.checkpoint:
+            self.checkpoint.mark_done("schema")
+
+    @timed_stage("schema_validation", rows=lambda data: _count_batch_records(data))
     def validate_json_schema(self, data: Dict) -> Tuple[bool, List[str]]:
         """
         Validate JSON structure against expected schema.
@@ -147,11 +228,7 @@ class BatchImporter:
         if "metadata" not in data:
             errors.append("Missing required 'metadata' section")
         else:
-            metadata = data["metadata"]
-            required_meta_fields = ["source", "curator", "date"]
-            for field in required_meta_fields:
-                if field not in metadata:
-                    errors.append(f"metadata.{field} is required")
+            errors.extend(self._validate_metadata_schema(data["metadata"]))
 
         # Validate figures array (if present)
         if "figures" in data:
@@ -186,6 +263,15 @@ class BatchImporter:
 
         return len(errors) == 0, errors
 
+    def _validate_metadata_schema(self, metadata: Dict) -> List[str]:
+        """Validate the metadata section."""
+        errors = []
+        required_meta_fields = ["source", "curator", "date"]
+        for field in required_meta_fields:
+            if field not in metadata:
+                errors.append(f"metadata.{field} is required")
+        return errors
+
     def _validate_figure_schema(self, figure: Dict, idx: int) -> List[str]:
         """Validate a single historical figure object."""
         errors = []
@@ -273,7 +359,8 @@ class BatchImporter:
 
         return errors
 
-    def detect_duplicate_figures(self, figures: List[Dict]):
+    @timed_stage("duplicate_detection_figures")
+    def detect_duplicate_figures(self, figures: List[Dict], checkpoint_key: str = "figures"):
         """
         Check for duplicate figures in database using enhanced name similarity.
 
@@ -281,126 +368,305 @@ class BatchImporter:
         - Wikidata Q-ID check (exact match)
         - Canonical ID check (exact match)
         - Enhanced name similarity (70% lexical + 30% phonetic)
+
+        All lookups are resolved up front in bulk (one UNWIND query for the
+        exact ID checks, one for the fuzzy candidate pool), so the number of
+        round trips no longer grows with the size of the batch. With Metaphone
+        installed the candidate pool comes from index seeks on the stored
+        phonetic keys (plus a CONTAINS scan over figures not yet given keys by
+        the backfill); otherwise names are scanned with CONTAINS.
         """
         print("\n🔍 Checking for duplicate figures...")
 
+        if self._load_cached_duplicates("figures", figures, checkpoint_key):
+            return
+
+        keys = [
+            {
+                "idx": idx,
+                "qid": figure.get("wikidata_id") if (figure.get("wikidata_id") or "").startswith("Q") else None,
+                "canonical_id": figure.get("canonical_id") or None
+            }
+            for idx, figure in enumerate(figures)
+        ]
+
+        id_query = """
+        UNWIND $keys AS key
+        OPTIONAL MATCH (f:HistoricalFigure {wikidata_id: key.qid})
+        WITH key, head(collect(f {.canonical_id, .name, .wikidata_id})) AS qid_match
+        OPTIONAL MATCH (g:HistoricalFigure {canonical_id: key.canonical_id})
+        RETURN key.idx AS idx, qid_match,
+               head(collect(g {.canonical_id, .name, .wikidata_id})) AS canonical_match
+        """
+
+        pool_query = """
+        UNWIND $parts AS part
+        CALL {
+            WITH part
+            MATCH (f:HistoricalFigure)
+            WHERE toLower(f.name) CONTAINS part
+               OR part CONTAINS toLower(f.name)
+            RETURN f.canonical_id AS canonical_id, f.name AS name,
+                   f.wikidata_id AS wikidata_id,
+                   f.birth_year AS birth_year,
+                   f.death_year AS death_year
+            LIMIT 20
+        }
+        RETURN part, collect({
+            canonical_id: canonical_id, name: name, wikidata_id: wikidata_id,
+            birth_year: birth_year, death_year: death_year
+        }) AS candidates
+        """
+
         with self.driver.session() as session:
-            for figure in figures:
-                name = figure["name"]
-                canonical_id = figure.get("canonical_id")
-                wikidata_id = figure.get("wikidata_id")
-
-                # Check 1: Exact Q-ID match
-                if wikidata_id and wikidata_id.startswith("Q"):
-                    query = """
-                    MATCH (f:HistoricalFigure)
-                    WHERE f.wikidata_id = $qid
-                    RETURN f.canonical_id AS canonical_id, f.name AS name,
-                           f.wikidata_id AS wikidata_id
-                    LIMIT 1
-                    """
-                    result = session.run(query, qid=wikidata_id)
-                    record = result.single()
-                    if record:
-                        self.duplicate_figures.append({
-                            "input_figure": figure,
-                            "existing_figure": dict(record),
-                            "match_type": "exact_qid",
-                            "confidence": "high"
-                        })
-                        continue
-
-                # Check 2: Exact canonical_id match
-                if canonical_id:
-                    query = """
-                    MATCH (f:HistoricalFigure)
-                    WHERE f.canonical_id = $canonical_id
-                    RETURN f.canonical_id AS canonical_id, f.name AS name,
-                           f.wikidata_id AS wikidata_id
-                    LIMIT 1
-                    """
-                    result = session.run(query, canonical_id=canonical_id)
-                    record = result.single()
-                    if record:
+            with self.metrics.query("figure ID lookup", rows=len(keys)):
+                exact_matches = {
+                    record["idx"]: record
+                    for record in session.run(id_query, keys=keys)
+                }
+
+            # Figures that survive the exact checks need the fuzzy candidate pool
+            unresolved = [
+                (idx, figure) for idx, figure in enumerate(figures)
+                if not exact_matches[idx]["qid_match"]
+                and not exact_matches[idx]["canonical_match"]
+            ]
+            if METAPHONE_AVAILABLE:
+                candidate_pool = self._fetch_phonetic_pool(session, [figure["name"] for _, figure in unresolved])
+                # Figures stored before backfill_phonetic_keys.py ran have no keys
+                # and would never be seeked; scan those by first word as before
+                if unresolved and self._has_unkeyed_figures(session):
+                    self._merge_unkeyed_pool(session, candidate_pool, [figure for _, figure in unresolved])
+            else:
+                candidate_pool = self._fetch_candidate_pool(
+                    session, pool_query,
+                    [self._first_word(figure["name"]) for _, figure in unresolved]
+                )
+
+        for idx, figure in enumerate(figures):
+            name = figure["name"]
+            record = exact_matches[idx]
+
+            # Check 1: Exact Q-ID match
+            if record["qid_match"]:
+                self.duplicate_figures.append({
+                    "input_figure": figure,
+                    "existing_figure": dict(record["qid_match"]),
+                    "match_type": "exact_qid",
+                    "confidence": "high"
+                })
+                continue
+
+            # Check 2: Exact canonical_id match
+            if record["canonical_match"]:
+                self.duplicate_figures.append({
+                    "input_figure": figure,
+                    "existing_figure": dict(record["canonical_match"]),
+                    "match_type": "exact_canonical_id",
+                    "confidence": "high"
+                })
+                continue
+
+            # Check 3: Enhanced name similarity (lexical + phonetic)
+            for candidate in candidate_pool.get(self._figure_pool_key(name), []):
+                db_name = candidate["name"]
+                similarity = self._calculate_enhanced_similarity(name, db_name)
+
+                # High confidence threshold: 0.9
+                if similarity >= 0.9:
+                    # Additional check: birth/death years if available
+                    year_match = self._check_year_match(
+                        figure.get("birth_year"),
+                        figure.get("death_year"),
+                        candidate["birth_year"],
+                        candidate["death_year"]
+                    )
+
+                    if year_match or (
+                        figure.get("birth_year") is None and
+                        figure.get("death_year") is None
+                    ):
                         self.duplicate_figures.append({
                             "input_figure": figure,
-                            "existing_figure": dict(record),
-                            "match_type": "exact_canonical_id",
-                            "confidence": "high"
+                            "existing_figure": dict(candidate),
+                            "match_type": "name_similarity",
+                            "confidence": "high" if similarity >= 0.95 else "medium",
+                            "similarity_score": similarity
                         })
-                        continue
-
-                # Check 3: Enhanced name similarity (lexical + phonetic)
-                # Get all figures with similar names for comparison
-                query = """
-                MATCH (f:HistoricalFigure)
-                WHERE toLower(f.name) CONTAINS toLower($name_part)
-                   OR toLower($name_part) CONTAINS toLower(f.name)
-                RETURN f.canonical_id AS canonical_id, f.name AS name,
-                       f.wikidata_id AS wikidata_id,
-                       f.birth_year AS birth_year,
-                       f.death_year AS death_year
-                LIMIT 20
-                """
-                # Extract first word for search
-                name_part = name.split()[0] if name else ""
-                result = session.run(query, name_part=name_part)
-
-                for record in result:
-                    db_name = record["name"]
-                    similarity = self._calculate_enhanced_similarity(name, db_name)
-
-                    # High confidence threshold: 0.9
-                    if similarity >= 0.9:
-                        # Additional check: birth/death years if available
-                        year_match = self._check_year_match(
-                            figure.get("birth_year"),
-                            figure.get("death_year"),
-                            record["birth_year"],
-                            record["death_year"]
-                        )
+                        break
 
-                        if year_match or (
-                            figure.get("birth_year") is None and
-                            figure.get("death_year") is None
-                        ):
-                            self.duplicate_figures.append({
-                                "input_figure": figure,
-                                "existing_figure": dict(record),
-                                "match_type": "name_similarity",
-                                "confidence": "high" if similarity >= 0.95 else "medium",
-                                "similarity_score": similarity
-                            })
-                            break
+        if self.checkpoint:
+            self.checkpoint.save_duplicates(checkpoint_key, self.duplicate_figures, figures, "input_figure")
 
         if self.duplicate_figures:
             print(f"⚠️  Found {len(self.duplicate_figures)} potential duplicate figures")
         else:
             print("✅ No duplicate figures detected")
 
+    def _load_cached_duplicates(self, entity: str, inputs: List[Dict], checkpoint_key: str) -> bool:
+        """Reuse duplicate-detection results from the checkpoint, if present."""
+        if not self.checkpoint:
+            return False
+
+        input_key = "input_figure" if entity == "figures" else "input_work"
+        cached = self.checkpoint.load_duplicates(checkpoint_key, inputs, input_key)
+        if cached is None:
+            return False
+
+        target = self.duplicate_figures if entity == "figures" else self.duplicate_works
+        target.extend(cached)
+        print(f"♻️  Reusing cached duplicate check from checkpoint ({len(cached)} duplicate {entity})")
+        return True
+
+    @staticmethod
+    def _first_word(text: str) -> str:
+        """Lowercased first word of a name/title, used to probe for candidates."""
+        return text.split()[0].lower() if text else ""
+
+    @staticmethod
+    def _figure_pool_key(name: str) -> str:
+        """Candidate pool key of a figure name: its phonetic probe, or its first word without Metaphone."""
+        if METAPHONE_AVAILABLE:
+            return json.dumps(phonetic_probe(name), sort_keys=True)
+        return BatchImporter._first_word(name)
+
+    def _fetch_phonetic_pool(self, session, names: List[str]) -> Dict[str, List[Dict]]:
+        """Fetch sound-alike figures for every distinct phonetic probe in one round trip."""
+        query = """
+        UNWIND $probes AS probe
+        CALL {
+            WITH probe
+            MATCH (f:HistoricalFigure) WHERE f.phonetic_key IN probe.full
+            RETURN f LIMIT 20
+            UNION
+            WITH probe
+            MATCH (f:HistoricalFigure) WHERE f.phonetic_key_alt IN probe.full
+            RETURN f LIMIT 20
+            UNION
+            WITH probe
+            MATCH (f:HistoricalFigure) WHERE f.phonetic_first IN probe.first
+            RETURN f LIMIT 20
+            UNION
+            WITH probe
+            MATCH (f:HistoricalFigure) WHERE f.phonetic_last IN probe.last
+            RETURN f LIMIT 20
+        }
+        RETURN probe.key AS key, collect(f {
+            .canonical_id, .name, .wikidata_id, .birth_year, .death_year
+        }) AS candidates
+        """
+        probes = {}
+        for name in names:
+            probe = phonetic_probe(name)
+            if probe:
+                probes.setdefault(self._figure_pool_key(name), {"key": self._figure_pool_key(name), **probe})
+        if not probes:
+            return {}
+
+        with self.metrics.query("phonetic candidate pool", rows=len(probes)):
+            return {
+                record["key"]: record["candidates"]
+                for record in session.run(query, probes=list(probes.values()))
+            }
+
+    def _has_unkeyed_figures(self, session) -> bool:
+        """True if some stored figures have no phonetic keys yet (backfill not run)."""
+        with self.metrics.query("unkeyed figure check"):
+            return session.run(
+                "MATCH (f:HistoricalFigure) WHERE f.phonetic_key IS NULL RETURN f LIMIT 1"
+            ).single() is not None
+
+    def _merge_unkeyed_pool(self, session, candidate_pool: Dict[str, List[Dict]], figures: List[Dict]):
+        """
+        Add first-word CONTAINS candidates among figures without phonetic keys
+        to each figure's phonetic pool entry, so they are still compared until
+        backfill_phonetic_keys.py has run.
+        """
+        query = """
+        UNWIND $parts AS part
+        CALL {
+            WITH part
+            MATCH (f:HistoricalFigure)
+            WHERE f.phonetic_key IS NULL
+              AND (toLower(f.name) CONTAINS part OR part CONTAINS toLower(f.name))
+            RETURN f.canonical_id AS canonical_id, f.name AS name,
+                   f.wikidata_id AS wikidata_id,
+                   f.birth_year AS birth_year,
+                   f.death_year AS death_year
+            LIMIT 20
+        }
+        RETURN part, collect({
+            canonical_id: canonical_id, name: name, wikidata_id: wikidata_id,
+            birth_year: birth_year, death_year: death_year
+        }) AS candidates
+        """
+        unkeyed_pool = self._fetch_candidate_pool(
+            session, query, [self._first_word(figure["name"]) for figure in figures]
+        )
+        for figure in figures:
+            extra = unkeyed_pool.get(self._first_word(figure["name"]))
+            if not extra:
+                continue
+            candidates = candidate_pool.setdefault(self._figure_pool_key(figure["name"]), [])
+            seen = {candidate["canonical_id"] for candidate in candidates}
+            for candidate in extra:
+                if candidate["canonical_id"] not in seen:
+                    seen.add(candidate["canonical_id"])
+                    candidates.append(candidate)
+
+    def _fetch_candidate_pool(self, session, query: str, parts: List[str]) -> Dict[str, List[Dict]]:
+        """Fetch fuzzy-match candidates for every distinct name part in one round trip."""
+        parts = sorted(set(parts))
+        if not parts:
+            return {}
+
+        with self.metrics.query("candidate pool", rows=len(parts)):
+            return {
+                record["part"]: record["candidates"]
+                for record in session.run(query, parts=parts)
+            }
+
+    def _fetch_work_index(self, session, works: List[Dict]) -> WorkDedupeIndex:
+        """
+        Index the existing works that can match `works`: those within the year
+        tolerance of an input release year, plus works without a year (every
+        work if an input has no year).
+        """
+        if not works:
+            return WorkDedupeIndex()
+
+        query = """
+        MATCH (m:MediaWork)
+        WHERE $all_years OR m.release_year IS NULL OR m.release_year IN $years
+        RETURN m.media_id AS media_id, m.title AS title,
+               m.wikidata_id AS wikidata_id,
+               m.release_year AS release_year,
+               m.media_type AS media_type
+        """
+        all_years = any(not isinstance(work.get("release_year"), int) for work in works)
+        years = sorted({
+            work["release_year"] + offset
+            for work in works if isinstance(work.get("release_year"), int)
+            for offset in range(-WORK_YEAR_TOLERANCE, WORK_YEAR_TOLERANCE + 1)
+        })
+
+        with self.metrics.query("work title index", rows=len(works)):
+            return WorkDedupeIndex(
+                dict(record) for record in session.run(query, all_years=all_years, years=years)
+            )
+
     def _calculate_enhanced_similarity(self, name1: str, name2: str) -> float:
         """
         Calculate enhanced name similarity using lexical + phonetic matching.
 
-        Weight distribution: 70% lexical, 30% phonetic
+        Weight distribution: 70% lexical, 30% phonetic. Scores are looked up in
+        the persistent similarity cache before being computed.
         """
         if not THEFUZZ_AVAILABLE:
-            # Fallback to simple string comparison
-            if name1.lower() == name2.lower():
-                return 1.0
-            elif name1.lower() in name2.lower() or name2.lower() in name1.lower():
-                return 0.8
-            return 0.0
-
-        # Lexical similarity using Levenshtein distance
-        lexical_score = fuzz.ratio(name1.lower(), name2.lower()) / 100.0
-
-        # Phonetic similarity (simplified - would use double-metaphone in production)
-        # For now, use token_sort_ratio which handles word order
-        phonetic_score = fuzz.token_sort_ratio(name1.lower(), name2.lower()) / 100.0
-
-        # Weighted average: 70% lexical, 30% phonetic
-        return (lexical_score * 0.7) + (phonetic_score * 0.3)
+            return self.similarity_cache.score(
+                FALLBACK_SIMILARITY_ALGORITHM, name1, name2, _substring_similarity
+            )
+        return self.similarity_cache.score(SIMILARITY_ALGORITHM, name1, name2, _enhanced_similarity)
 
     def _check_year_match(
         self,
@@ -422,91 +688,96 @@ class BatchImporter:
 
         return False
 
-    def detect_duplicate_works(self, works: List[Dict]):
+    @timed_stage("duplicate_detection_works")
+    def detect_duplicate_works(self, works: List[Dict], checkpoint_key: str = "works"):
         """
         Check for duplicate media works in database.
 
         Uses:
         - Wikidata Q-ID check (exact match)
         - Title similarity + year matching
+
+        Like detect_duplicate_figures, Q-IDs are resolved in bulk first. Works
+        without a Q-ID match are then compared, by normalized title, only with
+        existing works in the same media type family and release-year window
+        (lib/work_dedupe.py).
         """
         print("\n🔍 Checking for duplicate media works...")
 
+        if self._load_cached_duplicates("works", works, checkpoint_key):
+            return
+
+        keys = [
+            {
+                "idx": idx,
+                "qid": work.get("wikidata_id") if (work.get("wikidata_id") or "").startswith("Q") else None
+            }
+            for idx, work in enumerate(works)
+        ]
+
+        id_query = """
+        UNWIND $keys AS key
+        OPTIONAL MATCH (m:MediaWork {wikidata_id: key.qid})
+        RETURN key.idx AS idx,
+               head(collect(m {.media_id, .title, .wikidata_id, .release_year})) AS qid_match
+        """
+
         with self.driver.session() as session:
-            for work in works:
-                title = work["title"]
-                wikidata_id = work.get("wikidata_id")
-                release_year = work.get("release_year")
-
-                # Check 1: Exact Q-ID match
-                if wikidata_id and wikidata_id.startswith("Q"):
-                    query = """
-                    MATCH (m:MediaWork)
-                    WHERE m.wikidata_id = $qid
-                    RETURN m.media_id AS media_id, m.title AS title,
-                           m.wikidata_id AS wikidata_id,
-                           m.release_year AS release_year
-                    LIMIT 1
-                    """
-                    result = session.run(query, qid=wikidata_id)
-                    record = result.single()
-                    if record:
-                        self.duplicate_works.append({
-                            "input_work": work,
-                            "existing_work": dict(record),
-                            "match_type": "exact_qid",
-                            "confidence": "high"
-                        })
-                        continue
-
-                # Check 2: Title similarity + year
-                query = """
-                MATCH (m:MediaWork)
-                WHERE toLower(m.title) CONTAINS toLower($title_part)
-                   OR toLower($title_part) CONTAINS toLower(m.title)
-                RETURN m.media_id AS media_id, m.title AS title,
-                       m.wikidata_id AS wikidata_id,
-                       m.release_year AS release_year
-                LIMIT 10
-                """
-                title_part = title.split()[0] if title else ""
-                result = session.run(query, title_part=title_part)
-
-                for record in result:
-                    db_title = record["title"]
-                    similarity = self._calculate_enhanced_similarity(title, db_title)
-
-                    # Title similarity threshold: 0.85
-                    if similarity >= 0.85:
-                        # Check year if available
-                        db_year = record["release_year"]
-                        if release_year and db_year:
-                            year_diff = abs(release_year - db_year)
-                            if year_diff <= 2:  # ±2 years tolerance
-                                self.duplicate_works.append({
-                                    "input_work": work,
-                                    "existing_work": dict(record),
-                                    "match_type": "title_and_year",
-                                    "confidence": "high",
-                                    "similarity_score": similarity
-                                })
-                                break
-                        else:
-                            # No year data, rely on title alone
-                            self.duplicate_works.append({
-                                "input_work": work,
-                                "existing_work": dict(record),
-                                "match_type": "title_similarity",
-                                "confidence": "medium",
-                                "similarity_score": similarity
-                            })
-                            break
+            with self.metrics.query("work ID lookup", rows=len(keys)):
+                exact_matches = {
+                    record["idx"]: record["qid_match"]
+                    for record in session.run(id_query, keys=keys)
+                }
+            title_index = self._fetch_work_index(
+                session, [work for idx, work in enumerate(works) if not exact_matches[idx]]
+            )
+
+        for idx, work in enumerate(works):
+            title = work["title"]
+            release_year = work.get("release_year")
+
+            # Check 1: Exact Q-ID match
+            if exact_matches[idx]:
+                self.duplicate_works.append({
+                    "input_work": work,
+                    "existing_work": dict(exact_matches[idx]),
+                    "match_type": "exact_qid",
+                    "confidence": "high"
+                })
+                continue
+
+            # Check 2: Title similarity (threshold 0.85) + year (±2 years, enforced by the index)
+            matches = title_index.matches(work, self._calculate_enhanced_similarity, threshold=0.85)
+            if matches:
+                candidate, similarity = matches[0]
+                db_year = candidate["release_year"]
+                if release_year and db_year:
+                    self.duplicate_works.append({
+                        "input_work": work,
+                        "existing_work": dict(candidate),
+                        "match_type": "title_and_year",
+                        "confidence": "high",
+                        "similarity_score": similarity
+                    })
+                else:
+                    # No year data, rely on title alone
+                    self.duplicate_works.append({
+                        "input_work": work,
+                        "existing_work": dict(candidate),
+                        "match_type": "title_similarity",
+                        "confidence": "medium",
+                        "similarity_score": similarity
+                    })
+
+        if self.checkpoint:
+            self.checkpoint.save_duplicates(checkpoint_key, self.duplicate_works, works, "input_work")
 
         if self.duplicate_works:
             print(f"⚠️  Found {len(self.duplicate_works)} potential duplicate works")
         else:
             print("✅ No duplicate works detected")
 
+    @timed_stage("wikidata_validation", rows=lambda data: _count_batch_records(data))
     def validate_wikidata_qids(self, data: Dict):
         """
         Validate all Wikidata Q-IDs by querying Wikidata API.
@@ -515,73 +786,310 @@ class BatchImporter:
         """
         print("\n🔍 Validating Wikidata Q-IDs...")
 
-        # Validate figure Q-IDs
-        if "figures" in data:
-            for figure in data["figures"]:
-                if "wikidata_id" in figure and figure["wikidata_id"]:
-                    qid = figure["wikidata_id"]
-                    if qid.startswith("Q"):
-                        try:
-                            validation = validate_qid(qid, figure["name"])
-                            if not validation["valid"]:
-                                self.invalid_qids.append({
-                                    "type": "HistoricalFigure",
-                                    "name": figure["name"],
-                                    "qid": qid,
-                                    "error": validation.get("error", "Invalid Q-ID")
-                                })
-                        except Exception as e:
-                            self.stats["warnings"].append(
-                                f"Could not validate Q-ID {qid} for {figure['name']}: {e}"
-                            )
-
-        # Validate work Q-IDs (MANDATORY)
+        # Validate figure and work Q-IDs (works are MANDATORY) in bulk
+        to_validate = []
+        for figure in data.get("figures", []):
+            qid = figure.get("wikidata_id")
+            if qid and qid.startswith("Q"):
+                to_validate.append(("HistoricalFigure", figure["name"], qid))
+        for work in data.get("works", []):
+            qid = work.get("wikidata_id")
+            if qid and qid.startswith("Q"):
+                to_validate.append(("MediaWork", work["title"], qid))
+
+        try:
+            validations = self._validate_qids_cached([(qid, name) for _, name, qid in to_validate])
+        except Exception as e:
+            validations = [None] * len(to_validate)
+            self.stats["warnings"].append(f"Could not validate {len(to_validate)} Q-IDs: {e}")
+
+        for (node_type, name, qid), validation in zip(to_validate, validations):
+            if validation is not None and not validation["valid"]:
+                self.invalid_qids.append({
+                    "type": node_type,
+                    "name": name,
+                    "qid": qid,
+                    "error": validation.get("error", "Invalid Q-ID")
+                })
+
+        # Works without a Q-ID: try to search Wikidata
         if "works" in data:
             for work in data["works"]:
                 if "wikidata_id" in work and work["wikidata_id"]:
-                    qid = work["wikidata_id"]
-                    if qid.startswith("Q"):
-                        try:
-                            validation = validate_qid(qid, work["title"])
-                            if not validation["valid"]:
-                                self.invalid_qids.append({
-                                    "type": "MediaWork",
-                                    "name": work["title"],
-                                    "qid": qid,
-                                    "error": validation.get("error", "Invalid Q-ID")
-                                })
-                        except Exception as e:
-                            self.stats["warnings"].append(
-                                f"Could not validate Q-ID {qid} for {work['title']}: {e}"
-                            )
-                else:
-                    # No Q-ID provided - try to search Wikidata
-                    print(f"   🔎 Searching Wikidata for: {work['title']}")
-                    try:
-                        result = search_wikidata_for_work(
-                            title=work["title"],
-                            creator=work.get("creator"),
-                            year=work.get("release_year"),
-                            media_type=work.get("media_type")
-                        )
-                        if result and result["confidence"] in ["high", "medium"]:
-                            print(f"      ✅ Found Q-ID: {result['qid']} (confidence: {result['confidence']})")
-                            work["wikidata_id"] = result["qid"]
-                        else:
-                            self.stats["warnings"].append(
-                                f"Could not find Wikidata Q-ID for: {work['title']}"
-                            )
-                    except Exception as e:
+                    continue
+                print(f"   🔎 Searching Wikidata for: {work['title']}")
+                try:
+                    result = self._search_work_cached(work)
+                    if result and result["confidence"] in ["high", "medium"]:
+                        print(f"      ✅ Found Q-ID: {result['qid']} (confidence: {result['confidence']})")
+                        work["wikidata_id"] = result["qid"]
+                    else:
                         self.stats["warnings"].append(
-                            f"Wikidata search failed for {work['title']}: {e}"
+                            f"Could not find Wikidata Q-ID for: {work['title']}"
                         )
+                except Exception as e:
+                    self.stats["warnings"].append(
+                        f"Wikidata search failed for {work['title']}: {e}"
+                    )
+
+        if self.checkpoint:
+            self.checkpoint.mark_done("wikidata_validation")
 
         if self.invalid_qids:
             print(f"❌ Found {len(self.invalid_qids)} invalid Q-IDs")
         else:
             print("✅ All Q-IDs validated")
 
-    def import_figures(self, figures: List[Dict], metadata: Dict):
+    @staticmethod
+    def _wikidata_requests() -> int:
+        """HTTP requests sent to Wikidata so far (retries included)."""
+        return sum(get_wikidata_client().requests.values())
+
+    def _validate_qids_cached(self, items: List[Tuple[str, str]]) -> List[Dict]:
+        """validate_qids for (qid, expected) pairs, reusing results recorded in the checkpoint."""
+        results: List[Optional[Dict]] = [None] * len(items)
+        pending = []
+        for i, (qid, expected) in enumerate(items):
+            cached = self.checkpoint.get_validation(qid, expected) if self.checkpoint else None
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append(i)
+
+        if pending:
+            with self.metrics.http_call(self._wikidata_requests):
+                validations = validate_qids([items[i] for i in pending])
+            for i, validation in zip(pending, validations):
+                results[i] = validation
+                qid, expected = items[i]
+                # Don't cache transport failures; they should be retried on resume
+                if self.checkpoint and not validation.get("error", "").startswith("Failed to fetch"):
+                    self.checkpoint.set_validation(qid, expected, validation)
+        return results
+
+    def _search_work_cached(self, work: Dict) -> Optional[Dict]:
+        """search_wikidata_for_work, reusing results recorded in the checkpoint."""
+        key = f"{work['title']}|{work.get('creator')}|{work.get('release_year')}|{work.get('media_type')}"
+        if self.checkpoint:
+            cached, result = self.checkpoint.get_search(key)
+            if cached:
+                return result
+
+        with self.metrics.http_call(self._wikidata_requests):
+            result = search_wikidata_for_work(
+                title=work["title"],
+                creator=work.get("creator"),
+                year=work.get("release_year"),
+                media_type=work.get("media_type")
+            )
+        if self.checkpoint:
+            self.checkpoint.set_search(key, result)
+        return result
+
+    @timed_stage("plan", rows=lambda data, *_: _count_batch_records(data))
+    def plan_import(
+        self,
+        data: Dict,
+        sections: Tuple[str, ...] = ("figures", "works", "relationships")
+    ) -> Dict[str, List[Dict]]:
+        """
+        Classify every input record against the database without writing.
+
+        Current state is fetched with bulk UNWIND reads (PLAN_READ_SIZE records
+        per round trip; relationships per type group) and each record becomes
+        a plan entry with one of these actions:
+
+        - create: no matching node/edge exists
+        - update: it exists and would change; `changes` lists old/new values
+        - noop: it exists with identical properties
+        - duplicate: (figures) the Q-ID already belongs to another canonical_id,
+          so duplicate detection would skip it
+        - unresolved: it cannot be written as given (work without wikidata_id,
+          relationship endpoint in neither the database nor this batch)
+
+        Only properties present in the input are compared, and AUDIT_PROPERTIES
+        are ignored. The plan is kept in self.plan for reports and
+        skip_unchanged().
+        """
+        print("\n🗺️  Planning import (read-only)...")
+        self.plan = {}
+
+        with self.driver.session() as session:
+            if "figures" in sections and data.get("figures"):
+                self.plan["figures"] = self._plan_figures(session, data["figures"])
+            if "works" in sections and data.get("works"):
+                self.plan["works"] = self._plan_works(session, data["works"])
+            if "relationships" in sections and data.get("relationships"):
+                self.plan["relationships"] = self._plan_relationships(session, data["relationships"])
+
+        for section, entries in self.plan.items():
+            counts = self._count_plan_actions(entries)
+            print(f"   {section}: " + ", ".join(f"{count} {action}" for action, count in counts.items()))
+        return self.plan
+
+    def _plan_figures(self, session, figures: List[Dict]) -> List[Dict]:
+        """Plan entries for figures, keyed like import_figures (canonical_id, else Q-ID)."""
+        keys = []
+        for idx, figure in enumerate(figures):
+            qid = figure.get("wikidata_id") if (figure.get("wikidata_id") or "").startswith("Q") else None
+            keys.append({"idx": idx, "canonical_id": figure.get("canonical_id") or qid, "qid": qid})
+
+        query = """
+        UNWIND $rows AS key
+        OPTIONAL MATCH (f:HistoricalFigure {canonical_id: key.canonical_id})
+        WITH key, head(collect(properties(f))) AS existing
+        OPTIONAL MATCH (q:HistoricalFigure {wikidata_id: key.qid})
+        WHERE q.canonical_id <> key.canonical_id
+        RETURN key.idx AS idx, existing, head(collect(q.canonical_id)) AS qid_owner
+        """
+        records = {
+            record["idx"]: record
+            for record in self._bulk_read(session, query, keys, "figure plan read")
+        }
+
+        entries = []
+        for idx, figure in enumerate(figures):
+            key = keys[idx]["canonical_id"]
+            record = records[idx]
+            entry = {"index": idx, "key": key, "name": figure.get("name"), "changes": {}}
+
+            if key is None:
+                entry.update(action="create", reason="no canonical_id or Q-ID; a provisional ID will be generated")
+            elif record["existing"] is None and record["qid_owner"]:
+                entry.update(action="duplicate",
+                             reason=f"Q-ID {keys[idx]['qid']} already used by {record['qid_owner']}")
+            else:
+                self._classify_plan_entry(entry, record["existing"], figure)
+            entries.append(entry)
+        return entries
+
+    def _plan_works(self, session, works: List[Dict]) -> List[Dict]:
+        """Plan entries for works, keyed like import_works (wikidata_id)."""
+        keys = [{"idx": idx, "qid": work.get("wikidata_id") or None} for idx, work in enumerate(works)]
+
+        query = """
+        UNWIND $rows AS key
+        OPTIONAL MATCH (m:MediaWork {wikidata_id: key.qid})
+        RETURN key.idx AS idx, head(collect(properties(m))) AS existing
+        """
+        existing = {
+            record["idx"]: record["existing"]
+            for record in self._bulk_read(session, query, keys, "work plan read")
+        }
+
+        entries = []
+        for idx, work in enumerate(works):
+            key = keys[idx]["qid"]
+            entry = {"index": idx, "key": key, "name": work.get("title"), "changes": {}}
+            if key is None:
+                entry.update(action="unresolved", reason="no wikidata_id; import would search Wikidata or reject it")
+            else:
+                self._classify_plan_entry(entry, existing[idx], work)
+            entries.append(entry)
+        return entries
+
+    def _plan_relationships(self, session, relationships: List[Dict]) -> List[Dict]:
+        """
+        Plan entries for relationships, one bulk read per (from_type, rel_type,
+        to_type) group. Endpoints planned for creation in this batch count as
+        resolved.
+        """
+        planned = {
+            "HistoricalFigure": {
+                e["key"] for e in self.plan.get("figures", []) if e["action"] in ("create", "update", "noop")
+            },
+            "MediaWork": {
+                e["key"] for e in self.plan.get("works", []) if e["action"] in ("create", "update", "noop")
+            }
+        }
+
+        groups: Dict[Tuple[str, str, str], List[Dict]] = {}
+        for idx, rel in enumerate(relationships):
+            groups.setdefault((rel["from_type"], rel["rel_type"], rel["to_type"]), []).append(
+                {"idx": idx, "from_id": rel["from_id"], "to_id": rel["to_id"]}
+            )
+
+        entries: Dict[int, Dict] = {}
+        for (from_type, rel_type, to_type), rows in groups.items():
+            query = f"""
+            UNWIND $rows AS rel
+            OPTIONAL MATCH (from:{from_type} {{{self._get_id_property(from_type)}: rel.from_id}})
+            OPTIONAL MATCH (to:{to_type} {{{self._get_id_property(to_type)}: rel.to_id}})
+            OPTIONAL MATCH (from)-[r:{rel_type}]->(to)
+            RETURN rel.idx AS idx,
+                   from IS NOT NULL AS from_found,
+                   to IS NOT NULL AS to_found,
+                   head(collect(properties(r))) AS existing
+            """
+            for record in self._bulk_read(session, query, rows, f"{rel_type} plan read"):
+                idx = record["idx"]
+                rel = relationships[idx]
+                entry = {
+                    "index": idx,
+                    "key": f"{rel['from_id']} -{rel_type}-> {rel['to_id']}",
+                    "name": None,
+                    "changes": {}
+                }
+
+                missing = []
+                if not record["from_found"] and rel["from_id"] not in planned.get(from_type, ()):
+                    missing.append(f"{from_type} '{rel['from_id']}'")
+                if not record["to_found"] and rel["to_id"] not in planned.get(to_type, ()):
+                    missing.append(f"{to_type} '{rel['to_id']}'")
+
+                if missing:
+                    entry.update(action="unresolved", reason=f"node not found ({', '.join(missing)})")
+                else:
+                    self._classify_plan_entry(entry, record["existing"], rel.get("properties", {}))
+                entries[idx] = entry
+
+        return [entries[idx] for idx in sorted(entries)]
+
+    def _bulk_read(self, session, query: str, rows: List[Dict], label: str) -> List[Any]:
+        """Run a read that UNWINDs $rows, PLAN_READ_SIZE rows per round trip."""
+        records = []
+        for chunk in chunked(rows, PLAN_READ_SIZE):
+            with self.metrics.query(label, rows=len(chunk)):
+                records.extend(session.run(query, rows=chunk))
+        return records
+
+    @staticmethod
+    def _classify_plan_entry(entry: Dict, existing: Optional[Dict], incoming: Dict):
+        """Mark a keyed entry as create, update (with changes) or noop."""
+        if existing is None:
+            entry["action"] = "create"
+            return
+
+        changes = _diff_properties(existing, incoming)
+        entry["action"] = "update" if changes else "noop"
+        entry["changes"] = changes
+
+    @staticmethod
+    def _count_plan_actions(entries: List[Dict]) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for entry in entries:
+            counts[entry["action"]] = counts.get(entry["action"], 0) + 1
+        return counts
+
+    def skip_unchanged(self, data: Dict) -> Dict[str, int]:
+        """
+        Drop records the current plan classified as no-op from `data` (in place),
+        so they are neither duplicate-checked nor written.
+
+        Positions shift, so this must not be used with a resumed checkpoint.
+
+        Returns:
+            Number of records dropped per section
+        """
+        for section, entries in self.plan.items():
+            noop = {entry["index"] for entry in entries if entry["action"] == "noop"}
+            if noop and section in data:
+                data[section] = [record for idx, record in enumerate(data[section]) if idx not in noop]
+            self.skipped_unchanged[section] = len(noop)
+        return self.skipped_unchanged
+
+    @timed_stage("write_figures")
+    def import_figures(self, figures: List[Dict], metadata: Dict, checkpoint_key: str = "figures"):
         """
         Import historical figures into database.
 
@@ -615,6 +1123,13 @@ class BatchImporter:
 
         # Add metadata to each figure
         for figure in figures_to_import:
+            # Hash the record as given, before IDs and audit metadata are added
+            figure[CONTENT_HASH_PROPERTY] = content_hash(figure)
+
+            # Derived lookup keys; kept out of the hash (the backfill migration
+            # covers nodes written before they existed)
+            figure.update(phonetic_keys(figure["name"]))
+
             if "ingestion_batch" not in figure:
                 figure["ingestion_batch"] = self.batch_id
             if "ingestion_source" not in figure:
@@ -633,46 +1148,45 @@ class BatchImporter:
                     timestamp = int(time.time() * 1000)
                     figure["canonical_id"] = f"PROV:{slug}-{timestamp}"
 
+        if self.checkpoint:
+            self.checkpoint.restore_ids(checkpoint_key, figures_to_import, "canonical_id")
+
+        unchanged = self._find_unchanged_nodes("HistoricalFigure", "canonical_id", figures_to_import)
+        self.stats["figures_unchanged"] += len(unchanged)
+        if unchanged:
+            print(f"   ⏭️  Skipping {len(unchanged)} unchanged figures (content hash match)")
+        changed_figures = [fig for idx, fig in enumerate(figures_to_import) if idx not in unchanged]
+
         if self.dry_run:
-            print(f"   [DRY RUN] Would import {len(figures_to_import)} figures")
-            for fig in figures_to_import[:5]:  # Show first 5
+            print(f"   [DRY RUN] Would import {len(changed_figures)} figures")
+            for fig in changed_figures[:5]:  # Show first 5
                 print(f"      - {fig['name']} ({fig['canonical_id']})")
-            if len(figures_to_import) > 5:
-                print(f"      ... and {len(figures_to_import) - 5} more")
-            self.stats["figures_created"] = len(figures_to_import)
+            if len(changed_figures) > 5:
+                print(f"      ... and {len(changed_figures) - 5} more")
+            self.stats["figures_created"] += len(changed_figures)
             return
 
         # Import in batches
-        with self.driver.session() as session:
-            for i in range(0, len(figures_to_import), self.batch_size):
-                batch = figures_to_import[i:i + self.batch_size]
-
-                query = """
-                UNWIND $figures AS figure_data
-                MERGE (f:HistoricalFigure {canonical_id: figure_data.canonical_id})
-                ON CREATE SET
-                    f += figure_data,
-                    f.created_at = datetime()
-                ON MATCH SET
-                    f += figure_data,
-                    f.updated_at = datetime()
-                RETURN COUNT(*) AS count
-                """
-
-                try:
-                    result = session.run(query, figures=batch)
-                    count = result.single()["count"]
-                    self.stats["figures_created"] += count
-                    print(f"   ✅ Imported batch {i // self.batch_size + 1}: {count} figures")
-                except Exception as e:
-                    error_msg = f"Failed to import figure batch {i // self.batch_size + 1}: {e}"
-                    self.stats["errors"].append(error_msg)
-                    print(f"   ❌ {error_msg}")
+        query = """
+        UNWIND $rows AS figure_data
+        MERGE (f:HistoricalFigure {canonical_id: figure_data.canonical_id})
+        ON CREATE SET
+            f += figure_data,
+            f.created_at = datetime()
+        ON MATCH SET
+            f += figure_data,
+            f.updated_at = datetime()
+        RETURN COUNT(*) AS count
+        """
+        self._write_chunks(query, figures_to_import, "figures_created", "figure", checkpoint_key, skip=unchanged)
 
         # Create CREATED_BY relationships to Agent node
-        self._create_agent_relationships(session, "HistoricalFigure", figures_to_import)
+        if changed_figures:
+            with self.driver.session() as session:
+                self._create_agent_relationships(session, "HistoricalFigure", changed_figures)
 
-    def import_works(self, works: List[Dict], metadata: Dict):
+    @timed_stage("write_works")
+    def import_works(self, works: List[Dict], metadata: Dict, checkpoint_key: str = "works"):
         """
         Import media works into database.
 
@@ -702,6 +1216,9 @@ class BatchImporter:
 
         # Add metadata and generate media_id
         for work in works_to_import:
+            # Hash the record as given, before IDs and audit metadata are added
+            work[CONTENT_HASH_PROPERTY] = content_hash(work)
+
             if "ingestion_batch" not in work:
                 work["ingestion_batch"] = self.batch_id
             if "ingestion_source" not in work:
@@ -722,47 +1239,185 @@ class BatchImporter:
                 print(f"   ❌ {error_msg}")
                 works_to_import.remove(work)
 
+        if self.checkpoint:
+            self.checkpoint.restore_ids(checkpoint_key, works_to_import, "media_id")
+
+        unchanged = self._find_unchanged_nodes("MediaWork", "wikidata_id", works_to_import)
+        self.stats["works_unchanged"] += len(unchanged)
+        if unchanged:
+            print(f"   ⏭️  Skipping {len(unchanged)} unchanged works (content hash match)")
+        changed_works = [work for idx, work in enumerate(works_to_import) if idx not in unchanged]
+
         if self.dry_run:
-            print(f"   [DRY RUN] Would import {len(works_to_import)} works")
-            for work in works_to_import[:5]:
+            print(f"   [DRY RUN] Would import {len(changed_works)} works")
+            for work in changed_works[:5]:
                 print(f"      - {work['title']} ({work['wikidata_id']})")
-            if len(works_to_import) > 5:
-                print(f"      ... and {len(works_to_import) - 5} more")
-            self.stats["works_created"] = len(works_to_import)
+            if len(changed_works) > 5:
+                print(f"      ... and {len(changed_works) - 5} more")
+            self.stats["works_created"] += len(changed_works)
             return
 
         # Import in batches (using wikidata_id as merge key)
+        query = """
+        UNWIND $rows AS work_data
+        MERGE (m:MediaWork {wikidata_id: work_data.wikidata_id})
+        ON CREATE SET
+            m += work_data,
+            m.created_at = datetime()
+        ON MATCH SET
+            m += work_data,
+            m.updated_at = datetime()
+        RETURN COUNT(*) AS count
+        """
+        self._write_chunks(query, works_to_import, "works_created", "work", checkpoint_key, skip=unchanged)
+
+        # Create CREATED_BY relationships
+        if changed_works:
+            with self.driver.session() as session:
+                self._create_agent_relationships(session, "MediaWork", changed_works)
+
+    def _find_unchanged_nodes(self, label: str, id_property: str, rows: List[Dict]) -> Set[int]:
+        """Positions of rows whose stored content_hash matches, read in bulk."""
+        if not self.content_hashing or not rows:
+            return set()
+
         with self.driver.session() as session:
-            for i in range(0, len(works_to_import), self.batch_size):
-                batch = works_to_import[i:i + self.batch_size]
-
-                query = """
-                UNWIND $works AS work_data
-                MERGE (m:MediaWork {wikidata_id: work_data.wikidata_id})
-                ON CREATE SET
-                    m += work_data,
-                    m.created_at = datetime()
-                ON MATCH SET
-                    m += work_data,
-                    m.updated_at = datetime()
-                RETURN COUNT(*) AS count
-                """
+            with self.metrics.query(f"{label} content hashes", rows=len(rows)):
+                stored = fetch_node_hashes(session, label, id_property, [row.get(id_property) for row in rows])
 
-                try:
-                    result = session.run(query, works=batch)
-                    count = result.single()["count"]
-                    self.stats["works_created"] += count
-                    print(f"   ✅ Imported batch {i // self.batch_size + 1}: {count} works")
-                except Exception as e:
-                    error_msg = f"Failed to import work batch {i // self.batch_size + 1}: {e}"
-                    self.stats["errors"].append(error_msg)
-                    print(f"   ❌ {error_msg}")
+        return {
+            idx for idx, row in enumerate(rows)
+            if stored.get(row.get(id_property)) == row[CONTENT_HASH_PROPERTY]
+        }
 
-        # Create CREATED_BY relationships
-        self._create_agent_relationships(session, "MediaWork", works_to_import)
+    def _get_sizer(self, stage: str) -> AdaptiveBatchSizer:
+        """Chunk size controller for a write stage (fixed size unless adaptive)."""
+        if stage not in self.batch_sizers:
+            self.batch_sizers[stage] = AdaptiveBatchSizer(
+                stage,
+                initial_size=self.batch_size,
+                target_latency=self.target_latency,
+                adaptive=self.adaptive_batching
+            )
+        return self.batch_sizers[stage]
+
+    def _write_chunks(
+        self,
+        query: str,
+        rows: List[Dict],
+        stat_key: str,
+        noun: str,
+        stage: str,
+        skip: Set[int] = frozenset()
+    ):
+        """
+        Commit `rows` in chunks using `query` (which UNWINDs $rows).
+
+        Each chunk runs in a managed write transaction, so the driver retries it
+        on transient errors (including deadlocks) and lost connections. With
+        workers > 1, disjoint chunks are committed concurrently, one session per
+        worker thread; results are aggregated into self.stats on this thread.
+        Committed row ranges are recorded under `stage` in the checkpoint, and
+        ranges committed by a previous attempt are skipped.
 
-    def import_relationships(self, relationships: List[Dict]):
-        """Import relationships between entities."""
+        Chunk sizes come from the stage's AdaptiveBatchSizer, so with adaptive
+        batching a chunk that times out or runs out of memory is re-queued and
+        retried at a smaller size.
+
+        Positions in `skip` (e.g. rows with an unchanged content hash) are left
+        out without shifting the positions recorded in the checkpoint.
+        """
+        spans = [(0, len(rows))]
+        if self.checkpoint:
+            spans = self.checkpoint.pending_spans(stage, len(rows))
+            already_committed = self.checkpoint.committed_count(stage)
+            if already_committed:
+                print(f"   ♻️  Resuming: {already_committed} {noun}s already committed")
+        spans = _subtract_positions(spans, skip)
+
+        sizer = self._get_sizer(f"{noun}s")
+        queue = deque(spans)
+        # Retried chunks take a new number, so attempts can outnumber rows
+        batch_nums = itertools.count(1)
+
+        def take_chunk() -> Tuple[int, int, int]:
+            span_start, span_end = queue.popleft()
+            end = min(span_start + sizer.next_size(), span_end)
+            if end < span_end:
+                queue.appendleft((end, span_end))
+            return next(batch_nums), span_start, end
+
+        def record(batch_num: int, start: int, end: int, count: Optional[int],
+                   latency: Optional[float], error: Optional[Exception]):
+            if error is None:
+                sizer.record_success(end - start, latency, payload_size(rows[start:end]))
+                self.stats[stat_key] += count
+                if self.checkpoint:
+                    self.checkpoint.record_chunk(stage, start, end)
+                print(f"   ✅ Imported batch {batch_num}: {count} {noun}s ({latency:.2f}s)")
+            elif sizer.record_failure(end - start, error):
+                print(f"   ↘️  Batch {batch_num} too large ({error}); "
+                      f"retrying {end - start} {noun}s in chunks of {sizer.next_size()}")
+                queue.appendleft((start, end))
+            else:
+                error_msg = f"Failed to import {noun} batch {batch_num}: {error}"
+                self.stats["errors"].append(error_msg)
+                print(f"   ❌ {error_msg}")
+
+        if self.workers == 1:
+            with self.driver.session() as session:
+                while queue:
+                    batch_num, start, end = take_chunk()
+                    started = time.perf_counter()
+                    try:
+                        with self.metrics.query(f"{noun} chunk", rows=end - start):
+                            count = session.execute_write(_run_counted_write, query, rows[start:end])
+                        record(batch_num, start, end, count, time.perf_counter() - started, None)
+                    except Exception as e:
+                        record(batch_num, start, end, None, None, e)
+            return
+
+        print(f"   Committing batches with {self.workers} workers")
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            in_flight = {}
+
+            def fill_pool():
+                while queue and len(in_flight) < self.workers:
+                    batch_num, start, end = take_chunk()
+                    future = pool.submit(self._write_chunk_in_session, query, rows[start:end], noun)
+                    in_flight[future] = (batch_num, start, end)
+
+            fill_pool()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch_num, start, end = in_flight.pop(future)
+                    try:
+                        count, latency = future.result()
+                        record(batch_num, start, end, count, latency, None)
+                    except Exception as e:
+                        record(batch_num, start, end, None, None, e)
+                fill_pool()
+
+    def _write_chunk_in_session(self, query: str, chunk: List[Dict], query_label: str) -> Tuple[int, float]:
+        """Commit one chunk on a dedicated session (sessions are not thread-safe)."""
+        with self.driver.session() as session:
+            started = time.perf_counter()
+            with self.metrics.query(f"{query_label} chunk", rows=len(chunk)):
+                count = session.execute_write(_run_counted_write, query, chunk)
+            return count, time.perf_counter() - started
+
+    @timed_stage("write_relationships")
+    def import_relationships(self, relationships: List[Dict], checkpoint_key: str = "relationships"):
+        """
+        Import relationships between entities.
+
+        Relationships are grouped by (from_type, rel_type, to_type) so each group
+        can be written with a single parameterised UNWIND statement per chunk
+        (batch_size rows, or the adaptive size for the relationships stage).
+        Rows whose endpoints cannot be matched are reported individually in
+        stats["errors"].
+        """
         if not relationships:
             return
 
@@ -774,49 +1429,320 @@ class BatchImporter:
                 print(f"      - {rel['from_id']} -{rel['rel_type']}-> {rel['to_id']}")
             if len(relationships) > 5:
                 print(f"      ... and {len(relationships) - 5} more")
-            self.stats["relationships_created"] = len(relationships)
+            self.stats["relationships_created"] += len(relationships)
             return
 
+        # Group by label/type combination (labels and rel types cannot be parameters)
+        groups: Dict[Tuple[str, str, str], List[Dict]] = {}
+        for rel in relationships:
+            properties = rel.get("properties", {})
+            properties[CONTENT_HASH_PROPERTY] = content_hash(properties)
+
+            # Add metadata
+            properties["ingestion_batch"] = self.batch_id
+            properties["created_at"] = int(time.time())
+
+            group = groups.setdefault((rel["from_type"], rel["rel_type"], rel["to_type"]), [])
+            group.append({
+                "idx": len(group),
+                "from_id": rel["from_id"],
+                "to_id": rel["to_id"],
+                "properties": properties
+            })
+
+        sizer = self._get_sizer("relationships")
         with self.driver.session() as session:
-            for rel in relationships:
-                try:
-                    from_type = rel["from_type"]
-                    to_type = rel["to_type"]
-                    rel_type = rel["rel_type"]
-                    properties = rel.get("properties", {})
-
-                    # Add metadata
-                    properties["ingestion_batch"] = self.batch_id
-                    properties["created_at"] = int(time.time())
-
-                    # Determine ID properties
-                    from_id_prop = self._get_id_property(from_type)
-                    to_id_prop = self._get_id_property(to_type)
-
-                    query = f"""
-                    MATCH (from:{from_type} {{{from_id_prop}: $from_id}})
-                    MATCH (to:{to_type} {{{to_id_prop}: $to_id}})
-                    MERGE (from)-[r:{rel_type}]->(to)
-                    ON CREATE SET r += $properties
-                    ON MATCH SET r += $properties
-                    RETURN COUNT(*) AS count
-                    """
-
-                    result = session.run(
-                        query,
-                        from_id=rel["from_id"],
-                        to_id=rel["to_id"],
-                        properties=properties
+            for (from_type, rel_type, to_type), rows in groups.items():
+                query = self._build_relationship_query(from_type, rel_type, to_type)
+                stage = f"{checkpoint_key}:{from_type}:{rel_type}:{to_type}"
+
+                spans = [(0, len(rows))]
+                if self.checkpoint:
+                    spans = self.checkpoint.pending_spans(stage, len(rows))
+
+                unchanged = self._find_unchanged_relationships(session, from_type, rel_type, to_type, rows)
+                if unchanged:
+                    self.stats["relationships_unchanged"] += len(unchanged)
+                    print(f"   ⏭️  Skipping {len(unchanged)} unchanged {rel_type} relationships (content hash match)")
+                queue = deque(_subtract_positions(spans, unchanged))
+
+                while queue:
+                    span_start, span_end = queue.popleft()
+                    end = min(span_start + sizer.next_size(), span_end)
+                    if end < span_end:
+                        queue.appendleft((end, span_end))
+                    chunk = rows[span_start:end]
+
+                    try:
+                        started = time.perf_counter()
+                        with self.metrics.query(f"{rel_type} chunk", rows=len(chunk)):
+                            results = list(session.run(query, rels=chunk))
+                        sizer.record_success(len(chunk), time.perf_counter() - started, payload_size(chunk))
+                        if self.checkpoint:
+                            self.checkpoint.record_chunk(stage, chunk[0]["idx"], chunk[-1]["idx"] + 1)
+                    except Exception as e:
+                        if sizer.record_failure(len(chunk), e):
+                            print(f"   ↘️  Relationship chunk too large ({e}); "
+                                  f"retrying in chunks of {sizer.next_size()}")
+                            queue.appendleft((span_start, end))
+                            continue
+
+                        # Isolate the failing row(s) so reporting stays per-relationship
+                        results = []
+                        for row in chunk:
+                            try:
+                                with self.metrics.query(f"{rel_type} row", rows=1):
+                                    results.extend(session.run(query, rels=[row]))
+                                if self.checkpoint:
+                                    self.checkpoint.record_chunk(stage, row["idx"], row["idx"] + 1)
+                            except Exception as row_error:
+                                error_msg = (
+                                    f"Failed to create relationship "
+                                    f"{row['from_id']} -{rel_type}-> {row['to_id']}: {row_error}"
+                                )
+                                self.stats["errors"].append(error_msg)
+                                print(f"   ❌ {error_msg}")
+
+                    self._record_relationship_results(
+                        results, chunk, from_type, rel_type, to_type
                     )
 
-                    self.stats["relationships_created"] += result.single()["count"]
+        print(f"   ✅ Imported {self.stats['relationships_created']} relationships")
 
-                except Exception as e:
-                    error_msg = f"Failed to create relationship {rel}: {e}"
-                    self.stats["errors"].append(error_msg)
-                    print(f"   ❌ {error_msg}")
+    def _find_unchanged_relationships(
+        self,
+        session,
+        from_type: str,
+        rel_type: str,
+        to_type: str,
+        rows: List[Dict]
+    ) -> Set[int]:
+        """Positions of relationship rows whose stored content_hash matches."""
+        if not self.content_hashing:
+            return set()
+
+        with self.metrics.query(f"{rel_type} content hashes", rows=len(rows)):
+            stored = fetch_relationship_hashes(
+                session,
+                from_type, self._get_id_property(from_type),
+                rel_type,
+                to_type, self._get_id_property(to_type),
+                [(row["from_id"], row["to_id"]) for row in rows]
+            )
 
-        print(f"   ✅ Imported {self.stats['relationships_created']} relationships")
+        return {
+            idx for idx, row in enumerate(rows)
+            if stored.get(idx) == row["properties"][CONTENT_HASH_PROPERTY]
+        }
+
+    def _build_relationship_query(self, from_type: str, rel_type: str, to_type: str) -> str:
+        """
+        Build the UNWIND statement for one (from_type, rel_type, to_type) group.
+
+        OPTIONAL MATCH keeps one row per input relationship so unmatched
+        endpoints are returned to the caller instead of being dropped.
+        """
+        from_id_prop = self._get_id_property(from_type)
+        to_id_prop = self._get_id_property(to_type)
+
+        return f"""
+        UNWIND $rels AS rel
+        OPTIONAL MATCH (from:{from_type} {{{from_id_prop}: rel.from_id}})
+        OPTIONAL MATCH (to:{to_type} {{{to_id_prop}: rel.to_id}})
+        FOREACH (_ IN CASE WHEN from IS NOT NULL AND to IS NOT NULL THEN [1] ELSE [] END |
+            MERGE (from)-[r:{rel_type}]->(to)
+            SET r += rel.properties
+        )
+        RETURN rel.idx AS idx,
+               from IS NOT NULL AS from_found,
+               to IS NOT NULL AS to_found
+        """
+
+    def _record_relationship_results(
+        self,
+        results: List[Any],
+        chunk: List[Dict],
+        from_type: str,
+        rel_type: str,
+        to_type: str
+    ):
+        """Update stats from one UNWIND chunk and list unmatched endpoints."""
+        rows_by_idx = {row["idx"]: row for row in chunk}
+        reported = set()
+
+        for record in results:
+            if record["from_found"] and record["to_found"]:
+                self.stats["relationships_created"] += 1
+                continue
+
+            idx = record["idx"]
+            if idx in reported:
+                continue
+            reported.add(idx)
+
+            row = rows_by_idx[idx]
+            missing = []
+            if not record["from_found"]:
+                missing.append(f"{from_type} '{row['from_id']}'")
+            if not record["to_found"]:
+                missing.append(f"{to_type} '{row['to_id']}'")
+
+            error_msg = (
+                f"Failed to create relationship {row['from_id']} -{rel_type}-> {row['to_id']}: "
+                f"node not found ({', '.join(missing)})"
+            )
+            self.stats["errors"].append(error_msg)
+            print(f"   ❌ {error_msg}")
+
+    def import_stream(
+        self,
+        input_path: Path,
+        chunk_size: int = 500,
+        sections: Tuple[str, ...] = ("figures", "works", "relationships"),
+        check_duplicates: bool = True,
+        validate_qids: bool = True
+    ) -> bool:
+        """
+        Import a batch file incrementally in bounded memory.
+
+        Records are read one at a time (JSON or NDJSON, see lib/batch_stream.py),
+        validated as they arrive, and fed to the regular duplicate detection,
+        Wikidata validation and import stages in chunks of `chunk_size`.
+        Figures and works are imported in a first pass over the file;
+        relationships are streamed in a second pass so their endpoints exist
+        regardless of section order. Invalid records are skipped and reported
+        in stats["errors"].
+
+        Returns:
+            True if every record passed schema validation
+        """
+        all_valid = True
+        metadata: Dict = {}
+        seen_metadata = False
+        counts = {"figures": 0, "works": 0, "relationships": 0}
+        pending: Dict[str, List[Dict]] = {"figures": [], "works": []}
+        chunk_start: Dict[str, int] = {"figures": 0, "works": 0}
+        validators = {
+            "figures": self._validate_figure_schema,
+            "works": self._validate_work_schema,
+            "relationships": self._validate_relationship_schema
+        }
+
+        def accept(section: str, record: Dict) -> bool:
+            nonlocal all_valid
+            idx = counts[section]
+            counts[section] += 1
+            errors = (
+                [f"{section}[{idx}]: must be an object"]
+                if not isinstance(record, dict)
+                else validators[section](record, idx)
+            )
+            if errors:
+                all_valid = False
+                for error in errors:
+                    self.stats["errors"].append(f"Skipped invalid record: {error}")
+                    print(f"   ❌ Skipped invalid record: {error}")
+            return not errors
+
+        def flush(section: str):
+            records = pending[section]
+            if not records:
+                return
+            start = chunk_start[section]
+            print(f"\n📦 Streaming {section} {start}-{start + len(records) - 1}")
+            self._import_stream_chunk(section, records, start, metadata, check_duplicates, validate_qids)
+            chunk_start[section] = counts[section]
+            pending[section] = []
+
+        # Pass 1: metadata, figures and works in file order
+        node_sections = tuple(s for s in ("figures", "works") if s in sections)
+        for section, value in iter_batch_records(input_path, sections=("metadata",) + node_sections):
+            if section == "metadata":
+                seen_metadata = True
+                metadata = value if isinstance(value, dict) else {}
+                for error in self._validate_metadata_schema(metadata):
+                    all_valid = False
+                    self.stats["errors"].append(error)
+                    print(f"   ❌ {error}")
+                continue
+
+            if accept(section, value):
+                pending[section].append(value)
+            if len(pending[section]) >= chunk_size:
+                flush(section)
+
+        for section in node_sections:
+            flush(section)
+
+        if not seen_metadata:
+            all_valid = False
+            self.stats["errors"].append("Missing required 'metadata' section")
+
+        # Pass 2: relationships
+        if "relationships" in sections:
+            valid_rels = (
+                rel for rel in iter_section(input_path, "relationships")
+                if accept("relationships", rel)
+            )
+            start = 0
+            for batch in chunked(valid_rels, chunk_size):
+                checkpoint_key = f"relationships@{start}"
+                print(f"\n📦 Streaming relationships {start}-{start + len(batch) - 1}")
+                if not self._stream_chunk_done(checkpoint_key):
+                    errors_before = len(self.stats["errors"])
+                    self.import_relationships(batch, checkpoint_key=checkpoint_key)
+                    self._release_stream_chunk(checkpoint_key, errors_before)
+                start += len(batch)
+
+        print(f"\n📄 Streamed {counts['figures']} figures, {counts['works']} works, "
+              f"{counts['relationships']} relationships")
+        return all_valid
+
+    def _import_stream_chunk(
+        self,
+        section: str,
+        records: List[Dict],
+        start: int,
+        metadata: Dict,
+        check_duplicates: bool,
+        validate_qids: bool
+    ):
+        """Run one streamed chunk of figures or works through the import stages."""
+        checkpoint_key = f"{section}@{start}"
+        if self._stream_chunk_done(checkpoint_key):
+            return
+
+        if section == "figures":
+            if check_duplicates:
+                self.detect_duplicate_figures(records, checkpoint_key=checkpoint_key)
+            if validate_qids:
+                self.validate_wikidata_qids({"figures": records})
+            errors_before = len(self.stats["errors"])
+            self.import_figures(records, metadata, checkpoint_key=checkpoint_key)
+        else:
+            if check_duplicates:
+                self.detect_duplicate_works(records, checkpoint_key=checkpoint_key)
+            if validate_qids:
+                self.validate_wikidata_qids({"works": records})
+            errors_before = len(self.stats["errors"])
+            self.import_works(records, metadata, checkpoint_key=checkpoint_key)
+        self._release_stream_chunk(checkpoint_key, errors_before)
+
+    def _stream_chunk_done(self, checkpoint_key: str) -> bool:
+        """True if a previous attempt fully wrote this streamed chunk."""
+        if self.checkpoint and self.checkpoint.is_done(checkpoint_key):
+            print("   ♻️  Already imported (checkpoint)")
+            return True
+        return False
+
+    def _release_stream_chunk(self, checkpoint_key: str, errors_before: int):
+        """
+        Mark a streamed chunk done and drop its IDs, duplicate results and
+        ranges from the checkpoint, so its state stays O(chunk). Chunks whose
+        writes reported errors keep their state for --resume.
+        """
+        if self.checkpoint and len(self.stats["errors"]) == errors_before:
+            self.checkpoint.release(checkpoint_key)
 
     def _get_id_property(self, node_type: str) -> str:
         """Get the canonical ID property for a node type."""
@@ -837,7 +1763,8 @@ class BatchImporter:
         MERGE (a:Agent {name: $agent_name})
         ON CREATE SET a.created_at = datetime()
         """
-        session.run(query_agent, agent_name=self.agent_name)
+        with self.metrics.query("Agent merge"):
+            session.run(query_agent, agent_name=self.agent_name).consume()
 
         # Create relationships
         id_prop = self._get_id_property(node_label)
@@ -851,7 +1778,8 @@ class BatchImporter:
         """
 
         node_ids = [node[id_prop] for node in nodes]
-        session.run(query, node_ids=node_ids, agent_name=self.agent_name, batch_id=self.batch_id)
+        with self.metrics.query(f"{node_label} CREATED_BY link", rows=len(node_ids)):
+            session.run(query, node_ids=node_ids, agent_name=self.agent_name, batch_id=self.batch_id).consume()
 
     def generate_report(self, output_path: str):
         """Generate detailed import report."""
@@ -867,12 +1795,67 @@ class BatchImporter:
             f.write("## Summary\n\n")
             f.write(f"- **Figures Created:** {self.stats['figures_created']}\n")
             f.write(f"- **Figures Skipped (Duplicate):** {self.stats['figures_skipped_duplicate']}\n")
+            f.write(f"- **Figures Skipped (Unchanged):** {self.stats['figures_unchanged']}\n")
             f.write(f"- **Works Created:** {self.stats['works_created']}\n")
             f.write(f"- **Works Skipped (Duplicate):** {self.stats['works_skipped_duplicate']}\n")
+            f.write(f"- **Works Skipped (Unchanged):** {self.stats['works_unchanged']}\n")
             f.write(f"- **Relationships Created:** {self.stats['relationships_created']}\n")
+            f.write(f"- **Relationships Skipped (Unchanged):** {self.stats['relationships_unchanged']}\n")
             f.write(f"- **Errors:** {len(self.stats['errors'])}\n")
             f.write(f"- **Warnings:** {len(self.stats['warnings'])}\n\n")
 
+            # Chunk sizes chosen per write stage
+            sizers = [sizer for sizer in self.batch_sizers.values() if sizer.history]
+            if sizers:
+                f.write("## Batch Sizing\n\n")
+                f.write(f"Mode: {'adaptive' if self.adaptive_batching else 'fixed'} "
+                        f"(start {self.batch_size}, target latency {self.target_latency:.1f}s)\n\n")
+                f.write("| Stage | Commits | Failed | Sizes | Final Size | Median Latency | Max Latency |\n")
+                f.write("|-------|---------|--------|-------|------------|----------------|-------------|\n")
+                for sizer in sizers:
+                    summary = sizer.summary()
+                    if summary["commits"]:
+                        f.write(f"| {summary['stage']} | {summary['commits']} | {summary['failures']} | "
+                                f"{summary['min_size']}-{summary['max_size']} | {summary['final_size']} | "
+                                f"{summary['median_latency']:.2f}s | {summary['max_latency']:.2f}s |\n")
+                    else:
+                        f.write(f"| {summary['stage']} | 0 | {summary['failures']} | - | "
+                                f"{summary['final_size']} | - | - |\n")
+                f.write("\n")
+
+            # Where the time went
+            metrics = self.metrics.to_dict()
+            f.write("## Performance\n\n")
+            f.write(f"- **Total Time:** {metrics['total_seconds']:.2f}s\n")
+            f.write(f"- **Neo4j Round Trips:** {metrics['round_trips']}\n")
+            f.write(f"- **Wikidata HTTP Requests Sent:** {metrics['http_calls']}\n")
+            cache = self.similarity_cache
+            hit_rate = f"{cache.hit_rate():.1%}" if cache.hit_rate() is not None else "n/a"
+            f.write(f"- **Similarity Cache:** {cache.hits} hits / {cache.misses} misses ({hit_rate} hit rate)\n")
+            wikidata_cache = get_wikidata_cache()
+            f.write(f"- **Wikidata HTTP Cache:** {wikidata_cache.hits} hits / {wikidata_cache.misses} misses\n\n")
+            if metrics["stages"]:
+                f.write("| Stage | Time | Rows | Rows/s | Round Trips | Query Time | HTTP Requests | Wikidata Time |\n")
+                f.write("|-------|------|------|--------|-------------|------------|------------|-----------|\n")
+                for stage in metrics["stages"]:
+                    rate = f"{stage['rows_per_second']:.1f}" if stage["rows_per_second"] else "-"
+                    f.write(f"| {stage['stage']} | {stage['seconds']:.2f}s | {stage['rows']} | {rate} | "
+                            f"{stage['round_trips']} | {stage['query_seconds']:.2f}s | "
+                            f"{stage['http_calls']} | {stage['http_seconds']:.2f}s |\n")
+                f.write("\n")
+            if metrics["slowest_queries"]:
+                f.write("### Slowest Queries\n\n")
+                f.write("| Stage | Query | Rows | Time |\n")
+                f.write("|-------|-------|------|------|\n")
+                for query in metrics["slowest_queries"]:
+                    f.write(f"| {query['stage']} | {query['query']} | {query['rows']} | "
+                            f"{query['seconds']:.3f}s |\n")
+                f.write("\n")
+
+            # Full create/update/no-op diff
+            if self.plan:
+                self._write_plan_section(f)
+
             # Duplicate figures
             if self.duplicate_figures:
                 f.write("## Duplicate Figures Detected\n\n")
@@ -922,6 +1905,65 @@ class BatchImporter:
 
         print(f"✅ Report saved to: {output_path}")
 
+        # Machine-readable sidecar for tracking import performance across batches
+        metrics_path = Path(output_path).with_suffix(".metrics.json")
+        self.metrics.write_json(str(metrics_path), extra={
+            "batch_id": self.batch_id,
+            "mode": "dry_run" if self.dry_run else "execute",
+            "workers": self.workers,
+            "counts": {
+                key: len(value) if isinstance(value, list) else value
+                for key, value in self.stats.items()
+            },
+            "batch_sizing": [sizer.summary() for sizer in self.batch_sizers.values() if sizer.history],
+            "similarity_cache": self.similarity_cache.stats(),
+            "wikidata_http_cache": get_wikidata_cache().stats()
+        })
+        print(f"✅ Metrics saved to: {metrics_path}")
+
+        if self.plan:
+            plan_path = Path(output_path).with_suffix(".plan.json")
+            with open(plan_path, 'w') as f:
+                json.dump({
+                    "batch_id": self.batch_id,
+                    "summary": {
+                        section: self._count_plan_actions(entries)
+                        for section, entries in self.plan.items()
+                    },
+                    "skipped_unchanged": self.skipped_unchanged,
+                    "plan": self.plan
+                }, f, indent=2, default=str)
+            print(f"✅ Import plan saved to: {plan_path}")
+
+    def _write_plan_section(self, f):
+        """Write the import plan (every record, grouped by action) to the report."""
+        f.write("## Import Plan\n\n")
+        if self.skipped_unchanged:
+            skipped = ", ".join(f"{count} {section}" for section, count in self.skipped_unchanged.items())
+            f.write(f"Unchanged records skipped: {skipped}\n\n")
+
+        f.write("| Section | Create | Update | No-op | Duplicate | Unresolved |\n")
+        f.write("|---------|--------|--------|-------|-----------|------------|\n")
+        for section, entries in self.plan.items():
+            counts = self._count_plan_actions(entries)
+            f.write(f"| {section} | " + " | ".join(
+                str(counts.get(action, 0))
+                for action in ("create", "update", "noop", "duplicate", "unresolved")
+            ) + " |\n")
+        f.write("\n")
+
+        for section, entries in self.plan.items():
+            f.write(f"### {section.capitalize()}\n\n")
+            for entry in entries:
+                label = f"{entry['name']} ({entry['key']})" if entry["name"] else entry["key"]
+                line = f"- **{entry['action']}** {label}"
+                if entry.get("reason"):
+                    line += f" - {entry['reason']}"
+                f.write(line + "\n")
+                for prop, change in entry["changes"].items():
+                    f.write(f"  - `{prop}`: {change['from']!r} → {change['to']!r}\n")
+            f.write("\n")
+
     def print_summary(self):
         """Print import summary to console."""
         print("\n" + "=" * 80)
@@ -931,9 +1973,37 @@ class BatchImporter:
         print(f"Mode: {'DRY RUN' if self.dry_run else 'LIVE EXECUTION'}")
         print(f"\nFigures Created: {self.stats['figures_created']}")
         print(f"Figures Skipped (Duplicate): {self.stats['figures_skipped_duplicate']}")
+        print(f"Figures Skipped (Unchanged): {self.stats['figures_unchanged']}")
         print(f"Works Created: {self.stats['works_created']}")
         print(f"Works Skipped (Duplicate): {self.stats['works_skipped_duplicate']}")
+        print(f"Works Skipped (Unchanged): {self.stats['works_unchanged']}")
         print(f"Relationships Created: {self.stats['relationships_created']}")
+        print(f"Relationships Skipped (Unchanged): {self.stats['relationships_unchanged']}")
+
+        if self.plan:
+            print("\nImport plan:")
+            for section, entries in self.plan.items():
+                counts = self._count_plan_actions(entries)
+                print(f"   - {section}: " + ", ".join(f"{count} {action}" for action, count in counts.items()))
+            if self.skipped_unchanged:
+                print("   Unchanged records skipped: " + ", ".join(
+                    f"{count} {section}" for section, count in self.skipped_unchanged.items()
+                ))
+
+        sizers = [sizer for sizer in self.batch_sizers.values() if sizer.history]
+        if sizers:
+            print(f"\nBatch sizes ({'adaptive' if self.adaptive_batching else 'fixed'}):")
+            for sizer in sizers:
+                print(f"   - {sizer.describe()}")
+
+        metrics = self.metrics.to_dict()
+        print(f"\nTiming: {metrics['total_seconds']:.2f}s total, "
+              f"{metrics['round_trips']} Neo4j round trips, {metrics['http_calls']} Wikidata HTTP requests")
+        for stage in metrics["stages"]:
+            rate = f", {stage['rows_per_second']:.1f} rows/s" if stage["rows_per_second"] else ""
+            print(f"   - {stage['stage']}: {stage['seconds']:.2f}s{rate}")
+        print(f"   - {self.similarity_cache.describe()}")
+        print(f"   - {get_wikidata_cache().describe()}")
 
         if self.stats['errors']:
             print(f"\n❌ Errors: {len(self.stats['errors'])}")
@@ -952,6 +2022,73 @@ class BatchImporter:
         print("=" * 80)
 
 
+def _diff_properties(existing: Dict, incoming: Dict) -> Dict[str, Dict[str, Any]]:
+    """
+    Properties `incoming` would change on a node/edge with `existing` properties.
+
+    Mirrors `n += incoming`: only keys present in `incoming` are compared, and
+    a None value removes the property.
+    """
+    changes = {}
+    for key, value in incoming.items():
+        if key in AUDIT_PROPERTIES or key == CONTENT_HASH_PROPERTY:
+            continue
+        old = existing.get(key)
+        if old != value:
+            changes[key] = {"from": old, "to": value}
+    return changes
+
+
+def _enhanced_similarity(name1: str, name2: str) -> float:
+    """70% lexical + 30% word-order-insensitive similarity of two normalized names."""
+    # Lexical similarity using Levenshtein distance
+    lexical_score = fuzz.ratio(name1, name2) / 100.0
+
+    # Phonetic similarity (simplified - would use double-metaphone in production)
+    # For now, use token_sort_ratio which handles word order
+    phonetic_score = fuzz.token_sort_ratio(name1, name2) / 100.0
+
+    # Weighted average: 70% lexical, 30% phonetic
+    return (lexical_score * 0.7) + (phonetic_score * 0.3)
+
+
+def _substring_similarity(name1: str, name2: str) -> float:
+    """Fallback when thefuzz is unavailable: exact or substring match only."""
+    if name1 == name2:
+        return 1.0
+    elif name1 in name2 or name2 in name1:
+        return 0.8
+    return 0.0
+
+
+def _subtract_positions(spans: List[Tuple[int, int]], skip: Set[int]) -> List[Tuple[int, int]]:
+    """Split half-open [start, end) spans around the positions in `skip`."""
+    if not skip:
+        return list(spans)
+
+    result = []
+    for start, end in spans:
+        run_start = start
+        for pos in range(start, end):
+            if pos in skip:
+                if run_start < pos:
+                    result.append((run_start, pos))
+                run_start = pos + 1
+        if run_start < end:
+            result.append((run_start, end))
+    return result
+
+
+def _count_batch_records(data: Dict) -> int:
+    """Number of records across the list sections of a batch document."""
+    return sum(len(value) for value in data.values() if isinstance(value, list))
+
+
+def _run_counted_write(tx, query: str, rows: List[Dict]) -> int:
+    """Transaction function for UNWIND writes that RETURN COUNT(*) AS count."""
+    return tx.run(query, rows=rows).single()["count"]
+
+
 def main():
     """Main entry point for batch import CLI."""
     parser = argparse.ArgumentParser(
@@ -970,6 +2107,24 @@ Examples:
 
   # Custom batch size and agent name
   python batch_import.py data/batch.json --execute --batch-size 100 --agent batch-import-v2
+
+  # Commit node batches from 4 concurrent sessions
+  python batch_import.py data/batch.json --execute --workers 4
+
+  # Let chunk sizes adapt to commit latency (starting from --batch-size)
+  python batch_import.py data/batch.json --execute --adaptive-batch-size --target-latency 1.5
+
+  # Resume an interrupted import from its checkpoint
+  python batch_import.py data/batch.json --execute --resume
+
+  # Stream a very large file (JSON or NDJSON) in bounded memory
+  python batch_import.py data/huge_export.ndjson --execute --stream
+
+  # Read-only create/update/no-op diff against the database
+  python batch_import.py data/batch.json --plan
+
+  # Re-import, writing only records that are new or changed
+  python batch_import.py data/batch.json --execute --skip-unchanged
         """
     )
 
@@ -994,6 +2149,24 @@ Examples:
         default=50,
         help="Number of records per transaction (default: 50)"
     )
+    parser.add_argument(
+        "--adaptive-batch-size",
+        action="store_true",
+        help="Treat --batch-size as a starting point and adapt chunk sizes per stage "
+             "from observed commit latency (shrinks on timeouts/memory errors)"
+    )
+    parser.add_argument(
+        "--target-latency",
+        type=float,
+        default=DEFAULT_TARGET_LATENCY,
+        help=f"Commit latency in seconds that adaptive batching aims for (default: {DEFAULT_TARGET_LATENCY})"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Concurrent sessions for committing figure/work batches (default: 1)"
+    )
     parser.add_argument(
         "--agent",
         default="batch-importer",
@@ -1019,6 +2192,57 @@ Examples:
         action="store_true",
         help="Skip Wikidata Q-ID validation (faster but not recommended)"
     )
+    parser.add_argument(
+        "--wikidata-cache-only",
+        action="store_true",
+        help="Answer Wikidata lookups from the local HTTP cache only (offline); "
+             "uncached lookups fail like network errors"
+    )
+    parser.add_argument(
+        "--no-wikidata-cache",
+        action="store_true",
+        help="Always query Wikidata, bypassing the local HTTP cache"
+    )
+    parser.add_argument(
+        "--wikidata-entity-store",
+        metavar="PATH",
+        help="Answer Q-ID validation and work search from an offline entity store "
+             "(scripts/maintenance/build_wikidata_entity_store.py), querying Wikidata only for what it lacks"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume the last interrupted --execute run of this file from its checkpoint"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read, validate and import records incrementally (JSON or .ndjson/.jsonl); "
+             "invalid records are skipped and invalid Q-IDs are reported without prompting"
+    )
+    parser.add_argument(
+        "--stream-chunk-size",
+        type=int,
+        default=500,
+        help="Records per streamed chunk fed to duplicate detection/import (default: 500)"
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Read-only: classify every record as create/update/no-op with bulk reads "
+             "and write the full diff to the report (no schema setup, no Wikidata calls)"
+    )
+    parser.add_argument(
+        "--skip-unchanged",
+        action="store_true",
+        help="Plan first and drop records that already match the database from the import "
+             "(not with --resume)"
+    )
+    parser.add_argument(
+        "--force-rewrite",
+        action="store_true",
+        help="Write every record even if its stored content hash shows it is unchanged"
+    )
     parser.add_argument(
         "--report",
         default="batch_import_report.md",
@@ -1027,6 +2251,23 @@ Examples:
 
     args = parser.parse_args()
 
+    if args.plan and args.execute:
+        parser.error("--plan never writes; drop --execute")
+    if args.stream and (args.plan or args.skip_unchanged):
+        parser.error("--plan/--skip-unchanged need the whole file and cannot be combined with --stream")
+    if args.resume and args.skip_unchanged:
+        # Dropping no-op records renumbers rows; checkpoint spans, cached duplicates
+        # and generated IDs are keyed by the original positions
+        parser.error("--skip-unchanged cannot be combined with --resume "
+                     "(resumed writes already skip unchanged records via content hashes)")
+    if args.wikidata_cache_only and args.no_wikidata_cache:
+        parser.error("--wikidata-cache-only needs the cache; drop --no-wikidata-cache")
+    configure_cache(enabled=not args.no_wikidata_cache, cache_only=args.wikidata_cache_only)
+    if args.wikidata_entity_store:
+        if not Path(args.wikidata_entity_store).exists():
+            parser.error(f"no entity store at {args.wikidata_entity_store}")
+        configure_entity_store(args.wikidata_entity_store)
+
     # Load environment
     load_dotenv()
 
@@ -1044,15 +2285,17 @@ Examples:
         print(f"❌ Error: File not found: {input_path}")
         sys.exit(1)
 
-    try:
-        with open(input_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
-        print(f"❌ Error: Invalid JSON in '{input_path}': {e}")
-        sys.exit(1)
-    except Exception as e:
-        print(f"❌ Error reading file: {e}")
-        sys.exit(1)
+    data = None
+    if not args.stream:
+        try:
+            with open(input_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except json.JSONDecodeError as e:
+            print(f"❌ Error: Invalid JSON in '{input_path}': {e}")
+            sys.exit(1)
+        except Exception as e:
+            print(f"❌ Error reading file: {e}")
+            sys.exit(1)
 
     # Determine mode
     dry_run = not args.execute
@@ -1062,9 +2305,13 @@ Examples:
     print("Fictotum Batch Import Tool (CHR-40)")
     print("=" * 80)
     print(f"Input file: {input_path}")
-    print(f"Mode: {'DRY RUN (preview only)' if dry_run else 'LIVE EXECUTION'}")
+    if args.plan:
+        print("Mode: PLAN (read-only diff)")
+    else:
+        print(f"Mode: {'DRY RUN (preview only)' if dry_run else 'LIVE EXECUTION'}")
     print(f"Agent: {args.agent}")
-    print(f"Batch size: {args.batch_size}")
+    print(f"Batch size: {args.batch_size}{' (adaptive)' if args.adaptive_batch_size else ''}")
+    print(f"Workers: {args.workers}")
     print("=" * 80)
 
     if not dry_run:
@@ -1081,57 +2328,118 @@ Examples:
         pwd=pwd,
         dry_run=dry_run,
         batch_size=args.batch_size,
-        agent_name=args.agent
+        agent_name=args.agent,
+        workers=args.workers,
+        adaptive_batching=args.adaptive_batch_size,
+        target_latency=args.target_latency,
+        content_hashing=not args.force_rewrite
     )
 
-    try:
-        # Step 1: Validate JSON schema
-        print("\n📋 Step 1: Validating JSON schema...")
-        is_valid, errors = importer.validate_json_schema(data)
-        if not is_valid:
-            print("❌ JSON schema validation failed:")
-            for error in errors:
-                print(f"   - {error}")
-            sys.exit(1)
-        print("✅ JSON schema valid")
-
-        # Step 2: Setup schema
-        print("\n📋 Step 2: Setting up database schema...")
-        importer.setup_schema()
-
-        # Step 3: Duplicate detection
-        if not args.skip_duplicate_check:
-            if "figures" in data and not args.works_only:
-                importer.detect_duplicate_figures(data["figures"])
-            if "works" in data and not args.figures_only:
-                importer.detect_duplicate_works(data["works"])
-
-        # Step 4: Wikidata validation
-        if not args.skip_wikidata_validation:
-            print("\n📋 Step 4: Validating Wikidata Q-IDs...")
-            importer.validate_wikidata_qids(data)
+    # Checkpoint journal (live runs only; dry runs commit nothing)
+    if not dry_run:
+        checkpoint = ImportCheckpoint.start(input_path, importer.batch_id, resume=args.resume)
+        importer.attach_checkpoint(checkpoint)
+        if args.resume and checkpoint.state["stages"]:
+            stages = [stage for stage in checkpoint.state["stages"] if "@" not in stage]
+            streamed = len(checkpoint.state["stages"]) - len(stages)
+            print(f"♻️  Resuming batch {checkpoint.batch_id} "
+                  f"(completed stages: {', '.join(stages) or 'none'}"
+                  f"{f', {streamed} streamed chunks' if streamed else ''})")
+        elif args.resume:
+            print("ℹ️  No interrupted run found for this file; starting a new checkpoint")
+        print(f"Checkpoint: {checkpoint.path}")
+
+    sections = ("figures", "works", "relationships")
+    if args.figures_only:
+        sections = ("figures",)
+    elif args.works_only:
+        sections = ("works",)
 
+    try:
+        if not args.stream:
+            # Step 1: Validate JSON schema
+            print("\n📋 Step 1: Validating JSON schema...")
+            is_valid, errors = importer.validate_json_schema(data)
+            if not is_valid:
+                print("❌ JSON schema validation failed:")
+                for error in errors:
+                    print(f"   - {error}")
+                sys.exit(1)
+            print("✅ JSON schema valid")
+
+        if args.stream:
+            # Streaming mode: validate and import chunk by chunk
+            print("\n📋 Step 1: Setting up database schema...")
+            importer.setup_schema()
+
+            print(f"\n📋 Step 2: Streaming import (chunks of {args.stream_chunk_size})...")
+            all_valid = importer.import_stream(
+                input_path,
+                chunk_size=args.stream_chunk_size,
+                sections=sections,
+                check_duplicates=not args.skip_duplicate_check,
+                validate_qids=not args.skip_wikidata_validation
+            )
+            if not all_valid:
+                print("\n⚠️  Some records failed validation and were skipped (see report)")
             if importer.invalid_qids:
-                print("\n⚠️  WARNING: Found invalid Q-IDs. Continue anyway?")
-                if not dry_run:
-                    response = input("Type 'YES' to continue: ")
-                    if response != "YES":
-                        print("❌ Aborted.")
-                        sys.exit(0)
-
-        # Step 5: Import data
-        print("\n📋 Step 5: Importing data...")
+                print(f"\n⚠️  {len(importer.invalid_qids)} invalid Q-IDs were imported (see report)")
+        elif args.plan:
+            # Plan mode: bulk reads only, nothing is written
+            print("\n📋 Step 2: Planning import against current database state...")
+            importer.plan_import(data, sections)
+        else:
+            # Step 2: Setup schema
+            print("\n📋 Step 2: Setting up database schema...")
+            importer.setup_schema()
+
+            # Drop records that already match the database
+            if args.skip_unchanged:
+                importer.plan_import(data, sections)
+                skipped = importer.skip_unchanged(data)
+                print("⏭️  Skipping unchanged records: " + ", ".join(
+                    f"{count} {section}" for section, count in skipped.items()
+                ))
+
+            # Step 3: Duplicate detection
+            if not args.skip_duplicate_check:
+                if "figures" in data and not args.works_only:
+                    importer.detect_duplicate_figures(data["figures"])
+                if "works" in data and not args.figures_only:
+                    importer.detect_duplicate_works(data["works"])
+
+            # Step 4: Wikidata validation
+            if not args.skip_wikidata_validation:
+                print("\n📋 Step 4: Validating Wikidata Q-IDs...")
+                importer.validate_wikidata_qids(data)
+
+                if importer.invalid_qids:
+                    print("\n⚠️  WARNING: Found invalid Q-IDs. Continue anyway?")
+                    if not dry_run:
+                        response = input("Type 'YES' to continue: ")
+                        if response != "YES":
+                            print("❌ Aborted.")
+                            sys.exit(0)
+
+            # Step 5: Import data
+            print("\n📋 Step 5: Importing data...")
+
+            metadata = data.get("metadata", {})
 
-        metadata = data.get("metadata", {})
+            if "figures" in data and not args.works_only:
+                importer.import_figures(data["figures"], metadata)
 
-        if "figures" in data and not args.works_only:
-            importer.import_figures(data["figures"], metadata)
+            if "works" in data and not args.figures_only:
+                importer.import_works(data["works"], metadata)
 
-        if "works" in data and not args.figures_only:
-            importer.import_works(data["works"], metadata)
+            if "relationships" in data and not args.figures_only and not args.works_only:
+                importer.import_relationships(data["relationships"])
 
-        if "relationships" in data and not args.figures_only and not args.works_only:
-            importer.import_relationships(data["relationships"])
+        if importer.checkpoint:
+            if importer.stats["errors"]:
+                print(f"\n💾 Checkpoint kept for --resume: {importer.checkpoint.path}")
+            else:
+                importer.checkpoint.mark_completed()
 
         # Step 6: Generate report
         print("\n📋 Step 6: Generating report...")
@@ -1141,7 +2449,9 @@ Examples:
         # Print summary
         importer.print_summary()
 
-        if dry_run:
+        if args.plan:
+            print("\n💡 TIP: Run with --execute --skip-unchanged to write only new and changed records")
+        elif dry_run:
             print("\n💡 TIP: Run with --execute to perform actual import")
         else:
             print("\n✅ Import completed successfully!")
@@ -1150,6 +2460,9 @@ Examples:
         print(f"\n❌ Error during import: {e}")
         import traceback
         traceback.print_exc()
+        if importer.checkpoint:
+            importer.checkpoint.save()
+            print("💡 TIP: Re-run with --execute --resume to continue from the last committed batch")
         sys.exit(1)
 
     finally:
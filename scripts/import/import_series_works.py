@@ -7,13 +7,17 @@ Target: 150-200 MediaWork nodes with PART_OF relationships to Series nodes.
 """
 
 import os
+import sys
 import json
 import time
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, List, Optional
-import requests
 from neo4j import GraphDatabase
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib.wikidata_client import get_client
+
 # Target series with Wikidata Q-IDs
 TARGET_SERIES = {
     "Sharpe": "Q1240561",
@@ -74,19 +78,10 @@ class SeriesWorkImporter:
         ORDER BY xsd:integer(?seriesOrdinal)
         """
 
-        url = "https://query.wikidata.org/sparql"
         headers = {"User-Agent": "Fictotum/1.0 (Historical Fiction Research)"}
 
         try:
-            response = requests.get(
-                url,
-                params={"query": sparql_query, "format": "json"},
-                headers=headers,
-                timeout=30
-            )
-            response.raise_for_status()
-
-            data = response.json()
+            data = get_client().sparql(sparql_query, headers=headers, timeout=30)
             works = []
 
             for binding in data.get("results", {}).get("bindings", []):
@@ -297,7 +292,6 @@ class SeriesWorkImporter:
         for series_name, series_qid in TARGET_SERIES.items():
             try:
                 self.import_series(series_name, series_qid)
-                time.sleep(1)  # Pause between series to be polite to Wikidata
             except Exception as e:
                 print(f"❌ Fatal error processing {series_name}: {e}")
                 self.stats["errors"].append(f"Series {series_name}: {str(e)}")
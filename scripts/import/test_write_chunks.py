@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Chunked Write Tests for BatchImporter
+
+Exercises _write_chunks against a fake Neo4j driver (no database needed):
+adaptive retries of chunks that time out, sequentially and with workers.
+
+Usage:
+    python test_write_chunks.py
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from batch_import import BatchImporter
+
+
+class FakeSession:
+    """Session whose execute_write raises TimeoutError for the first `failures` chunks."""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_write(self, work, query, rows):
+        with self.driver.lock:
+            self.driver.attempts.append(len(rows))
+            if self.driver.failures > 0:
+                self.driver.failures -= 1
+                raise TimeoutError("transaction timed out")
+        return len(rows)
+
+
+class FakeDriver:
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.attempts = []
+        self.lock = threading.Lock()
+
+    def session(self):
+        return FakeSession(self)
+
+    def close(self):
+        pass
+
+
+def make_importer(failures: int, batch_size: int, workers: int = 1) -> BatchImporter:
+    importer = BatchImporter(
+        "bolt://localhost:7687", "neo4j", "unused",
+        dry_run=False,
+        batch_size=batch_size,
+        workers=workers,
+        adaptive_batching=True
+    )
+    importer.driver = FakeDriver(failures)
+    return importer
+
+
+def test_retries_can_outnumber_rows():
+    """A retried chunk takes a new batch number; more attempts than rows must not abort the write."""
+    print("\n" + "=" * 80)
+    print("TEST: Adaptive retries with more attempts than rows")
+    print("=" * 80)
+
+    importer = make_importer(failures=1, batch_size=2)
+    rows = [{"name": "Marcus Tullius Cicero"}, {"name": "Gaius Julius Caesar"}]
+    importer._write_chunks("UNWIND $rows AS row RETURN count(*) AS count", rows,
+                           "figures_created", "figure", "figures")
+
+    attempts = importer.driver.attempts
+    assert len(attempts) > len(rows), f"Expected a retry to add attempts, got {attempts}"
+    assert importer.stats["figures_created"] == len(rows), importer.stats
+    assert not importer.stats["errors"], importer.stats["errors"]
+    print(f"✅ {len(attempts)} attempts for {len(rows)} rows, all rows committed")
+
+
+def test_retries_with_workers():
+    """Same with concurrent workers, where retries are re-queued from worker results."""
+    print("\n" + "=" * 80)
+    print("TEST: Adaptive retries with workers")
+    print("=" * 80)
+
+    importer = make_importer(failures=2, batch_size=4, workers=2)
+    rows = [{"name": f"Figure {i}"} for i in range(4)]
+    importer._write_chunks("UNWIND $rows AS row RETURN count(*) AS count", rows,
+                           "figures_created", "figure", "figures")
+
+    attempts = importer.driver.attempts
+    assert len(attempts) > len(rows), f"Expected retries to add attempts, got {attempts}"
+    assert importer.stats["figures_created"] == len(rows), importer.stats
+    assert not importer.stats["errors"], importer.stats["errors"]
+    print(f"✅ {len(attempts)} attempts for {len(rows)} rows, all rows committed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("=" * 80)
+    print("BatchImporter Chunked Write Tests")
+    print("=" * 80)
+
+    try:
+        test_retries_can_outnumber_rows()
+        test_retries_with_workers()
+
+        print("\n" + "=" * 80)
+        print("✅ ALL TESTS PASSED")
+        print("=" * 80)
+
+    except AssertionError as e:
+        print("\n" + "=" * 80)
+        print(f"❌ TEST FAILED: {e}")
+        print("=" * 80)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run_all_tests()
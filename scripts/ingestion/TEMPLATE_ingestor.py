@@ -8,6 +8,7 @@ This template follows all scalability best practices:
 2. Includes timestamp auditing (created_at, ingestion_batch, ingestion_source)
 3. Uses bounded collections where applicable
 4. Follows MediaWork Ingestion Protocol from CLAUDE.md
+5. Stores a content_hash per node and skips nodes unchanged since the last run
 
 USE THIS TEMPLATE FOR ALL NEW INGESTION SCRIPTS
 """
@@ -15,6 +16,7 @@ USE THIS TEMPLATE FOR ALL NEW INGESTION SCRIPTS
 import os
 import json
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
@@ -23,6 +25,9 @@ from neo4j import GraphDatabase
 # Add parent directory to path for schema import
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from schema import SCHEMA_CONSTRAINTS
+from lib.adaptive_batch import AdaptiveBatchSizer, payload_size
+from lib.content_hash import CONTENT_HASH_PROPERTY, content_hash, fetch_node_hashes
+from lib.phonetic_keys import PHONETIC_LABELS, phonetic_keys
 
 
 class ScalableIngestor:
@@ -30,7 +35,7 @@ class ScalableIngestor:
     Template ingestor class following Fictotum scalability guidelines.
     """
 
-    def __init__(self, uri, user, pwd, batch_name="custom_batch"):
+    def __init__(self, uri, user, pwd, batch_name="custom_batch", batch_size=100, adaptive_batching=True):
         """
         Initialize the ingestor with database connection and metadata tracking.
 
@@ -39,6 +44,8 @@ class ScalableIngestor:
             user: Neo4j username
             pwd: Neo4j password
             batch_name: Name identifier for this batch (used in tracking)
+            batch_size: Rows per UNWIND transaction (starting size if adaptive)
+            adaptive_batching: Grow/shrink chunk sizes per label from commit latency
         """
         # SSL certificate handling for Neo4j Aura
         if uri.startswith("neo4j+s://"):
@@ -50,10 +57,16 @@ class ScalableIngestor:
         self.batch_id = f"{batch_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         self.source_name = f"{batch_name}_v1"
 
+        # Chunk size controllers, one per node label
+        self.batch_size = batch_size
+        self.adaptive_batching = adaptive_batching
+        self.batch_sizers = {}
+
         # Tracking report
         self.report = {
             "nodes_created": 0,
             "nodes_updated": 0,
+            "nodes_unchanged": 0,
             "rels_created": 0,
             "errors": []
         }
@@ -78,6 +91,8 @@ class ScalableIngestor:
         1. Uses wikidata_id for MediaWork (not media_id)
         2. Adds ingestion_batch and ingestion_source for auditing
         3. Sets created_at on creation, updated_at on match
+        4. Writes in bounded UNWIND chunks sized per label by AdaptiveBatchSizer
+        5. Skips nodes whose stored content_hash matches (no rewrite, no updated_at bump)
 
         Args:
             nodes: List of node dictionaries
@@ -89,6 +104,9 @@ class ScalableIngestor:
 
         # Add timestamp auditing metadata to each node
         for node in nodes:
+            node[CONTENT_HASH_PROPERTY] = content_hash(node)
+            if label in PHONETIC_LABELS:
+                node.update(phonetic_keys(node.get('name')))
             if 'ingestion_batch' not in node:
                 node['ingestion_batch'] = self.batch_id
             if 'ingestion_source' not in node:
@@ -98,6 +116,18 @@ class ScalableIngestor:
         # This follows the MediaWork Ingestion Protocol from CLAUDE.md
         merge_key = 'wikidata_id' if label == 'MediaWork' else id_property
 
+        # Drop nodes unchanged since the last run (one bulk read)
+        with self.driver.session() as session:
+            stored = fetch_node_hashes(session, label, merge_key, [node.get(id_property) for node in nodes])
+        changed = [node for node in nodes if stored.get(node.get(id_property)) != node[CONTENT_HASH_PROPERTY]]
+        unchanged = len(nodes) - len(changed)
+        if unchanged:
+            self.report['nodes_unchanged'] += unchanged
+            print(f"⏭️  {label}: {unchanged} unchanged (content hash match), skipped.")
+        nodes = changed
+        if not nodes:
+            return
+
         query = f"""
         UNWIND $nodes AS node_data
         MERGE (n:{label} {{{merge_key}: node_data.{id_property}}})
@@ -105,16 +135,41 @@ class ScalableIngestor:
         ON MATCH SET n += node_data, n.updated_at = datetime()
         """
 
+        if label not in self.batch_sizers:
+            self.batch_sizers[label] = AdaptiveBatchSizer(
+                label, initial_size=self.batch_size, adaptive=self.adaptive_batching
+            )
+        sizer = self.batch_sizers[label]
+
+        created = 0
+        succeeded_rows = 0
+        start = 0
         with self.driver.session() as session:
-            result = session.run(query, nodes=nodes)
-            summary = result.consume()
-            created = summary.counters.nodes_created
-            updated = len(nodes) - created
+            while start < len(nodes):
+                chunk = nodes[start:start + sizer.next_size()]
+                started = time.perf_counter()
+                try:
+                    summary = session.run(query, nodes=chunk).consume()
+                except Exception as e:
+                    if sizer.record_failure(len(chunk), e):
+                        continue  # retry the same rows with a smaller chunk
+                    error_msg = f"Error merging {label} rows {start}-{start + len(chunk) - 1}: {str(e)}"
+                    self.report['errors'].append(error_msg)
+                    print(f"❌ {error_msg}")
+                    start += len(chunk)
+                    continue
+
+                sizer.record_success(len(chunk), time.perf_counter() - started, payload_size(chunk))
+                created += summary.counters.nodes_created
+                succeeded_rows += len(chunk)
+                start += len(chunk)
 
-            self.report['nodes_created'] += created
-            self.report['nodes_updated'] += updated
+        # Rows of chunks that failed are in report['errors'], not updated
+        updated = succeeded_rows - created
+        self.report['nodes_created'] += created
+        self.report['nodes_updated'] += updated
 
-            print(f"✅ {label}: {created} created, {updated} updated.")
+        print(f"✅ {label}: {created} created, {updated} updated. ({sizer.describe()})")
 
     def _ingest_relationships(self, relationships):
         """
@@ -197,7 +252,10 @@ class ScalableIngestor:
         print(f"Source: {self.source_name}")
         print(f"Nodes created: {self.report['nodes_created']}")
         print(f"Nodes updated: {self.report['nodes_updated']}")
+        print(f"Nodes unchanged (skipped): {self.report['nodes_unchanged']}")
         print(f"Relationships created: {self.report['rels_created']}")
+        for sizer in self.batch_sizers.values():
+            print(f"Batch sizes - {sizer.describe()}")
 
         if self.report['errors']:
             print(f"\n❌ Errors ({len(self.report['errors'])}):")
@@ -12,8 +12,10 @@ Usage:
 """
 
 import json
+import math
 import sys
 import os
+from collections import Counter, defaultdict
 from pathlib import Path
 from typing import Dict, List, Any, Tuple, Optional
 from neo4j import GraphDatabase
@@ -29,6 +31,8 @@ if not all([NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD]):
 
 # Import name matching utilities
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'web-app'))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib.similarity_cache import normalize_name
 
 try:
     # Try to import from Next.js lib (if running with proper Python path)
@@ -39,6 +43,96 @@ except ImportError:
     HAS_API_ACCESS = False
     print("⚠️  Warning: requests library not available. Using database-only matching.")
 
+
+def bigrams(text: str) -> set:
+    """Character bigrams of a normalized name."""
+    return set(text[i:i+2] for i in range(len(text) - 1))
+
+
+class ExistingFigureIndex:
+    """
+    Existing figures indexed once for a whole import file.
+
+    - wikidata_id / canonical_id lookups are dict probes instead of a list walk
+    - bigram signatures are computed once per existing name
+    - similarity candidates come from a prefix-filtered bigram index: for
+      Jaccard >= t two signatures must share at least ceil(t * |A|) bigrams, so
+      only the rarest |A| - ceil(t * |A|) + 1 bigrams of each name need to be
+      indexed/probed. Candidates are then scored exactly, so results are the
+      same as scoring every pair.
+    """
+
+    def __init__(self, figures: List[Dict]):
+        self.figures = figures
+
+        # First position per ID, to keep the linear scan's "first match wins"
+        self.by_qid: Dict[str, int] = {}
+        self.by_cid: Dict[str, int] = {}
+        for pos, fig in enumerate(figures):
+            if fig.get('wikidata_id'):
+                self.by_qid.setdefault(fig['wikidata_id'], pos)
+            if fig.get('canonical_id'):
+                self.by_cid.setdefault(fig['canonical_id'], pos)
+
+        self.names = [normalize_name(fig.get('name') or '') for fig in figures]
+        self.by_name: Dict[str, List[int]] = defaultdict(list)
+        for pos, name in enumerate(self.names):
+            self.by_name[name].append(pos)
+
+        self.signatures = [bigrams(name) for name in self.names]
+        self.frequency = Counter(gram for sig in self.signatures for gram in sig)
+        self._postings: Dict[float, Dict[str, List[int]]] = {}
+
+    def exact(self, import_fig: Dict) -> Optional[Dict]:
+        """Existing figure with the same wikidata_id or canonical_id, if any."""
+        positions = [
+            self.by_qid.get(import_fig.get('wikidata_id')) if import_fig.get('wikidata_id') else None,
+            self.by_cid.get(import_fig.get('canonical_id')) if import_fig.get('canonical_id') else None
+        ]
+        positions = [pos for pos in positions if pos is not None]
+        return self.figures[min(positions)] if positions else None
+
+    def _prefix(self, signature: set, threshold: float) -> List[str]:
+        required = math.ceil(threshold * len(signature) - 1e-9)
+        ordered = sorted(signature, key=lambda gram: (self.frequency.get(gram, 0), gram))
+        return ordered[:len(signature) - required + 1]
+
+    def _postings_for(self, threshold: float) -> Dict[str, List[int]]:
+        if threshold not in self._postings:
+            postings = defaultdict(list)
+            for pos, signature in enumerate(self.signatures):
+                for gram in self._prefix(signature, threshold):
+                    postings[gram].append(pos)
+            self._postings[threshold] = postings
+        return self._postings[threshold]
+
+    def similar(self, name: str, threshold: float) -> List[Tuple[int, float]]:
+        """(position, bigram Jaccard) of existing figures scoring >= threshold, in position order."""
+        name = normalize_name(name)
+        signature = bigrams(name)
+
+        if threshold <= 0:
+            candidates = range(len(self.figures))
+        else:
+            postings = self._postings_for(threshold)
+            candidates = set(self.by_name.get(name, []))
+            for gram in self._prefix(signature, threshold):
+                candidates.update(postings.get(gram, ()))
+
+        matches = []
+        for pos in sorted(candidates):
+            other = self.signatures[pos]
+            if self.names[pos] == name:
+                similarity = 1.0
+            elif signature and other:
+                similarity = len(signature & other) / len(signature | other)
+            else:
+                similarity = 0.0
+            if similarity >= threshold:
+                matches.append((pos, similarity))
+        return matches
+
+
 class DuplicateChecker:
     def __init__(self, auto_resolve: bool = False, save_resolutions: bool = False):
         self.driver = GraphDatabase.driver(
@@ -118,57 +212,21 @@ class DuplicateChecker:
 
             return media_works
 
-    def check_exact_match(self, import_fig: Dict, existing_figs: List[Dict]) -> Optional[Dict]:
+    def check_exact_match(self, import_fig: Dict, existing: ExistingFigureIndex) -> Optional[Dict]:
         """Check for exact match by wikidata_id or canonical_id"""
-        import_qid = import_fig.get('wikidata_id')
-        import_cid = import_fig.get('canonical_id')
-
-        for existing in existing_figs:
-            # Check Wikidata ID match
-            if import_qid and existing.get('wikidata_id') == import_qid:
-                return existing
-
-            # Check canonical ID match
-            if import_cid and existing.get('canonical_id') == import_cid:
-                return existing
-
-        return None
-
-    def simple_name_similarity(self, name1: str, name2: str) -> float:
-        """
-        Simple name similarity using character overlap.
-        Returns score from 0.0 to 1.0.
-        """
-        name1_lower = name1.lower().strip()
-        name2_lower = name2.lower().strip()
-
-        if name1_lower == name2_lower:
-            return 1.0
-
-        # Jaccard similarity on character n-grams
-        def get_ngrams(text: str, n: int = 2) -> set:
-            return set(text[i:i+n] for i in range(len(text) - n + 1))
-
-        ngrams1 = get_ngrams(name1_lower)
-        ngrams2 = get_ngrams(name2_lower)
-
-        if not ngrams1 or not ngrams2:
-            return 0.0
-
-        intersection = len(ngrams1 & ngrams2)
-        union = len(ngrams1 | ngrams2)
-
-        return intersection / union if union > 0 else 0.0
+        return existing.exact(import_fig)
 
     def check_similarity_match(
         self,
         import_fig: Dict,
-        existing_figs: List[Dict],
+        existing: ExistingFigureIndex,
         threshold: float = 0.85
     ) -> List[Tuple[Dict, float]]:
         """
         Check for high similarity matches using name similarity.
         Returns list of (existing_figure, similarity_score) tuples.
+
+        Candidates and bigram Jaccard scores come from the prebuilt index.
         """
         import_name = import_fig.get('name', '')
         import_birth = import_fig.get('birth_year')
@@ -177,31 +235,27 @@ class DuplicateChecker:
 
         matches = []
 
-        for existing in existing_figs:
-            existing_name = existing.get('name', '')
+        for pos, similarity in existing.similar(import_name, threshold):
+            existing_fig = existing.figures[pos]
 
-            # Calculate name similarity
-            similarity = self.simple_name_similarity(import_name, existing_name)
-
-            if similarity >= threshold:
-                # Boost score if years match
-                year_match = False
-                if import_birth and existing.get('birth_year'):
-                    if abs(import_birth - existing['birth_year']) <= 5:
-                        year_match = True
-                        similarity = min(1.0, similarity + 0.1)
+            # Boost score if years match
+            year_match = False
+            if import_birth and existing_fig.get('birth_year'):
+                if abs(import_birth - existing_fig['birth_year']) <= 5:
+                    year_match = True
+                    similarity = min(1.0, similarity + 0.1)
 
-                if import_death and existing.get('death_year'):
-                    if abs(import_death - existing['death_year']) <= 5:
-                        year_match = True
-                        similarity = min(1.0, similarity + 0.1)
+            if import_death and existing_fig.get('death_year'):
+                if abs(import_death - existing_fig['death_year']) <= 5:
+                    year_match = True
+                    similarity = min(1.0, similarity + 0.1)
 
-                # Boost if era matches
-                if import_era and existing.get('era'):
-                    if import_era.lower() == existing['era'].lower():
-                        similarity = min(1.0, similarity + 0.05)
+            # Boost if era matches
+            if import_era and existing_fig.get('era'):
+                if import_era.lower() == existing_fig['era'].lower():
+                    similarity = min(1.0, similarity + 0.05)
 
-                matches.append((existing, similarity))
+            matches.append((existing_fig, similarity))
 
         # Sort by similarity (highest first)
         matches.sort(key=lambda x: x[1], reverse=True)
@@ -274,6 +328,7 @@ class DuplicateChecker:
 
         import_figures = import_data['figures']
         existing_figures = self.fetch_existing_figures()
+        existing = ExistingFigureIndex(existing_figures)
 
         print(f"\nChecking {len(import_figures)} figures against {len(existing_figures)} existing figures...")
 
@@ -286,7 +341,7 @@ class DuplicateChecker:
             name = import_fig.get('name', '<unnamed>')
 
             # Check for exact match
-            exact = self.check_exact_match(import_fig, existing_figures)
+            exact = self.check_exact_match(import_fig, existing)
             if exact:
                 exact_matches.append({
                     'import': import_fig,
@@ -296,7 +351,7 @@ class DuplicateChecker:
                 continue
 
             # Check for similarity matches
-            similar = self.check_similarity_match(import_fig, existing_figures, threshold=0.85)
+            similar = self.check_similarity_match(import_fig, existing, threshold=0.85)
 
             if similar:
                 best_match, score = similar[0]
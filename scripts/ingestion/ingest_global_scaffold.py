@@ -7,6 +7,8 @@ Implements:
 - INTERACTED_WITH relationships for historical social connections within eras
 - HAS_SCHOLARLY_BASIS relationships for academic sourcing
 - FictionalCharacter tracking linked to media and creators
+- Content hashes on figures, media and INTERACTED_WITH edges, so re-running a
+  seed only rewrites records that changed
 
 Strategy: Sonnet-first ingestion for scale; Opus-Review for conflict resolution.
 """
@@ -28,6 +30,8 @@ from schema import (
     HistoricalFigure, MediaWork, FictionalCharacter, ScholarlyWork, Portrayal,
     MediaType, Sentiment, SCHEMA_CONSTRAINTS, RELATIONSHIP_TYPES
 )
+from lib.content_hash import content_hash, fetch_node_hashes, fetch_relationship_hashes
+from lib.phonetic_keys import phonetic_keys
 
 # Error logging for Opus-Review
 ERROR_LOG = []
@@ -148,25 +152,39 @@ class GlobalScaffoldIngestor:
             figures: List of figure dictionaries
 
         Returns:
-            Number of successfully ingested figures
+            Number of successfully ingested figures (including unchanged ones)
         """
         success_count = 0
+        unchanged_count = 0
         with self.driver.session() as session:
+            stored_hashes = fetch_node_hashes(
+                session, "HistoricalFigure", "canonical_id",
+                [figure_data.get("canonical_id") for figure_data in figures]
+            )
             for figure_data in figures:
                 try:
                     figure = HistoricalFigure(**figure_data)
+                    properties = figure.model_dump()
+                    properties["content_hash"] = content_hash(properties)
+                    if stored_hashes.get(figure.canonical_id) == properties["content_hash"]:
+                        unchanged_count += 1
+                        success_count += 1
+                        continue
+
                     session.run("""
                         MERGE (f:HistoricalFigure {canonical_id: $canonical_id})
                         SET f.name = $name,
                             f.birth_year = $birth_year,
                             f.death_year = $death_year,
                             f.title = $title,
-                            f.era = $era
-                    """, **figure.model_dump())
+                            f.era = $era,
+                            f.content_hash = $content_hash,
+                            f += $phonetic
+                    """, phonetic=phonetic_keys(figure.name), **properties)
                     success_count += 1
                 except Exception as e:
                     log_error(f"Ingesting figure {figure_data.get('name', 'UNKNOWN')}", e)
-        print(f"Ingested {success_count}/{len(figures)} historical figures.")
+        print(f"Ingested {success_count}/{len(figures)} historical figures ({unchanged_count} unchanged, skipped).")
         return success_count
 
     def ingest_media_batch(self, media_works: list[dict]) -> int:
@@ -179,10 +197,15 @@ class GlobalScaffoldIngestor:
             media_works: List of media work dictionaries
 
         Returns:
-            Number of successfully ingested works
+            Number of successfully ingested works (including unchanged ones)
         """
         success_count = 0
+        unchanged_count = 0
         with self.driver.session() as session:
+            stored_hashes = fetch_node_hashes(
+                session, "MediaWork", "media_id",
+                [work_data.get("media_id") for work_data in media_works]
+            )
             for work_data in media_works:
                 try:
                     # Validate Wikidata Q-ID presence
@@ -194,18 +217,28 @@ class GlobalScaffoldIngestor:
                         continue
 
                     work = MediaWork(**work_data)
+                    properties = work.model_dump(exclude={'media_type'})
+                    properties["media_type"] = work.media_type.value
+                    properties["content_hash"] = content_hash(properties)
+                    if stored_hashes.get(work.media_id) == properties["content_hash"]:
+                        unchanged_count += 1
+                        success_count += 1
+                        continue
+
                     session.run("""
                         MERGE (m:MediaWork {media_id: $media_id})
                         SET m.title = $title,
                             m.media_type = $media_type,
                             m.wikidata_id = $wikidata_id,
                             m.release_year = $release_year,
-                            m.creator = $creator
-                    """, media_type=work.media_type.value, **work.model_dump(exclude={'media_type'}))
+                            m.creator = $creator,
+                            m.content_hash = $content_hash
+                    """, **properties)
                     success_count += 1
                 except Exception as e:
                     log_error(f"Ingesting media {work_data.get('title', 'UNKNOWN')}", e)
-        print(f"Ingested {success_count}/{len(media_works)} media works with Wikidata mapping.")
+        print(f"Ingested {success_count}/{len(media_works)} media works with Wikidata mapping "
+              f"({unchanged_count} unchanged, skipped).")
         return success_count
 
     def ingest_fictional_characters_batch(self, characters: list[dict]) -> int:
@@ -228,8 +261,9 @@ class GlobalScaffoldIngestor:
                         SET c.name = $name,
                             c.media_id = $media_id,
                             c.creator = $creator,
-                            c.role_type = $role_type
-                    """, **character.model_dump())
+                            c.role_type = $role_type,
+                            c += $phonetic
+                    """, phonetic=phonetic_keys(character.name), **character.model_dump())
                     success_count += 1
                 except Exception as e:
                     log_error(f"Ingesting character {char_data.get('name', 'UNKNOWN')}", e)
@@ -275,30 +309,47 @@ class GlobalScaffoldIngestor:
             interactions: List of {"source": canonical_id, "target": canonical_id, "context": str}
 
         Returns:
-            Number of successfully created relationships
+            Number of successfully created relationships (including unchanged ones)
         """
         success_count = 0
+        unchanged_count = 0
         with self.driver.session() as session:
-            for interaction in interactions:
+            stored_hashes = fetch_relationship_hashes(
+                session,
+                "HistoricalFigure", "canonical_id",
+                "INTERACTED_WITH",
+                "HistoricalFigure", "canonical_id",
+                [(interaction.get("source"), interaction.get("target")) for interaction in interactions]
+            )
+            for idx, interaction in enumerate(interactions):
                 try:
+                    properties = {"era": era_name, "context": interaction.get("context", "")}
+                    hash_value = content_hash(properties)
+                    if stored_hashes.get(idx) == hash_value:
+                        unchanged_count += 1
+                        success_count += 1
+                        continue
+
                     session.run("""
                         MATCH (f1:HistoricalFigure {canonical_id: $source})
                         MATCH (f2:HistoricalFigure {canonical_id: $target})
                         MERGE (f1)-[r:INTERACTED_WITH]->(f2)
                         SET r.era = $era,
-                            r.context = $context
+                            r.context = $context,
+                            r.content_hash = $content_hash
                     """,
                     source=interaction["source"],
                     target=interaction["target"],
-                    era=era_name,
-                    context=interaction.get("context", ""))
+                    content_hash=hash_value,
+                    **properties)
                     success_count += 1
                 except Exception as e:
                     log_error(
                         f"Creating INTERACTED_WITH: {interaction.get('source')} -> {interaction.get('target')}",
                         e
                     )
-        print(f"Created {success_count}/{len(interactions)} INTERACTED_WITH relationships.")
+        print(f"Created {success_count}/{len(interactions)} INTERACTED_WITH relationships "
+              f"({unchanged_count} unchanged, skipped).")
         return success_count
 
     def link_scholarly_basis(self,
@@ -7,6 +7,7 @@ Validates JSON import files against schemas and performs additional business log
 Usage:
   python3 scripts/ingestion/validate_import.py data/examples/ancient-rome.json
   python3 scripts/ingestion/validate_import.py data/examples/ancient-rome.json --strict
+  python3 scripts/ingestion/validate_import.py data/huge_export.ndjson --stream
 """
 
 import json
@@ -16,6 +17,9 @@ from pathlib import Path
 from typing import Dict, List, Any, Tuple
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib.batch_stream import iter_batch_records, BatchStreamError
+
 # Try to import jsonschema (graceful degradation if not installed)
 try:
     import jsonschema
@@ -94,32 +98,52 @@ class ImportValidator:
         has_duplicates = False
 
         for idx, fig in enumerate(figures):
-            name = fig.get('name')
-            wikidata_id = fig.get('wikidata_id')
+            if not self._check_figure_duplicate(fig, idx, seen_names, seen_wikidata):
+                has_duplicates = True
 
-            # Check name duplicates
-            if name in seen_names:
+        return not has_duplicates
+
+    def _check_figure_duplicate(
+        self,
+        fig: Dict,
+        idx: int,
+        seen_names: Dict[str, int],
+        seen_wikidata: Dict[str, Tuple[int, str]]
+    ) -> bool:
+        """
+        Check one figure against the names/Q-IDs seen so far in the file.
+
+        Only identifiers are remembered, so this also works when figures are
+        streamed rather than held in a list.
+        """
+        name = fig.get('name')
+        wikidata_id = fig.get('wikidata_id')
+        is_unique = True
+
+        # Check name duplicates
+        if name in seen_names:
+            self.errors.append(
+                f"Duplicate figure name '{name}' at index {idx} "
+                f"(first occurrence at index {seen_names[name]})"
+            )
+            is_unique = False
+        else:
+            seen_names[name] = idx
+
+        # Check Wikidata ID duplicates
+        if wikidata_id:
+            if wikidata_id in seen_wikidata:
+                first_idx, first_name = seen_wikidata[wikidata_id]
                 self.errors.append(
-                    f"Duplicate figure name '{name}' at index {idx} "
-                    f"(first occurrence at index {seen_names[name]})"
+                    f"Duplicate Wikidata ID '{wikidata_id}' for '{name}' at index {idx} "
+                    f"(first occurrence: '{first_name}' "
+                    f"at index {first_idx})"
                 )
-                has_duplicates = True
+                is_unique = False
             else:
-                seen_names[name] = idx
-
-            # Check Wikidata ID duplicates
-            if wikidata_id:
-                if wikidata_id in seen_wikidata:
-                    self.errors.append(
-                        f"Duplicate Wikidata ID '{wikidata_id}' for '{name}' at index {idx} "
-                        f"(first occurrence: '{figures[seen_wikidata[wikidata_id]].get('name')}' "
-                        f"at index {seen_wikidata[wikidata_id]})"
-                    )
-                    has_duplicates = True
-                else:
-                    seen_wikidata[wikidata_id] = idx
+                seen_wikidata[wikidata_id] = (idx, name)
 
-        return not has_duplicates
+        return is_unique
 
     def validate_figure_portrayals(self, media_works: List[Dict], figures: List[Dict]) -> bool:
         """Validate that portrayed figures exist in the import file"""
@@ -141,15 +165,18 @@ class ImportValidator:
             for portrayal_idx, portrayal in enumerate(media['portrayals']):
                 identifier = portrayal.get('figure_identifier')
                 if identifier not in figure_index:
-                    # This might be okay if figure exists in database
-                    self.warnings.append(
-                        f"Media '{media.get('title')}' portrayal {portrayal_idx}: "
-                        f"figure '{identifier}' not found in import file. "
-                        f"Will attempt to link to existing database figure during import."
-                    )
+                    self._warn_unresolved_portrayal(media.get('title'), portrayal_idx, identifier)
 
         return all_valid
 
+    def _warn_unresolved_portrayal(self, title: str, portrayal_idx: int, identifier: str):
+        # This might be okay if figure exists in database
+        self.warnings.append(
+            f"Media '{title}' portrayal {portrayal_idx}: "
+            f"figure '{identifier}' not found in import file. "
+            f"Will attempt to link to existing database figure during import."
+        )
+
     def validate_figures(self, data: Dict) -> bool:
         """Validate figures array"""
         if 'figures' not in data:
@@ -164,29 +191,37 @@ class ImportValidator:
 
         # Validate each figure
         for idx, fig in enumerate(figures):
-            name = fig.get('name', f'<unnamed-{idx}>')
-
-            # Validate year ranges
-            if 'birth_year' in fig and 'death_year' in fig:
-                if not self.validate_year_range(
-                    fig['birth_year'],
-                    fig['death_year'],
-                    name
-                ):
-                    all_valid = False
+            if not self._validate_figure_record(fig, idx):
+                all_valid = False
 
-            # Warn if missing recommended fields
-            if not fig.get('wikidata_id'):
-                self.warnings.append(
-                    f"Figure '{name}' missing wikidata_id (recommended for entity resolution)"
-                )
+        return all_valid
 
-            if not fig.get('era'):
-                self.warnings.append(
-                    f"Figure '{name}' missing era (recommended for categorization)"
-                )
+    def _validate_figure_record(self, fig: Dict, idx: int) -> bool:
+        """Business-logic checks for a single figure"""
+        name = fig.get('name', f'<unnamed-{idx}>')
+        is_valid = True
+
+        # Validate year ranges
+        if 'birth_year' in fig and 'death_year' in fig:
+            if not self.validate_year_range(
+                fig['birth_year'],
+                fig['death_year'],
+                name
+            ):
+                is_valid = False
+
+        # Warn if missing recommended fields
+        if not fig.get('wikidata_id'):
+            self.warnings.append(
+                f"Figure '{name}' missing wikidata_id (recommended for entity resolution)"
+            )
 
-        return all_valid
+        if not fig.get('era'):
+            self.warnings.append(
+                f"Figure '{name}' missing era (recommended for categorization)"
+            )
+
+        return is_valid
 
     def validate_media_works(self, data: Dict) -> bool:
         """Validate media_works array"""
@@ -199,33 +234,37 @@ class ImportValidator:
         # Check for duplicate titles
         seen_titles = {}
         for idx, media in enumerate(media_works):
-            title = media.get('title')
-            if title in seen_titles:
-                self.warnings.append(
-                    f"Duplicate media title '{title}' at index {idx} "
-                    f"(first occurrence at index {seen_titles[title]}). "
-                    f"This may be intentional for different adaptations."
-                )
-            else:
-                seen_titles[title] = idx
+            self._validate_media_record(media, idx, seen_titles)
 
-            # Warn if missing recommended fields
-            if not media.get('wikidata_id'):
-                self.warnings.append(
-                    f"Media '{title}' missing wikidata_id (recommended for entity resolution)"
-                )
+        return all_valid
 
-            if not media.get('creator'):
-                self.warnings.append(
-                    f"Media '{title}' missing creator (recommended)"
-                )
+    def _validate_media_record(self, media: Dict, idx: int, seen_titles: Dict[str, int]):
+        """Duplicate-title and recommended-field checks for a single media work"""
+        title = media.get('title')
+        if title in seen_titles:
+            self.warnings.append(
+                f"Duplicate media title '{title}' at index {idx} "
+                f"(first occurrence at index {seen_titles[title]}). "
+                f"This may be intentional for different adaptations."
+            )
+        else:
+            seen_titles[title] = idx
 
-            if not media.get('release_year'):
-                self.warnings.append(
-                    f"Media '{title}' missing release_year (recommended)"
-                )
+        # Warn if missing recommended fields
+        if not media.get('wikidata_id'):
+            self.warnings.append(
+                f"Media '{title}' missing wikidata_id (recommended for entity resolution)"
+            )
 
-        return all_valid
+        if not media.get('creator'):
+            self.warnings.append(
+                f"Media '{title}' missing creator (recommended)"
+            )
+
+        if not media.get('release_year'):
+            self.warnings.append(
+                f"Media '{title}' missing release_year (recommended)"
+            )
 
     def validate_cross_references(self, data: Dict) -> bool:
         """Validate cross-references between figures and media"""
@@ -298,6 +337,9 @@ class ImportValidator:
             if not self.validate_cross_references(data):
                 all_valid = False
 
+        return self._finish(all_valid)
+
+    def _finish(self, all_valid: bool) -> Tuple[bool, List[str], List[str]]:
         # In strict mode, warnings become errors
         if self.strict and self.warnings:
             self.errors.extend([f"[STRICT] {w}" for w in self.warnings])
@@ -306,13 +348,106 @@ class ImportValidator:
 
         return all_valid, self.errors, self.warnings
 
+    def validate_file_streaming(self, file_path: str) -> Tuple[bool, List[str], List[str]]:
+        """
+        Validate an import file record by record (JSON or NDJSON).
+
+        Applies the same checks as validate_file, but each figure/media work is
+        validated against its item schema as it is read, and only identifiers
+        are kept for the in-file duplicate and cross-reference checks, so
+        memory stays bounded for very large files.
+
+        Returns:
+          (is_valid, errors, warnings)
+        """
+        self.errors = []
+        self.warnings = []
+
+        if not Path(file_path).exists():
+            self.errors.append(f"File not found: {file_path}")
+            return False, self.errors, self.warnings
+
+        item_validators = {}
+        if HAS_JSONSCHEMA:
+            item_validators = {
+                'metadata': Draft7Validator(self.load_schema('bulk-import-combined.json')['properties']['metadata']),
+                'figures': Draft7Validator(self.load_schema('bulk-import-figure.json')['properties']['figures']['items']),
+                'media_works': Draft7Validator(self.load_schema('bulk-import-media.json')['properties']['media_works']['items']),
+            }
+        else:
+            self.warnings.append("JSON schema validation skipped (jsonschema not installed)")
+
+        all_valid = True
+        counts = {'figures': 0, 'media_works': 0}
+        seen_names: Dict[str, int] = {}
+        seen_wikidata: Dict[str, Tuple[int, str]] = {}
+        seen_titles: Dict[str, int] = {}
+        figure_identifiers = set()
+        portrayals = []  # (title, portrayal_idx, identifier), resolved at the end
+
+        try:
+            for section, record in iter_batch_records(Path(file_path)):
+                if section not in ('metadata', 'figures', 'media_works'):
+                    self.errors.append(f"Schema validation failed: unexpected top-level property '{section}'")
+                    all_valid = False
+                    continue
+
+                idx = counts.get(section, 0)
+                if section in counts:
+                    counts[section] += 1
+
+                validator = item_validators.get(section)
+                if validator:
+                    record_errors = sorted(validator.iter_errors(record), key=lambda e: list(e.path))
+                    for error in record_errors:
+                        location = section if section == 'metadata' else f"{section} -> {idx}"
+                        path_str = " -> ".join([location] + [str(p) for p in error.path])
+                        self.errors.append(f"Schema validation failed: {error.message}")
+                        self.errors.append(f"  Path: {path_str}")
+                    if record_errors:
+                        all_valid = False
+                        continue
+
+                if section == 'figures':
+                    if not self._check_figure_duplicate(record, idx, seen_names, seen_wikidata):
+                        all_valid = False
+                    if not self._validate_figure_record(record, idx):
+                        all_valid = False
+                    for key in ('name', 'wikidata_id', 'canonical_id'):
+                        if key in record:
+                            figure_identifiers.add(record[key])
+
+                elif section == 'media_works':
+                    self._validate_media_record(record, idx, seen_titles)
+                    for portrayal_idx, portrayal in enumerate(record.get('portrayals', [])):
+                        portrayals.append((record.get('title'), portrayal_idx, portrayal.get('figure_identifier')))
+
+        except BatchStreamError as e:
+            self.errors.append(f"Invalid JSON: {e}")
+            return False, self.errors, self.warnings
+
+        if not counts['figures'] and not counts['media_works']:
+            self.errors.append(
+                "Invalid import file: must contain 'figures' or 'media_works' array"
+            )
+            return False, self.errors, self.warnings
+
+        # Validate cross-references
+        if counts['figures'] and counts['media_works']:
+            for title, portrayal_idx, identifier in portrayals:
+                if identifier not in figure_identifiers:
+                    self._warn_unresolved_portrayal(title, portrayal_idx, identifier)
+
+        return self._finish(all_valid)
+
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python3 scripts/ingestion/validate_import.py <file.json> [--strict]")
+        print("Usage: python3 scripts/ingestion/validate_import.py <file.json|file.ndjson> [--strict] [--stream]")
         sys.exit(1)
 
     file_path = sys.argv[1]
     strict = '--strict' in sys.argv
+    stream = '--stream' in sys.argv
 
     validator = ImportValidator(strict=strict)
 
@@ -321,7 +456,10 @@ def main():
     print("=" * 80)
     print()
 
-    is_valid, errors, warnings = validator.validate_file(file_path)
+    if stream:
+        is_valid, errors, warnings = validator.validate_file_streaming(file_path)
+    else:
+        is_valid, errors, warnings = validator.validate_file(file_path)
 
     # Print results
     if errors:
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Adaptive Batch Sizing for UNWIND Writes
+
+The best chunk size for `UNWIND $rows ... MERGE` writes differs a lot between
+a local Neo4j and Aura, and between node and relationship writes. This module
+provides a small controller that adjusts the chunk size from observed commit
+latency and payload size:
+
+- grow (multiplicatively) while latency and payload stay under their targets
+- shrink when a commit is slower than the target or the payload is too large
+- shrink sharply on timeouts / memory errors, so the failed rows can be retried
+  in smaller chunks
+
+Every decision is recorded so the chosen sizes can be logged per stage and
+used to tune defaults from real runs.
+
+Usage:
+    sizer = AdaptiveBatchSizer("figures", initial_size=50)
+    size = sizer.next_size()
+    start = time.perf_counter()
+    ... commit rows[:size] ...
+    sizer.record_success(size, time.perf_counter() - start, payload_size(rows[:size]))
+"""
+
+import json
+import statistics
+from typing import Any, Dict, List, Optional
+
+DEFAULT_TARGET_LATENCY = 2.0             # seconds per commit
+DEFAULT_MAX_PAYLOAD_BYTES = 4 * 1024 * 1024  # 4 MiB of parameters per commit
+
+# Substrings that identify errors caused by a chunk being too large
+_CAPACITY_ERROR_MARKERS = (
+    "memory", "timeout", "timed out", "transactiontimedout", "toolarge", "too large"
+)
+
+
+def payload_size(rows: List[Any]) -> int:
+    """Approximate parameter payload size of a chunk, in bytes."""
+    return len(json.dumps(rows, default=str))
+
+
+def is_capacity_error(error: BaseException) -> bool:
+    """True for timeouts and memory errors that a smaller chunk may avoid."""
+    if isinstance(error, (TimeoutError, MemoryError)):
+        return True
+    text = f"{getattr(error, 'code', '') or ''} {error}".lower()
+    return any(marker in text for marker in _CAPACITY_ERROR_MARKERS)
+
+
+class AdaptiveBatchSizer:
+    """Chunk size controller for one write stage."""
+
+    def __init__(
+        self,
+        stage: str,
+        initial_size: int = 50,
+        min_size: int = 1,
+        max_size: int = 5000,
+        target_latency: float = DEFAULT_TARGET_LATENCY,
+        max_payload_bytes: int = DEFAULT_MAX_PAYLOAD_BYTES,
+        growth_factor: float = 1.5,
+        shrink_factor: float = 0.5,
+        adaptive: bool = True
+    ):
+        """
+        Args:
+            stage: Stage name used in logs (e.g. "figures", "relationships")
+            initial_size: Starting chunk size
+            min_size: Smallest chunk size; failures at this size are not retried
+            max_size: Largest chunk size
+            target_latency: Commit latency (seconds) to stay under
+            max_payload_bytes: Parameter payload size to stay under
+            growth_factor: Multiplier applied after a fast, small commit
+            shrink_factor: Multiplier applied after a slow commit or capacity error
+            adaptive: If False, always use initial_size (history is still kept)
+        """
+        self.stage = stage
+        self.min_size = max(1, min_size)
+        self.max_size = max(self.min_size, max_size)
+        self.size = min(max(initial_size, self.min_size), self.max_size)
+        self.target_latency = target_latency
+        self.max_payload_bytes = max_payload_bytes
+        self.growth_factor = growth_factor
+        self.shrink_factor = shrink_factor
+        self.adaptive = adaptive
+
+        self.history: List[Dict[str, Any]] = []
+
+    def next_size(self) -> int:
+        """Chunk size to use for the next commit."""
+        return self.size
+
+    def record_success(self, rows: int, latency: float, payload_bytes: Optional[int] = None):
+        """Record a committed chunk and adjust the size for the next one."""
+        self.history.append({
+            "size": rows,
+            "latency": latency,
+            "payload_bytes": payload_bytes,
+            "ok": True
+        })
+        if not self.adaptive or rows < self.size:
+            # A short tail chunk says nothing about the current size
+            return
+
+        over_latency = latency > self.target_latency
+        over_payload = payload_bytes is not None and payload_bytes > self.max_payload_bytes
+
+        if over_latency or over_payload:
+            self._resize(self.size * self.shrink_factor)
+        elif latency < self.target_latency / 2 and (
+            payload_bytes is None or payload_bytes * self.growth_factor <= self.max_payload_bytes
+        ):
+            self._resize(self.size * self.growth_factor)
+
+    def record_failure(self, rows: int, error: BaseException) -> bool:
+        """
+        Record a failed chunk.
+
+        Returns:
+            True if the rows should be retried with the (now smaller) size,
+            False if the error is not size-related or the size is already minimal.
+        """
+        capacity = is_capacity_error(error)
+        self.history.append({
+            "size": rows,
+            "latency": None,
+            "payload_bytes": None,
+            "ok": False,
+            "capacity_error": capacity
+        })
+        if not self.adaptive or not capacity or rows <= self.min_size:
+            return False
+
+        # Never grow back to a size that has already failed
+        self.max_size = max(self.min_size, min(self.max_size, rows - 1))
+        self._resize(min(self.size, rows) * self.shrink_factor)
+        return True
+
+    def _resize(self, new_size: float):
+        self.size = int(min(max(new_size, self.min_size), self.max_size))
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-stage statistics for logs and reports."""
+        committed = [h for h in self.history if h["ok"]]
+        sizes = [h["size"] for h in committed]
+        latencies = [h["latency"] for h in committed]
+        return {
+            "stage": self.stage,
+            "commits": len(committed),
+            "failures": len(self.history) - len(committed),
+            "min_size": min(sizes) if sizes else None,
+            "max_size": max(sizes) if sizes else None,
+            "final_size": self.size,
+            "median_latency": statistics.median(latencies) if latencies else None,
+            "max_latency": max(latencies) if latencies else None
+        }
+
+    def describe(self) -> str:
+        """One-line summary, e.g. for print_summary()."""
+        s = self.summary()
+        if not s["commits"]:
+            return f"{self.stage}: no commits (final size {s['final_size']})"
+        return (
+            f"{self.stage}: {s['commits']} commits, sizes {s['min_size']}-{s['max_size']} "
+            f"(final {s['final_size']}), median {s['median_latency']:.2f}s, "
+            f"max {s['max_latency']:.2f}s, {s['failures']} failed"
+        )
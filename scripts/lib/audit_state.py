@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Persistent State for Incremental Duplicate Audits
+
+A full duplicate audit rescans every HistoricalFigure, but most runs only need
+to check figures added or edited since the previous audit against everything
+else. AuditState records, in data/.ingestion-cache/entity_resolver_state.json:
+
+- the watermark: when the last audit started (figures whose created_at /
+  updated_at is at or after it are rechecked)
+- the ingestion batches already audited
+- each audited figure's name, Wikidata ID and Wikidata aliases, so unchanged
+  figures keep their aliases without another SPARQL round trip and renamed
+  figures are detected even without timestamps
+- when the last full audit ran, so incremental runs can fall back to a
+  periodic full rebuild
+
+Usage:
+    state = AuditState.load()
+    if state.needs_full_rebuild(max_age_days=7):
+        ...  # full audit
+    changed = state.is_changed(canonical_id, name, wikidata_id, touched_at, batch)
+    ...
+    state.record_audit(figures, started_at, full=False)
+    state.save()
+"""
+
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+DEFAULT_STATE_PATH = Path('data/.ingestion-cache/entity_resolver_state.json')
+
+# Default age after which an incremental run does a full audit instead
+FULL_REBUILD_DAYS = 7
+
+
+def to_epoch_seconds(value: Any) -> Optional[float]:
+    """
+    Normalize a created_at/updated_at property to epoch seconds.
+
+    Ingestion scripts store either datetime() (neo4j DateTime) or timestamp()
+    (epoch milliseconds); ISO strings are accepted too.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return value / 1000.0
+    if hasattr(value, "to_native"):
+        value = value.to_native()
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return None
+
+
+class AuditState:
+    """Watermark and per-figure snapshot from the previous audit."""
+
+    def __init__(self, path: Path = DEFAULT_STATE_PATH):
+        self.path = Path(path)
+        self.watermark: Optional[float] = None
+        self.last_full_audit: Optional[float] = None
+        self.batches: set = set()
+        # canonical_id -> {"name", "wikidata_id", "aliases"}
+        self.figures: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_STATE_PATH) -> "AuditState":
+        """Load saved state; a missing file yields an empty state."""
+        state = cls(path)
+        if state.path.exists():
+            with open(state.path, 'r') as f:
+                data = json.load(f)
+            state.watermark = data.get("watermark")
+            state.last_full_audit = data.get("last_full_audit")
+            state.batches = set(data.get("batches", []))
+            state.figures = data.get("figures", {})
+        return state
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump({
+                "watermark": self.watermark,
+                "watermark_iso": datetime.fromtimestamp(self.watermark).isoformat() if self.watermark else None,
+                "last_full_audit": self.last_full_audit,
+                "batches": sorted(self.batches),
+                "figures": self.figures
+            }, f, indent=2)
+
+    def needs_full_rebuild(self, max_age_days: float = FULL_REBUILD_DAYS) -> bool:
+        """True if there is no usable state or the last full audit is too old."""
+        if self.watermark is None or self.last_full_audit is None:
+            return True
+        return time.time() - self.last_full_audit > max_age_days * 86400
+
+    def is_changed(
+        self,
+        canonical_id: str,
+        name: str,
+        wikidata_id: Optional[str],
+        touched_at: Optional[float],
+        batch: Optional[str]
+    ) -> bool:
+        """Whether a figure is new or changed since the last audit."""
+        previous = self.figures.get(canonical_id)
+        if previous is None:
+            return True
+        if previous.get("name") != name or previous.get("wikidata_id") != wikidata_id:
+            return True
+        if touched_at is not None and self.watermark is not None and touched_at >= self.watermark:
+            return True
+        return batch is not None and batch not in self.batches
+
+    def cached_aliases(self, canonical_id: str) -> List[str]:
+        return self.figures.get(canonical_id, {}).get("aliases", [])
+
+    def record_audit(self, figures: Iterable[Any], started_at: float, full: bool):
+        """
+        Replace the snapshot with the audited figures.
+
+        `figures` are HistoricalFigureNode-like objects (canonical_id, name,
+        wikidata_id, aliases, ingestion_batch). Figures no longer in the graph
+        drop out of the snapshot.
+        """
+        self.figures = {}
+        for fig in figures:
+            self.figures[fig.canonical_id] = {
+                "name": fig.name,
+                "wikidata_id": fig.wikidata_id,
+                "aliases": sorted(fig.aliases)
+            }
+            if fig.ingestion_batch:
+                self.batches.add(fig.ingestion_batch)
+        self.watermark = started_at
+        if full:
+            self.last_full_audit = started_at
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Streaming Batch File Reader
+
+Reads batch import files record by record instead of json.load-ing the whole
+document, so memory stays bounded regardless of file size and callers can
+start validating/writing as soon as the first records arrive.
+
+Two input formats are supported:
+
+- JSON (.json): a top-level object whose array sections ("figures", "works",
+  "media_works", "relationships") are decoded one element at a time. Any
+  other top-level value (e.g. "metadata") is decoded whole.
+- NDJSON (.ndjson / .jsonl): one object per line, tagged with a
+  "record_type" of "metadata", "figure", "work", "media_work" or
+  "relationship". The tag is removed from the yielded record.
+
+Usage:
+    for section, record in iter_batch_records(path):
+        ...
+
+    for batch in chunked(iter_section(path, "figures"), 500):
+        ...
+"""
+
+import json
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+READ_SIZE = 1 << 16  # 64 KiB per read
+
+STREAMED_SECTIONS = ("figures", "works", "media_works", "relationships")
+
+# NDJSON record_type -> section name used by the JSON format
+NDJSON_SECTIONS = {
+    "metadata": "metadata",
+    "figure": "figures",
+    "work": "works",
+    "media_work": "media_works",
+    "relationship": "relationships",
+}
+
+
+class BatchStreamError(Exception):
+    """Raised when a batch file cannot be parsed incrementally."""
+    pass
+
+
+def is_ndjson(path: Path) -> bool:
+    """NDJSON is selected by file extension."""
+    return Path(path).suffix.lower() in (".ndjson", ".jsonl")
+
+
+def iter_batch_records(
+    path: Path,
+    sections: Optional[Sequence[str]] = None
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield (section, value) pairs from a batch file in file order.
+
+    Array sections yield one pair per element; other top-level keys yield one
+    pair with the whole value. If `sections` is given, only those sections are
+    yielded (others are still parsed, but discarded as they are read).
+    """
+    reader = _iter_ndjson if is_ndjson(path) else _iter_json_object
+    for section, value in reader(Path(path)):
+        if sections is None or section in sections:
+            yield section, value
+
+
+def iter_section(path: Path, section: str) -> Iterator[Any]:
+    """Yield only the records of one section."""
+    for _, value in iter_batch_records(path, sections=(section,)):
+        yield value
+
+
+def chunked(records: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Group an iterable into lists of at most `size` items."""
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _iter_ndjson(path: Path) -> Iterator[Tuple[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise BatchStreamError(f"{path}:{line_no}: invalid JSON: {e}")
+
+            if not isinstance(record, dict):
+                raise BatchStreamError(f"{path}:{line_no}: each line must be a JSON object")
+
+            record_type = record.pop("record_type", None)
+            section = NDJSON_SECTIONS.get(record_type)
+            if section is None:
+                raise BatchStreamError(
+                    f"{path}:{line_no}: record_type must be one of {sorted(NDJSON_SECTIONS)}, "
+                    f"got {record_type!r}"
+                )
+            yield section, record
+
+
+class _Buffer:
+    """Sliding text window over a file, refilled on demand."""
+
+    def __init__(self, f):
+        self.f = f
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(READ_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop consumed text so the window only holds the current record
+        self.text = self.text[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ("" at end of file)."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise BatchStreamError(f"Expected '{char}' but found '{found or 'EOF'}'")
+        self.pos += 1
+
+    def decode(self) -> Any:
+        """Decode one JSON value, reading more input until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError as e:
+                if self.fill():
+                    continue
+                raise BatchStreamError(f"Invalid JSON: {e}")
+
+            # A value ending exactly at the window edge may be truncated (e.g. a number)
+            if end == len(self.text) and self.fill():
+                continue
+
+            self.pos = end
+            return value
+
+
+def _iter_json_object(path: Path) -> Iterator[Tuple[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        buf = _Buffer(f)
+        buf.expect("{")
+
+        if buf.peek() == "}":
+            return
+
+        while True:
+            key = buf.decode()
+            if not isinstance(key, str):
+                raise BatchStreamError("Object keys must be strings")
+            buf.expect(":")
+
+            if key in STREAMED_SECTIONS and buf.peek() == "[":
+                buf.expect("[")
+                if buf.peek() == "]":
+                    buf.pos += 1
+                else:
+                    while True:
+                        yield key, buf.decode()
+                        if buf.peek() == ",":
+                            buf.pos += 1
+                            continue
+                        buf.expect("]")
+                        break
+            else:
+                yield key, buf.decode()
+
+            if buf.peek() == ",":
+                buf.pos += 1
+                continue
+            buf.expect("}")
+            return
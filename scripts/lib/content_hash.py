@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Content Hashes for Skipping Unchanged Writes
+
+Ingestion scripts `MERGE ... SET` every property on every run, so re-running
+a seed file rewrites every node, bumps updated_at and churns the transaction
+log even when nothing changed. Instead, each written node/relationship stores
+a `content_hash` of the properties it was written from. Before writing, the
+stored hashes are fetched in bulk and records whose hash matches are dropped
+client-side.
+
+The hash covers the input record as given (before generated IDs and audit
+metadata are added), serialised as canonical JSON, so it is stable across
+runs and independent of key order.
+
+Usage:
+    for row in rows:
+        row[CONTENT_HASH_PROPERTY] = content_hash(row)
+    stored = fetch_node_hashes(session, "HistoricalFigure", "canonical_id",
+                               [row["canonical_id"] for row in rows])
+    changed = [row for row in rows
+               if stored.get(row["canonical_id"]) != row[CONTENT_HASH_PROPERTY]]
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+CONTENT_HASH_PROPERTY = "content_hash"
+
+# Properties the importers set themselves; never part of the content hash
+AUDIT_PROPERTIES = {"ingestion_batch", "ingestion_source", "created_by", "created_at", "updated_at"}
+
+# IDs per UNWIND read when fetching stored hashes
+HASH_READ_SIZE = 5000
+
+
+def content_hash(properties: Dict[str, Any]) -> str:
+    """SHA-256 of a record's properties, ignoring audit metadata and the hash itself."""
+    content = {
+        key: value for key, value in properties.items()
+        if key not in AUDIT_PROPERTIES and key != CONTENT_HASH_PROPERTY
+    }
+    encoded = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def fetch_node_hashes(session, label: str, id_property: str, ids: Sequence[Any]) -> Dict[Any, Optional[str]]:
+    """
+    Stored content hashes for existing nodes, keyed by ID.
+
+    IDs with no matching node are absent from the result; nodes written before
+    hashing was introduced map to None.
+    """
+    query = f"""
+    UNWIND $ids AS id
+    MATCH (n:{label} {{{id_property}: id}})
+    RETURN id, head(collect(n.{CONTENT_HASH_PROPERTY})) AS hash
+    """
+    ids = [i for i in dict.fromkeys(ids) if i is not None]
+    hashes = {}
+    for start in range(0, len(ids), HASH_READ_SIZE):
+        for record in session.run(query, ids=ids[start:start + HASH_READ_SIZE]):
+            hashes[record["id"]] = record["hash"]
+    return hashes
+
+
+def fetch_relationship_hashes(
+    session,
+    from_label: str,
+    from_property: str,
+    rel_type: str,
+    to_label: str,
+    to_property: str,
+    pairs: List[Tuple[Any, Any]]
+) -> Dict[int, Optional[str]]:
+    """
+    Stored content hashes for existing relationships, keyed by position in `pairs`.
+
+    `pairs` holds (from_id, to_id) tuples; pairs with no matching relationship
+    are absent from the result.
+    """
+    query = f"""
+    UNWIND $rows AS row
+    MATCH (a:{from_label} {{{from_property}: row.from_id}})-[r:{rel_type}]->(b:{to_label} {{{to_property}: row.to_id}})
+    RETURN row.idx AS idx, head(collect(r.{CONTENT_HASH_PROPERTY})) AS hash
+    """
+    rows = [{"idx": idx, "from_id": from_id, "to_id": to_id} for idx, (from_id, to_id) in enumerate(pairs)]
+    hashes = {}
+    for start in range(0, len(rows), HASH_READ_SIZE):
+        for record in session.run(query, rows=rows[start:start + HASH_READ_SIZE]):
+            hashes[record["idx"]] = record["hash"]
+    return hashes
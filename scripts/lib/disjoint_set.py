@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Disjoint-Set (Union-Find) Clustering
+
+Duplicate detection passes emit candidate edges (pairs of IDs that look like
+the same entity). Unioning the edges as they arrive and reading off the
+connected components once at the end makes clusters independent of pass and
+edge order: A~B from one pass and B~C from another always give {A, B, C}.
+
+Union by size with path compression keeps every operation effectively
+constant time, so clustering is linear in the number of edges.
+
+Usage:
+    clusters = DisjointSet()
+    clusters.union("HF_001", "HF_002", "Shared Wikidata ID: Q1048")
+    clusters.union("HF_002", "HF_003", "Fuzzy Match Score: 93%")
+    for members in clusters.components():   # [["HF_001", "HF_002", "HF_003"]]
+        ...
+    clusters.edges_of("HF_003")             # [("HF_002", "Fuzzy Match Score: 93%")]
+"""
+
+from collections import defaultdict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+class DisjointSet:
+    """Union-find over hashable IDs, remembering the edge that joined each pair."""
+
+    def __init__(self):
+        self._parent: Dict[Hashable, Hashable] = {}
+        self._size: Dict[Hashable, int] = {}
+        self._edges: Dict[Hashable, List[Tuple[Hashable, str]]] = defaultdict(list)
+        self.edge_count = 0
+
+    def find(self, item: Hashable) -> Hashable:
+        """Representative of the set containing `item` (added as a singleton if new)."""
+        parent = self._parent.setdefault(item, item)
+        if parent == item:
+            self._size.setdefault(item, 1)
+            return item
+
+        root = item
+        while self._parent[root] != root:
+            root = self._parent[root]
+        # Path compression
+        while self._parent[item] != root:
+            self._parent[item], item = root, self._parent[item]
+        return root
+
+    def union(self, a: Hashable, b: Hashable, reason: Optional[str] = None) -> bool:
+        """
+        Join the sets of `a` and `b`, recording the edge (a, b, reason).
+
+        Returns True if they were in different sets.
+        """
+        if a == b:
+            return False
+        self.edge_count += 1
+        if reason is not None:
+            self._edges[a].append((b, reason))
+            self._edges[b].append((a, reason))
+
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        if self._size[root_a] < self._size[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._size[root_a] += self._size.pop(root_b)
+        return True
+
+    def connected(self, a: Hashable, b: Hashable) -> bool:
+        return self.find(a) == self.find(b)
+
+    def edges_of(self, item: Hashable) -> List[Tuple[Hashable, str]]:
+        """(other, reason) for every recorded edge touching `item`, in arrival order."""
+        return list(self._edges.get(item, []))
+
+    def components(self, min_size: int = 2) -> List[List[Hashable]]:
+        """Sets with at least `min_size` members, each sorted, ordered by first member."""
+        groups: Dict[Hashable, List[Hashable]] = defaultdict(list)
+        for item in list(self._parent):
+            groups[self.find(item)].append(item)
+        return sorted(
+            (sorted(members) for members in groups.values() if len(members) >= min_size),
+            key=lambda members: members[0]
+        )
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Persistent HTTP Response Cache for Wikidata Lookups
+
+lib/wikidata_search.py used to hit wikidata.org on every call, so validating
+a batch re-fetched Q-IDs validated the day before (and paid the rate-limit
+delay for each). This cache keeps decoded JSON responses in
+data/.ingestion-cache/http_cache.sqlite, keyed by (endpoint, normalized
+request), so repeated lookups are answered locally.
+
+- Requests are normalized before hashing: parameters are sorted and
+  whitespace inside values is collapsed, so reformatted SPARQL or reordered
+  params share an entry.
+- Each endpoint has its own TTL (DEFAULT_TTLS); expired entries are
+  refetched. Only successful responses are stored.
+- The cache is bounded to `max_entries`; flush()/close() evicts the least
+  recently used rows beyond it.
+- cache_only mode never goes to the network: expired entries are served as
+  they are and misses raise CacheMissError (a requests.RequestException, so
+  callers report it like any other failed request). Use it for offline runs.
+
+Usage:
+    cache = HttpCache()
+    data = cache.get("wbgetentities", url, params)
+    if data is None:
+        data = fetch(url, params)
+        cache.put("wbgetentities", url, params, data)
+    print(cache.describe())
+    cache.close()
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+import requests
+
+DEFAULT_CACHE_PATH = Path('data/.ingestion-cache/http_cache.sqlite')
+DEFAULT_MAX_ENTRIES = 200_000
+
+# Seconds a response stays fresh, per endpoint
+DEFAULT_TTLS = {
+    "wbgetentities": 30 * 86400,     # labels/descriptions of known Q-IDs
+    "wbsearchentities": 7 * 86400,   # search rankings drift as items are edited
+    "sparql": 7 * 86400
+}
+DEFAULT_TTL = 7 * 86400
+
+
+class CacheMissError(requests.RequestException):
+    """Raised in cache-only mode for a request that is not cached."""
+    pass
+
+
+def request_key(endpoint: str, url: str, params: Dict[str, Any]) -> str:
+    """Hash of the normalized request."""
+    normalized = sorted((str(name), " ".join(str(value).split())) for name, value in params.items())
+    payload = json.dumps([endpoint, url, normalized], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class HttpCache:
+    """On-disk, size-bounded cache of JSON responses with per-endpoint TTLs."""
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        enabled: bool = True,
+        cache_only: bool = False
+    ):
+        """
+        Args:
+            path: SQLite file holding the cache
+            ttls: Seconds responses stay fresh, per endpoint (merged over DEFAULT_TTLS)
+            max_entries: Maximum number of responses kept on disk
+            enabled: If False, nothing is read from or written to disk
+            cache_only: Never fetch; serve stale entries and raise CacheMissError on misses
+        """
+        self.path = Path(path)
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.cache_only = cache_only
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._touched: Set[str] = set()
+
+        # endpoint -> [hits, misses]
+        self._counts: Dict[str, list] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    body TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        return self._conn
+
+    def get(self, endpoint: str, url: str, params: Dict[str, Any]) -> Optional[Any]:
+        """
+        Cached response, or None if it must be fetched.
+
+        Raises:
+            CacheMissError: In cache_only mode, if the request is not cached
+        """
+        counts = self._counts.setdefault(endpoint, [0, 0])
+        if not self.enabled:
+            counts[1] += 1
+            if self.cache_only:
+                raise CacheMissError(f"{endpoint} request not cached (cache disabled)")
+            return None
+
+        key = request_key(endpoint, url, params)
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT body, fetched_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            fresh = row is not None and (
+                self.cache_only or time.time() - row[1] <= self.ttls.get(endpoint, DEFAULT_TTL)
+            )
+            if fresh:
+                counts[0] += 1
+                self._touched.add(key)
+                return json.loads(row[0])
+            counts[1] += 1
+
+        if self.cache_only:
+            raise CacheMissError(f"{endpoint} request not cached (cache-only mode)")
+        return None
+
+    def put(self, endpoint: str, url: str, params: Dict[str, Any], data: Any):
+        """Store a successful response."""
+        if not self.enabled:
+            return
+
+        key = request_key(endpoint, url, params)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, endpoint, body, fetched_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, endpoint, json.dumps(data), now, now)
+                )
+            self._touched.discard(key)
+
+    def flush(self):
+        """Record use of cache hits and evict beyond max_entries."""
+        if not self.enabled or self._conn is None:
+            return
+
+        now = time.time()
+        with self._lock:
+            conn = self._conn
+            with conn:
+                conn.executemany(
+                    "UPDATE responses SET last_used = ? WHERE key = ?",
+                    ((now, key) for key in self._touched)
+                )
+                excess = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+                if excess > 0:
+                    conn.execute(
+                        "DELETE FROM responses WHERE rowid IN "
+                        "(SELECT rowid FROM responses ORDER BY last_used ASC LIMIT ?)",
+                        (excess,)
+                    )
+            self._touched.clear()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # Reporting
+
+    @property
+    def hits(self) -> int:
+        return sum(counts[0] for counts in self._counts.values())
+
+    @property
+    def misses(self) -> int:
+        return sum(counts[1] for counts in self._counts.values())
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Hits, misses and hit rate per endpoint."""
+        return {
+            endpoint: {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else None
+            }
+            for endpoint, (hits, misses) in self._counts.items()
+        }
+
+    def describe(self) -> str:
+        """One-line summary for logs and reports."""
+        lookups = self.hits + self.misses
+        if not lookups:
+            return "Wikidata HTTP cache: no lookups"
+        mode = " (cache-only)" if self.cache_only else ""
+        return (
+            f"Wikidata HTTP cache{mode}: {self.hits} hits / {self.misses} misses "
+            f"({self.hits / lookups:.1%} hit rate)"
+        )
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Import Checkpoint Journal
+
+Records batch import progress on disk so an interrupted run can resume from
+the first uncommitted chunk instead of starting over. One journal file is kept
+per (input file hash, batch_id) under data/.ingestion-cache/checkpoints/.
+
+The journal stores:
+- completed stages (schema, duplicate detection, Wikidata validation, ...)
+- committed row ranges per write stage, as half-open [start, end) offsets
+- IDs generated for each write stage, so resumed chunks reuse the same
+  canonical_id/media_id values
+- cached duplicate-detection results and Q-ID validation/search results
+
+The journal is an append-only log (one JSON event per line) replayed into
+`state` when it is reopened. Each update appends only its own event, so
+committing a chunk costs O(chunk) however large the journal has grown, and
+ID lists and duplicate results are written once per stage. Streamed imports
+release() each chunk once it is fully written, dropping its per-row state
+from memory. A resumed journal is compacted to its current state once.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+CHECKPOINT_DIR = Path('data/.ingestion-cache/checkpoints')
+
+# Cache entries are flushed to disk every N updates (stage/chunk events flush immediately)
+CACHE_FLUSH_INTERVAL = 25
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file's contents, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _merge_ranges(ranges: List[List[int]]) -> List[List[int]]:
+    """Sort and coalesce adjacent/overlapping [start, end) ranges."""
+    ranges = sorted(ranges)
+    merged = [list(ranges[0])]
+    for r_start, r_end in ranges[1:]:
+        if r_start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], r_end)
+        else:
+            merged.append([r_start, r_end])
+    return merged
+
+
+def _apply(state: Dict[str, Any], event: Dict[str, Any]):
+    """Apply one journal event to `state` (used both live and on replay)."""
+    op = event["op"]
+    if op == "stage":
+        if event["stage"] not in state["stages"]:
+            state["stages"].append(event["stage"])
+    elif op == "completed":
+        state["completed"] = True
+    elif op == "chunk":
+        ranges = state["committed"].setdefault(event["stage"], [])
+        ranges.append([event["start"], event["end"]])
+        state["committed"][event["stage"]] = _merge_ranges(ranges)
+    elif op == "committed":
+        state["committed"][event["stage"]] = event["ranges"]
+    elif op == "ids":
+        state["ids"][event["stage"]] = event["ids"]
+    elif op == "duplicates":
+        state["duplicates"][event["entity"]] = event["entries"]
+    elif op == "validation":
+        state["qid_validations"][event["key"]] = event["result"]
+    elif op == "search":
+        state["qid_searches"][event["key"]] = event["result"]
+    elif op == "release":
+        key = event["key"]
+        state["ids"].pop(key, None)
+        state["duplicates"].pop(key, None)
+        for stage in [s for s in state["committed"] if s == key or s.startswith(f"{key}:")]:
+            del state["committed"][stage]
+        if key not in state["stages"]:
+            state["stages"].append(key)
+    else:
+        raise ValueError(f"Unknown checkpoint event: {op}")
+
+
+class ImportCheckpoint:
+    """Checkpoint journal for a single batch import run."""
+
+    def __init__(self, path: Path, state: Dict[str, Any]):
+        self.path = path
+        self.state = state
+        self._pending_lines: List[str] = []
+        self._unsaved_updates = 0
+
+    @classmethod
+    def start(cls, input_path: Path, batch_id: str, resume: bool = False) -> 'ImportCheckpoint':
+        """
+        Open the journal for an input file.
+
+        With resume=True the most recent incomplete journal for the same file
+        hash is reopened; otherwise (or if none exists) a new journal is created
+        for `batch_id`.
+        """
+        file_hash = hash_file(input_path)
+
+        if resume:
+            existing = cls.find_incomplete(file_hash)
+            if existing:
+                existing.compact()
+                return existing
+
+        header = {
+            "op": "start",
+            "input_file": str(input_path),
+            "file_hash": file_hash,
+            "batch_id": batch_id,
+            "created_at": datetime.now().isoformat()
+        }
+        checkpoint = cls(CHECKPOINT_DIR / f"{file_hash[:16]}_{batch_id}.jsonl", cls._initial_state(header))
+        checkpoint._write_events(checkpoint.path, [header])
+        return checkpoint
+
+    @staticmethod
+    def _initial_state(header: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "input_file": header["input_file"],
+            "file_hash": header["file_hash"],
+            "batch_id": header["batch_id"],
+            "created_at": header["created_at"],
+            "updated_at": None,
+            "completed": False,
+            "stages": [],
+            "committed": {},
+            "ids": {},
+            "duplicates": {},
+            "qid_validations": {},
+            "qid_searches": {}
+        }
+
+    @classmethod
+    def load(cls, path: Path) -> 'ImportCheckpoint':
+        """Replay a journal file into a checkpoint."""
+        with open(path, 'r') as f:
+            lines = f.read().splitlines()
+
+        state = None
+        for number, line in enumerate(lines):
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                if number == len(lines) - 1:
+                    break  # event cut off by an interrupted write
+                raise
+            if state is None:
+                state = cls._initial_state(event)
+            else:
+                _apply(state, event)
+        if state is None:
+            raise ValueError(f"Empty checkpoint journal: {path}")
+
+        state["updated_at"] = datetime.fromtimestamp(path.stat().st_mtime).isoformat()
+        return cls(path, state)
+
+    @classmethod
+    def find_incomplete(cls, file_hash: str) -> Optional['ImportCheckpoint']:
+        """Return the most recently updated incomplete journal for a file hash."""
+        if not CHECKPOINT_DIR.exists():
+            return None
+
+        candidates = []
+        for path in CHECKPOINT_DIR.glob(f"{file_hash[:16]}_*.jsonl"):
+            checkpoint = cls.load(path)
+            state = checkpoint.state
+            if state.get("file_hash") == file_hash and not state.get("completed"):
+                candidates.append((state["updated_at"], checkpoint))
+
+        if not candidates:
+            return None
+
+        return max(candidates, key=lambda c: c[0])[1]
+
+    @property
+    def batch_id(self) -> str:
+        return self.state["batch_id"]
+
+    @staticmethod
+    def _encode(event: Dict[str, Any]) -> str:
+        return json.dumps(event, separators=(",", ":"), default=str)
+
+    def _record(self, event: Dict[str, Any], flush: bool = True):
+        """Apply an event and append it to the journal."""
+        _apply(self.state, event)
+        self._pending_lines.append(self._encode(event))
+        if flush:
+            self.save()
+
+    def _write_events(self, path: Path, events: List[Dict[str, Any]]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            for event in events:
+                f.write(self._encode(event) + "\n")
+
+    def save(self):
+        """Append buffered events to the journal."""
+        self.state["updated_at"] = datetime.now().isoformat()
+        self._unsaved_updates = 0
+        if not self._pending_lines:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a') as f:
+            f.write("\n".join(self._pending_lines) + "\n")
+        self._pending_lines = []
+
+    def compact(self):
+        """Atomically rewrite the journal as the events of the current state."""
+        self.save()
+        state = self.state
+        events: List[Dict[str, Any]] = [{
+            "op": "start",
+            "input_file": state["input_file"],
+            "file_hash": state["file_hash"],
+            "batch_id": state["batch_id"],
+            "created_at": state["created_at"]
+        }]
+        events += [{"op": "stage", "stage": stage} for stage in state["stages"]]
+        events += [{"op": "committed", "stage": stage, "ranges": ranges}
+                   for stage, ranges in state["committed"].items()]
+        events += [{"op": "ids", "stage": stage, "ids": ids} for stage, ids in state["ids"].items()]
+        events += [{"op": "duplicates", "entity": entity, "entries": entries}
+                   for entity, entries in state["duplicates"].items()]
+        events += [{"op": "validation", "key": key, "result": result}
+                   for key, result in state["qid_validations"].items()]
+        events += [{"op": "search", "key": key, "result": result}
+                   for key, result in state["qid_searches"].items()]
+        if state["completed"]:
+            events.append({"op": "completed"})
+
+        tmp_path = self.path.with_suffix('.jsonl.tmp')
+        self._write_events(tmp_path, events)
+        os.replace(tmp_path, self.path)
+
+    # Stages
+
+    def is_done(self, stage: str) -> bool:
+        return stage in self.state["stages"]
+
+    def mark_done(self, stage: str):
+        if stage not in self.state["stages"]:
+            self._record({"op": "stage", "stage": stage})
+
+    def mark_completed(self):
+        self._record({"op": "completed"})
+
+    def release(self, key: str):
+        """
+        Mark streamed chunk `key` as fully written and drop its generated IDs,
+        duplicate results and committed ranges (including `key:...` stages).
+        """
+        self._record({"op": "release", "key": key})
+
+    # Committed chunk ranges
+
+    def record_chunk(self, stage: str, start: int, end: int):
+        """Record rows [start, end) of a write stage as committed."""
+        self._record({"op": "chunk", "stage": stage, "start": start, "end": end})
+
+    def pending_spans(self, stage: str, total: int) -> List[Tuple[int, int]]:
+        """Uncommitted [start, end) spans of a write stage with `total` rows."""
+        spans = []
+        cursor = 0
+        for r_start, r_end in self.state["committed"].get(stage, []):
+            if r_start > cursor:
+                spans.append((cursor, min(r_start, total)))
+            cursor = max(cursor, r_end)
+        if cursor < total:
+            spans.append((cursor, total))
+        return [(s, e) for s, e in spans if s < e]
+
+    def committed_count(self, stage: str) -> int:
+        return sum(r_end - r_start for r_start, r_end in self.state["committed"].get(stage, []))
+
+    # Generated IDs
+
+    def restore_ids(self, stage: str, rows: List[Dict], id_field: str):
+        """
+        Reuse IDs generated for `stage` on a previous attempt, or record the
+        current ones if this is the first attempt.
+        """
+        saved = self.state["ids"].get(stage)
+        if saved is not None and len(saved) == len(rows):
+            for row, row_id in zip(rows, saved):
+                row[id_field] = row_id
+            return
+
+        self._record({"op": "ids", "stage": stage, "ids": [row.get(id_field) for row in rows]})
+
+    # Duplicate detection cache
+
+    def save_duplicates(self, entity: str, duplicates: List[Dict], inputs: List[Dict], input_key: str):
+        """
+        Store duplicate-detection results by input index.
+
+        Input records are referenced by position rather than copied, so they
+        can be re-attached to the freshly loaded objects on resume.
+        """
+        positions = {id(record): idx for idx, record in enumerate(inputs)}
+        entries = [
+            {
+                **{k: v for k, v in dup.items() if k != input_key},
+                "input_index": positions[id(dup[input_key])]
+            }
+            for dup in duplicates
+            if id(dup[input_key]) in positions
+        ]
+        self._record({"op": "duplicates", "entity": entity, "entries": entries})
+
+    def load_duplicates(self, entity: str, inputs: List[Dict], input_key: str) -> Optional[List[Dict]]:
+        """Rehydrate cached duplicate-detection results, or None if not cached."""
+        cached = self.state["duplicates"].get(entity)
+        if cached is None:
+            return None
+
+        duplicates = []
+        for entry in cached:
+            dup = {k: v for k, v in entry.items() if k != "input_index"}
+            dup[input_key] = inputs[entry["input_index"]]
+            duplicates.append(dup)
+        return duplicates
+
+    # Wikidata validation cache
+
+    def get_validation(self, qid: str, expected: str) -> Optional[Dict]:
+        return self.state["qid_validations"].get(f"{qid}|{expected}")
+
+    def set_validation(self, qid: str, expected: str, result: Dict):
+        self._record({"op": "validation", "key": f"{qid}|{expected}", "result": result}, flush=False)
+        self._cache_updated()
+
+    def get_search(self, key: str) -> Tuple[bool, Optional[Dict]]:
+        """Return (cached, result) for a Wikidata work search."""
+        searches = self.state["qid_searches"]
+        return key in searches, searches.get(key)
+
+    def set_search(self, key: str, result: Optional[Dict]):
+        self._record({"op": "search", "key": key, "result": result}, flush=False)
+        self._cache_updated()
+
+    def _cache_updated(self):
+        self._unsaved_updates += 1
+        if self._unsaved_updates >= CACHE_FLUSH_INTERVAL:
+            self.save()
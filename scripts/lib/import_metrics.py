@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Import Performance Metrics
+
+Collects per-stage timings for batch imports so a slow run can be attributed
+to schema setup, duplicate detection, Wikidata validation or writes:
+
+- wall time, rows processed and rows/second per stage
+- Neo4j round trips and Wikidata HTTP requests sent per stage
+- the slowest individual queries
+
+Stages are timed with the `timed_stage` method decorator (or `stage()`), and
+round trips / HTTP calls are attributed to whichever stage is running. Query
+recording is thread-safe, so worker threads committing chunks in parallel can
+report into the same collector.
+
+Usage:
+    metrics = ImportMetrics()
+    with metrics.stage("write_figures", rows=len(figures)):
+        with metrics.query("write chunk", rows=len(chunk)):
+            session.run(...)
+    metrics.write_json("batch_import_report.metrics.json")
+"""
+
+import functools
+import heapq
+import itertools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+UNATTRIBUTED_STAGE = "other"
+
+
+def timed_stage(name: str, rows: Optional[Callable[..., int]] = None):
+    """
+    Method decorator timing each call as stage `name` in `self.metrics`.
+
+    Args:
+        name: Stage name
+        rows: Called with the method's positional arguments to count the rows
+            the stage processes; defaults to len() of the first argument
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if rows is not None:
+                count = rows(*args)
+            else:
+                count = len(args[0]) if args and hasattr(args[0], "__len__") else 0
+            with self.metrics.stage(name, rows=count):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class ImportMetrics:
+    """Stage timings, round-trip counters and slow-query log for one import run."""
+
+    def __init__(self, slow_query_limit: int = 10):
+        """
+        Args:
+            slow_query_limit: Number of slowest queries to keep
+        """
+        self.slow_query_limit = slow_query_limit
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+        # Stage name -> counters, in first-run order
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self._stage_stack: List[str] = []
+
+        # Min-heap of (seconds, seq, entry) holding the slowest queries
+        self._slow_queries: List[Any] = []
+        self._seq = itertools.count()
+
+    # Stages
+
+    @contextmanager
+    def stage(self, name: str, rows: int = 0) -> Iterator[None]:
+        """Time a stage; repeated runs (e.g. streamed chunks) accumulate."""
+        entry = self._stage_entry(name)
+        self._stage_stack.append(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._stage_stack.pop()
+            with self._lock:
+                entry["seconds"] += elapsed
+                entry["runs"] += 1
+                entry["rows"] += rows
+
+    def _stage_entry(self, name: str) -> Dict[str, Any]:
+        with self._lock:
+            return self.stages.setdefault(name, {
+                "seconds": 0.0,
+                "runs": 0,
+                "rows": 0,
+                "round_trips": 0,
+                "query_seconds": 0.0,
+                "http_calls": 0,
+                "http_seconds": 0.0
+            })
+
+    @property
+    def current_stage(self) -> str:
+        # Worker threads run inside the stage that submitted them, so the
+        # main thread's stack is the right attribution for their queries too
+        return self._stage_stack[-1] if self._stage_stack else UNATTRIBUTED_STAGE
+
+    # Neo4j round trips
+
+    @contextmanager
+    def query(self, label: str, rows: int = 0) -> Iterator[None]:
+        """Time one Neo4j round trip (results must be consumed inside the block)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_query(label, time.perf_counter() - started, rows)
+
+    def record_query(self, label: str, seconds: float, rows: int = 0):
+        """Record a round trip that was timed by the caller."""
+        stage = self.current_stage
+        entry = self._stage_entry(stage)
+        with self._lock:
+            entry["round_trips"] += 1
+            entry["query_seconds"] += seconds
+
+            item = (seconds, next(self._seq), {
+                "stage": stage,
+                "query": label,
+                "rows": rows,
+                "seconds": seconds
+            })
+            if len(self._slow_queries) < self.slow_query_limit:
+                heapq.heappush(self._slow_queries, item)
+            elif seconds > self._slow_queries[0][0]:
+                heapq.heapreplace(self._slow_queries, item)
+
+    # Wikidata HTTP calls
+
+    @contextmanager
+    def http_call(self, request_count: Callable[[], int]) -> Iterator[None]:
+        """
+        Time a block of Wikidata lookups (including rate-limit wait) and count
+        the HTTP requests it actually sent, as the change in `request_count()`
+        (e.g. the shared client's request counter). Lookups answered from the
+        HTTP cache or the entity store add time but no calls.
+        """
+        requests_before = request_count()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            sent = request_count() - requests_before
+            entry = self._stage_entry(self.current_stage)
+            with self._lock:
+                entry["http_calls"] += sent
+                entry["http_seconds"] += elapsed
+
+    # Reporting
+
+    @property
+    def total_seconds(self) -> float:
+        return time.perf_counter() - self._started
+
+    def stage_summaries(self) -> List[Dict[str, Any]]:
+        """Per-stage counters with derived rows/second."""
+        summaries = []
+        with self._lock:
+            for name, entry in self.stages.items():
+                seconds = entry["seconds"]
+                summaries.append({
+                    "stage": name,
+                    **entry,
+                    "rows_per_second": entry["rows"] / seconds if seconds and entry["rows"] else None
+                })
+        return summaries
+
+    def slowest_queries(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [entry for _, _, entry in sorted(self._slow_queries, reverse=True)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        stages = self.stage_summaries()
+        return {
+            "started_at": self.started_at.isoformat(),
+            "total_seconds": self.total_seconds,
+            "round_trips": sum(s["round_trips"] for s in stages),
+            "http_calls": sum(s["http_calls"] for s in stages),
+            "stages": stages,
+            "slowest_queries": self.slowest_queries()
+        }
+
+    def write_json(self, path: str, extra: Optional[Dict[str, Any]] = None):
+        """Write the metrics (plus any `extra` top-level fields) as JSON."""
+        with open(path, 'w') as f:
+            json.dump({**(extra or {}), "metrics": self.to_dict()}, f, indent=2, default=str)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Candidate Generation for Fuzzy Name Matching
+
+Scoring every pair of names with fuzz.ratio is O(n²): fine for 772 figures,
+hopeless for 50k. NameBlockingIndex returns, for each name, only the names
+that can possibly clear a fuzz.ratio threshold, so the fuzzy pass scores a
+near-linear number of pairs.
+
+The filters are lossless for fuzz.ratio (indel similarity) above `min_ratio`:
+
+- Length filter: ratio > r requires the indel distance D to be at most
+  (1 - r/100)·(len_a + len_b), which bounds how different the lengths can be.
+- Trigram count filter: every insert/delete destroys at most 3 of a name's
+  distinct trigrams, so a match must share at least |trigrams(a)| - 3·D of
+  them.
+- Prefix filter: trigrams are ordered rarest-first and only the first
+  |trigrams(a)| - required + 1 are indexed, so common trigrams ("us ", " de")
+  never produce long posting lists.
+
+Names too short for the trigram bound to say anything are compared against
+every name in their length window instead.
+
+Usage:
+    index = NameBlockingIndex(names, min_ratio=90)
+    for i in range(len(names)):
+        for j in index.candidates(i):
+            ...  # j > i, ascending
+"""
+
+import math
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from typing import Dict, Iterator, List, Set, Tuple
+
+from lib.similarity_cache import normalize_name
+
+GRAM_SIZE = 3
+
+
+def trigrams(name: str) -> Set[str]:
+    """Distinct character trigrams of a normalized name."""
+    return {name[i:i + GRAM_SIZE] for i in range(len(name) - GRAM_SIZE + 1)}
+
+
+class NameBlockingIndex:
+    """Prefix-filtered trigram index over a fixed list of names."""
+
+    def __init__(self, names: List[str], min_ratio: float = 90):
+        """
+        Args:
+            names: Names to index; candidates are reported by position
+            min_ratio: fuzz.ratio threshold (0-100) the caller will apply
+        """
+        self.names = [normalize_name(name) for name in names]
+        self.min_ratio = min_ratio
+        self._slack = (100 - min_ratio) / 100
+
+        self._grams = [trigrams(name) for name in self.names]
+        frequency = Counter(gram for grams in self._grams for gram in grams)
+
+        # Rarest trigrams first, so prefixes stay selective
+        self._ordered = [
+            sorted(grams, key=lambda gram: (frequency[gram], gram))
+            for grams in self._grams
+        ]
+
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._short: List[int] = []
+        for idx, grams in enumerate(self._ordered):
+            required = self._required_overlap(idx)
+            if required <= 0:
+                self._short.append(idx)
+                continue
+            for gram in grams[:len(grams) - required + 1]:
+                self._postings[gram].append(idx)
+
+        # Positions sorted by length, for the short-name fallback
+        self._all_by_length = self._sort_by_length(range(len(self.names)))
+        self._short_by_length = self._sort_by_length(self._short)
+        self._short_set = set(self._short)
+
+    def _sort_by_length(self, positions) -> Tuple[List[int], List[int]]:
+        ordered = sorted(positions, key=lambda idx: len(self.names[idx]))
+        return ordered, [len(self.names[idx]) for idx in ordered]
+
+    def _length_window(self, by_length: Tuple[List[int], List[int]], length: int) -> List[int]:
+        ordered, lengths = by_length
+        lo = bisect_left(lengths, self._min_partner_length(length))
+        hi = bisect_right(lengths, self._max_partner_length(length))
+        return ordered[lo:hi]
+
+    def _max_partner_length(self, length: int) -> int:
+        return math.floor(length * (1 + self._slack) / (1 - self._slack)) if self._slack < 1 else 10 ** 9
+
+    def _min_partner_length(self, length: int) -> int:
+        return math.ceil(length * (1 - self._slack) / (1 + self._slack))
+
+    def _max_distance(self, len_a: int, len_b: int) -> int:
+        return math.floor(self._slack * (len_a + len_b))
+
+    def _required_overlap(self, idx: int) -> int:
+        """Shared trigrams any partner of `idx` must have, whatever its length."""
+        length = len(self.names[idx])
+        return len(self._grams[idx]) - GRAM_SIZE * self._max_distance(length, self._max_partner_length(length))
+
+    def _plausible(self, i: int, j: int) -> bool:
+        len_i, len_j = len(self.names[i]), len(self.names[j])
+        distance = self._max_distance(len_i, len_j)
+        if abs(len_i - len_j) > distance:
+            return False
+        required = max(len(self._grams[i]), len(self._grams[j])) - GRAM_SIZE * distance
+        return required <= 0 or len(self._grams[i] & self._grams[j]) >= required
+
+    def candidates(self, idx: int, after_only: bool = True) -> Iterator[int]:
+        """Positions that may match `idx` (only those after it, unless after_only is False), ascending."""
+        found = set()
+        for gram in self._ordered[idx][:len(self._ordered[idx]) - self._required_overlap(idx) + 1]:
+            found.update(self._postings.get(gram, ()))
+
+        # Short names share too few trigrams to be found through the postings
+        by_length = self._all_by_length if idx in self._short_set else self._short_by_length
+        found.update(self._length_window(by_length, len(self.names[idx])))
+
+        for other in sorted(found):
+            if (other > idx or (not after_only and other != idx)) and self._plausible(idx, other):
+                yield other
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Parallel Fuzzy Pair Scoring
+
+Scores the candidate pairs proposed by NameBlockingIndex (or every pair, for
+brute-force recall checks) and returns the pairs whose score exceeds a
+threshold. With jobs > 1 the positions are split across a
+ProcessPoolExecutor:
+
+- Each worker receives the normalized names once, as a plain tuple of
+  strings, and builds its own blocking index; no node objects are pickled.
+- Work units are interleaved slices of positions (k, k + chunks, ...), which
+  keeps brute-force units balanced even though early positions have the most
+  partners.
+- Results are merged by position, so the output is identical to jobs=1.
+
+Incremental audits pass `focus`: only pairs with at least one focus position
+are scored, each exactly once.
+
+Clustering stays in the caller: it only depends on which pairs matched, so a
+sequential greedy pass over the merged matches reproduces the single-process
+clusters exactly.
+
+Usage:
+    matches, scored = score_pairs(names, min_ratio=90, scorer=fuzz.ratio, jobs=4)
+    for i, partners in matches.items():   # partners: [(j, score), ...], j > i
+        ...
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from lib.name_blocking import NameBlockingIndex
+
+# Work units per worker process
+CHUNKS_PER_JOB = 8
+
+Matches = Dict[int, List[Tuple[int, float]]]
+
+# Per-process state, set by _init_worker
+_worker_state: Dict[str, object] = {}
+
+
+def _candidate_fn(
+    names: Sequence[str],
+    min_ratio: float,
+    brute_force: bool,
+    focus: Optional[Set[int]]
+) -> Callable[[int], object]:
+    """Partners to score for each position: later positions, or all positions in focus mode."""
+    if focus is None:
+        if brute_force:
+            return lambda i: range(i + 1, len(names))
+        return NameBlockingIndex(list(names), min_ratio=min_ratio).candidates
+
+    if brute_force:
+        neighbours = lambda i: range(len(names))
+    else:
+        index = NameBlockingIndex(list(names), min_ratio=min_ratio)
+        neighbours = lambda i: index.candidates(i, after_only=False)
+    # Focus pairs are scored from their lower focus position only
+    return lambda i: (j for j in neighbours(i) if j != i and (j > i or j not in focus))
+
+
+def _score_positions(
+    names: Sequence[str],
+    positions: Sequence[int],
+    candidates: Callable[[int], object],
+    scorer: Callable[[str, str], float],
+    min_ratio: float
+) -> Tuple[Matches, int]:
+    matches: Matches = {}
+    scored = 0
+    for i in positions:
+        for j in candidates(i):
+            scored += 1
+            score = scorer(names[i], names[j])
+            if score > min_ratio:
+                low, high = min(i, j), max(i, j)
+                matches.setdefault(low, []).append((high, score))
+    return matches, scored
+
+
+def _merge(into: Matches, matches: Matches):
+    for i, partners in matches.items():
+        into.setdefault(i, []).extend(partners)
+
+
+def _init_worker(
+    names: Tuple[str, ...],
+    min_ratio: float,
+    brute_force: bool,
+    scorer,
+    positions: Tuple[int, ...],
+    focus: Optional[Set[int]]
+):
+    _worker_state["names"] = names
+    _worker_state["min_ratio"] = min_ratio
+    _worker_state["scorer"] = scorer
+    _worker_state["positions"] = positions
+    _worker_state["candidates"] = _candidate_fn(names, min_ratio, brute_force, focus)
+
+
+def _score_chunk(start: int, step: int) -> Tuple[Matches, int]:
+    return _score_positions(
+        _worker_state["names"],
+        _worker_state["positions"][start::step],
+        _worker_state["candidates"],
+        _worker_state["scorer"],
+        _worker_state["min_ratio"]
+    )
+
+
+def score_pairs(
+    names: Sequence[str],
+    min_ratio: float,
+    scorer: Callable[[str, str], float],
+    jobs: int = 1,
+    brute_force: bool = False,
+    focus: Optional[Set[int]] = None
+) -> Tuple[Matches, int]:
+    """
+    Find pairs of names scoring above `min_ratio`.
+
+    Args:
+        names: Normalized names; pairs are reported by position
+        min_ratio: Score threshold (exclusive, 0-100)
+        scorer: Pair scoring function; must be picklable when jobs > 1
+        jobs: Worker processes (1 scores in this process)
+        brute_force: Score every pair instead of blocking candidates
+        focus: If given, only score pairs involving at least one of these positions
+
+    Returns:
+        ({i: [(j, score), ...]} with j > i ascending, number of pairs scored)
+    """
+    names = tuple(names)
+    positions = tuple(range(len(names))) if focus is None else tuple(sorted(focus))
+    matches: Matches = {}
+    scored = 0
+
+    if jobs <= 1 or len(positions) < 2:
+        candidates = _candidate_fn(names, min_ratio, brute_force, focus)
+        matches, scored = _score_positions(names, positions, candidates, scorer, min_ratio)
+    else:
+        chunks = min(len(positions), jobs * CHUNKS_PER_JOB)
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(names, min_ratio, brute_force, scorer, positions, focus)
+        ) as executor:
+            for chunk_matches, chunk_scored in executor.map(_score_chunk, range(chunks), [chunks] * chunks):
+                _merge(matches, chunk_matches)
+                scored += chunk_scored
+
+    return {i: sorted(matches[i]) for i in sorted(matches)}, scored
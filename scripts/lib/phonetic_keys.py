@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Phonetic Keys for Name Lookups
+
+Double Metaphone keys computed once at write time and stored as indexed
+properties on HistoricalFigure and FictionalCharacter, so duplicate checks
+can find sound-alike names ("Jon Smyth" / "John Smith") with index seeks
+instead of scanning every name with CONTAINS.
+
+Stored properties (see PHONETIC_PROPERTIES):
+- phonetic_key: primary codes of every name token, space-separated
+- phonetic_key_alt: alternate codes (primary where a token has none)
+- phonetic_first / phonetic_last: primary code of the first / last token
+
+A lookup probes the full-name keys plus the first/last token codes, so a
+misspelling confined to one token still finds the existing node.
+
+Requires the Metaphone package (pip install Metaphone); without it no keys
+are produced and callers fall back to their previous matching.
+
+Usage:
+    node.update(phonetic_keys(node["name"]))
+    probe = phonetic_probe(name)   # {"full": [...], "first": [...], "last": [...]}
+"""
+
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from metaphone import doublemetaphone
+    METAPHONE_AVAILABLE = True
+except ImportError:
+    METAPHONE_AVAILABLE = False
+
+PHONETIC_PROPERTIES = ("phonetic_key", "phonetic_key_alt", "phonetic_first", "phonetic_last")
+
+# Labels whose nodes carry phonetic keys, with their ID property
+PHONETIC_LABELS = {
+    "HistoricalFigure": "canonical_id",
+    "FictionalCharacter": "char_id"
+}
+
+_TOKEN_RE = re.compile(r"[a-z]+")
+
+
+def name_tokens(name: str) -> List[str]:
+    """Lowercase ASCII word tokens of a name (accents folded)."""
+    folded = unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode("ascii")
+    return _TOKEN_RE.findall(folded.lower())
+
+
+def _token_codes(name: str) -> List[Tuple[str, str]]:
+    """(primary, alternate) code per token; tokens without a code are dropped."""
+    codes = []
+    for token in name_tokens(name):
+        primary, alternate = doublemetaphone(token)
+        if primary:
+            codes.append((primary, alternate or primary))
+    return codes
+
+
+def phonetic_keys(name: str) -> Dict[str, Optional[str]]:
+    """
+    Properties to store on a node for `name`.
+
+    Returns an empty dict if Metaphone is unavailable, and None values if the
+    name has no encodable tokens (so stale keys are cleared on rename).
+    """
+    if not METAPHONE_AVAILABLE:
+        return {}
+
+    codes = _token_codes(name)
+    if not codes:
+        return {prop: None for prop in PHONETIC_PROPERTIES}
+
+    return {
+        "phonetic_key": " ".join(primary for primary, _ in codes),
+        "phonetic_key_alt": " ".join(alternate for _, alternate in codes),
+        "phonetic_first": codes[0][0],
+        "phonetic_last": codes[-1][0]
+    }
+
+
+def phonetic_probe(name: str) -> Optional[Dict[str, List[str]]]:
+    """
+    Key values to look up for `name`, or None if nothing can be encoded.
+
+    "full" is matched against phonetic_key/phonetic_key_alt, "first" against
+    phonetic_first and "last" against phonetic_last.
+    """
+    if not METAPHONE_AVAILABLE:
+        return None
+
+    codes = _token_codes(name)
+    if not codes:
+        return None
+
+    return {
+        "full": sorted({" ".join(p for p, _ in codes), " ".join(a for _, a in codes)}),
+        "first": sorted(set(codes[0])),
+        "last": sorted(set(codes[-1]))
+    }
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Q-ID Resolution Cache
+
+auto_resolve_missing_qids.py looks up every provisional HistoricalFigure on
+Wikidata by name and lifespan. Figures that resolved are written back and
+drop out of the next run, but ambiguous and unmatched figures were queried
+again every time, and an interrupted run lost the lookups it had made.
+ResolutionCache keeps each lookup's outcome in
+data/.ingestion-cache/qid_resolution_cache.json, keyed by
+(name, birth year, death year):
+
+- outcomes are saved every FLUSH_INTERVAL lookups, so a rerun after an
+  interruption only queries what is left
+- entries older than the TTL are looked up again (Wikidata keeps growing,
+  so "no match" is not permanent)
+- failed lookups are never stored
+
+Usage:
+    cache = ResolutionCache()
+    key = ResolutionCache.key(name, birth_year, death_year)
+    entry = cache.get(key)            # {"status", "candidates", "fetched_at"} or None
+    cache.put(key, "ambiguous", candidates)
+    cache.save()
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_CACHE_PATH = Path('data/.ingestion-cache/qid_resolution_cache.json')
+
+# Outcomes older than this are looked up again
+DEFAULT_TTL_DAYS = 30
+
+# Entries are written to disk every N puts
+FLUSH_INTERVAL = 50
+
+
+class ResolutionCache:
+    """On-disk cache of Wikidata lookup outcomes per (name, birth, death)."""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, ttl_days: float = DEFAULT_TTL_DAYS, enabled: bool = True):
+        """
+        Args:
+            path: JSON file holding the cache
+            ttl_days: Entries older than this are treated as missing
+            enabled: If False, every lookup misses and nothing is written
+        """
+        self.path = Path(path)
+        self.ttl_seconds = ttl_days * 86400
+        self.enabled = enabled
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._unsaved = 0
+
+        if enabled and self.path.exists():
+            with open(self.path, 'r') as f:
+                self.entries = json.load(f).get("lookups", {})
+
+    @staticmethod
+    def key(name: str, birth_year: Optional[int], death_year: Optional[int]) -> str:
+        return f"{' '.join((name or '').split())}|{birth_year or ''}|{death_year or ''}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached outcome younger than the TTL, or None."""
+        if not self.enabled:
+            return None
+        entry = self.entries.get(key)
+        if entry is None or time.time() - entry["fetched_at"] > self.ttl_seconds:
+            return None
+        return entry
+
+    def put(self, key: str, status: str, candidates: List[Dict[str, str]]):
+        """Record a lookup outcome ("resolved", "ambiguous" or "no_match")."""
+        if not self.enabled:
+            return
+        self.entries[key] = {"status": status, "candidates": candidates, "fetched_at": time.time()}
+        self._unsaved += 1
+        if self._unsaved >= FLUSH_INTERVAL:
+            self.save()
+
+    def save(self):
+        if not self.enabled or not self._unsaved:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so an interrupted save never truncates the cache
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({"lookups": self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self._unsaved = 0
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Persistent Name-Similarity Score Cache
+
+The duplicate detectors (BatchImporter, EntityResolver, DuplicateChecker)
+rescore the same name pairs on every run. This cache keeps scores on disk in
+data/.ingestion-cache/similarity_cache.sqlite, keyed by
+(algorithm version, normalized name A, normalized name B), so repeated runs
+only compute scores for pairs they have not seen before.
+
+- Names are normalized (lowercased, whitespace collapsed) and the pair is
+  ordered, so (A, B) and (b, a) share an entry. All detectors use symmetric
+  scores, and they score the normalized names.
+- The algorithm key must include a version (e.g. "fuzz.ratio@1"); bump it
+  whenever a scoring function changes so stale scores are never reused.
+- Entries are held in an in-memory LRU bounded by `max_entries` and flushed to
+  SQLite on flush()/close(), which also evicts the least recently used rows
+  beyond `max_entries`.
+
+Usage:
+    cache = SimilarityCache()
+    score = cache.score("fuzz.ratio@1", name1, name2, fuzz.ratio)
+    ...
+    print(cache.describe())
+    cache.close()
+"""
+
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple
+
+DEFAULT_CACHE_PATH = Path('data/.ingestion-cache/similarity_cache.sqlite')
+DEFAULT_MAX_ENTRIES = 500_000
+
+CacheKey = Tuple[str, str, str]
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase and collapse whitespace."""
+    return " ".join((name or "").lower().split())
+
+
+class SimilarityCache:
+    """On-disk, size-bounded cache of name-pair similarity scores."""
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        enabled: bool = True
+    ):
+        """
+        Args:
+            path: SQLite file holding the cache
+            max_entries: Maximum number of scores kept (in memory and on disk)
+            enabled: If False, scores are computed every time (hit rates are
+                still reported, as all misses)
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.enabled = enabled
+
+        self._entries: "OrderedDict[CacheKey, float]" = OrderedDict()
+        self._dirty: Set[CacheKey] = set()
+        self._loaded = False
+
+        # algorithm -> [hits, misses]
+        self._counts: Dict[str, list] = {}
+
+    def score(
+        self,
+        algorithm: str,
+        name1: str,
+        name2: str,
+        compute: Callable[[str, str], float]
+    ) -> float:
+        """
+        Cached similarity of two names.
+
+        `compute` is called with the normalized names on a miss.
+        """
+        a, b = normalize_name(name1), normalize_name(name2)
+        if b < a:
+            a, b = b, a
+        counts = self._counts.setdefault(algorithm, [0, 0])
+
+        if not self.enabled:
+            counts[1] += 1
+            return compute(a, b)
+
+        if not self._loaded:
+            self._load()
+
+        key = (algorithm, a, b)
+        cached = self._entries.get(key)
+        if cached is not None:
+            counts[0] += 1
+            self._entries.move_to_end(key)
+            self._dirty.add(key)
+            return cached
+
+        counts[1] += 1
+        value = compute(a, b)
+        self._entries[key] = value
+        self._dirty.add(key)
+        if len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._dirty.discard(evicted)
+        return value
+
+    # Persistence
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS scores (
+                algorithm TEXT NOT NULL,
+                name_a TEXT NOT NULL,
+                name_b TEXT NOT NULL,
+                score REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (algorithm, name_a, name_b)
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS scores_last_used ON scores (last_used)")
+        return conn
+
+    def _load(self):
+        """Load the most recently used scores, oldest first (LRU order)."""
+        self._loaded = True
+        if not self.path.exists():
+            return
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT algorithm, name_a, name_b, score FROM scores ORDER BY last_used DESC LIMIT ?",
+                (self.max_entries,)
+            ).fetchall()
+        finally:
+            conn.close()
+
+        for algorithm, a, b, value in reversed(rows):
+            self._entries[(algorithm, a, b)] = value
+
+    def flush(self):
+        """Write new/used scores to disk and evict beyond max_entries."""
+        if not self.enabled or not self._dirty:
+            return
+
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO scores (algorithm, name_a, name_b, score, last_used) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    ((key[0], key[1], key[2], self._entries[key], now)
+                     for key in self._dirty if key in self._entries)
+                )
+                excess = conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0] - self.max_entries
+                if excess > 0:
+                    conn.execute(
+                        "DELETE FROM scores WHERE rowid IN "
+                        "(SELECT rowid FROM scores ORDER BY last_used ASC LIMIT ?)",
+                        (excess,)
+                    )
+        finally:
+            conn.close()
+        self._dirty.clear()
+
+    def close(self):
+        self.flush()
+
+    # Reporting
+
+    @property
+    def hits(self) -> int:
+        return sum(counts[0] for counts in self._counts.values())
+
+    @property
+    def misses(self) -> int:
+        return sum(counts[1] for counts in self._counts.values())
+
+    def hit_rate(self) -> Optional[float]:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Hits, misses and hit rate per algorithm."""
+        return {
+            algorithm: {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else None
+            }
+            for algorithm, (hits, misses) in self._counts.items()
+        }
+
+    def describe(self) -> str:
+        """One-line summary for logs and reports."""
+        rate = self.hit_rate()
+        if rate is None:
+            return "similarity cache: no lookups"
+        return (
+            f"similarity cache: {self.hits} hits / {self.misses} misses "
+            f"({rate:.1%} hit rate), {len(self._entries)} entries in memory"
+        )
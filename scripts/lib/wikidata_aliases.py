@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Batched Wikidata Alias Lookups with an On-Disk Store
+
+EntityResolver used to send one SPARQL query per figure on every run. This
+module fetches aliases for many Q-IDs per query (a `VALUES ?item { ... }`
+block) and keeps the results in data/.ingestion-cache/wikidata_aliases.sqlite,
+keyed by Q-ID, so reruns only query Q-IDs that are new or older than the
+refresh TTL.
+
+- Q-IDs without any aliases are stored too (as an empty list), so they are
+  not asked for again until they expire.
+- A failed batch is retried as two halves, down to single Q-IDs; Q-IDs that
+  still fail are reported and left unstored. A replay missing recorded
+  Q-IDs fails at once instead.
+- The SPARQL endpoint is anything with `query(sparql) -> JSON results`:
+  SparqlEndpoint (live, via the shared lib/wikidata_client.py) or
+  RecordedSparqlEndpoint, which replays per-Q-ID bindings saved to a JSON
+  file (and can record them from a live endpoint) so the alias pass runs
+  offline and reproducibly.
+
+Usage:
+    store = AliasStore()
+    fetcher = AliasFetcher(store, SparqlEndpoint())
+    aliases = fetcher.fetch(["Q1048", "Q8409"])   # {"Q1048": [...], ...}
+    store.close()
+
+    # Offline, from a recording
+    fetcher = AliasFetcher(AliasStore(enabled=False),
+                           RecordedSparqlEndpoint("alias_responses.json"))
+"""
+
+import json
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from lib.wikidata_client import WikidataClient, get_client
+
+DEFAULT_STORE_PATH = Path('data/.ingestion-cache/wikidata_aliases.sqlite')
+
+# Languages to fetch aliases for
+ALIAS_LANGUAGES = ["en", "la", "it", "fr", "de", "es"]
+
+# Aliases older than this are fetched again
+DEFAULT_TTL_DAYS = 30
+
+# Q-IDs per VALUES block (keeps queries well under the endpoint's URL/time limits)
+DEFAULT_BATCH_SIZE = 200
+
+QID_PATTERN = re.compile(r"^Q\d+$")
+VALUES_PATTERN = re.compile(r"VALUES \?item \{([^}]*)\}")
+
+USER_AGENT = "Fictotum/1.0 (https://github.com/gcquraishi/fictotum; Entity Resolution)"
+
+
+def build_alias_query(qids: Sequence[str], languages: Sequence[str] = ALIAS_LANGUAGES) -> str:
+    """SPARQL query returning (?item, ?altLabel) for every Q-ID in `qids`."""
+    values = " ".join(f"wd:{qid}" for qid in qids)
+    lang_list = ", ".join(f'"{lang}"' for lang in languages)
+
+    return f"""
+    SELECT ?item ?altLabel WHERE {{
+      VALUES ?item {{ {values} }}
+      ?item skos:altLabel ?altLabel .
+      FILTER(lang(?altLabel) IN ({lang_list}))
+    }}
+    """
+
+
+class SparqlEndpoint:
+    """Live Wikidata SPARQL endpoint (rate-limited shared client)."""
+
+    def __init__(self, client: Optional[WikidataClient] = None):
+        self.client = client or get_client()
+
+    def query(self, query: str) -> Dict[str, Any]:
+        # Large VALUES blocks are POSTed by the client
+        return self.client.sparql(query, headers={"User-Agent": USER_AGENT})
+
+
+class RecordingMissingError(KeyError):
+    """Raised when a replayed alias query asks for Q-IDs that were never recorded."""
+    pass
+
+
+class RecordedSparqlEndpoint:
+    """
+    Stand-in endpoint replaying recorded alias bindings from a JSON file.
+
+    Bindings are recorded per Q-ID ({"Q1048": [binding, ...]}), and a replayed
+    response is assembled from the Q-IDs in the query's VALUES block, so
+    recordings still apply when batch sizes or the set of figures change.
+    With a `live` endpoint, unrecorded Q-IDs are queried live and the
+    recording is updated on save(); without one the query raises
+    RecordingMissingError.
+    """
+
+    def __init__(self, path: Path, live: Optional[SparqlEndpoint] = None):
+        self.path = Path(path)
+        self.live = live
+        self.bindings: Dict[str, List[Dict[str, Any]]] = {}
+        self._changed = False
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                self.bindings = json.load(f)
+
+    @staticmethod
+    def qids_in(query: str) -> List[str]:
+        """Q-IDs of the query's VALUES block."""
+        match = VALUES_PATTERN.search(query)
+        return re.findall(r"wd:(Q\d+)", match.group(1)) if match else []
+
+    def query(self, query: str) -> Dict[str, Any]:
+        qids = self.qids_in(query)
+        missing = [qid for qid in qids if qid not in self.bindings]
+        if missing:
+            if self.live is None:
+                raise RecordingMissingError(
+                    f"No recorded aliases for {len(missing)} Q-IDs (e.g. {missing[0]}) in {self.path}; "
+                    f"record them with a live endpoint first"
+                )
+            values = " ".join(f"wd:{qid}" for qid in missing)
+            results = self.live.query(VALUES_PATTERN.sub(f"VALUES ?item {{ {values} }}", query, count=1))
+            recorded: Dict[str, List[Dict[str, Any]]] = {qid: [] for qid in missing}
+            for binding in results["results"]["bindings"]:
+                qid = binding["item"]["value"].rsplit("/", 1)[-1]
+                if qid in recorded:
+                    recorded[qid].append(binding)
+            self.bindings.update(recorded)
+            self._changed = True
+
+        return {
+            "head": {"vars": ["item", "altLabel"]},
+            "results": {"bindings": [binding for qid in qids for binding in self.bindings[qid]]}
+        }
+
+    def save(self):
+        if not self._changed:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(self.bindings, f, indent=2, sort_keys=True)
+        self._changed = False
+
+
+class AliasStore:
+    """On-disk Q-ID -> aliases store with a refresh TTL."""
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_STORE_PATH,
+        ttl_days: float = DEFAULT_TTL_DAYS,
+        enabled: bool = True
+    ):
+        """
+        Args:
+            path: SQLite file holding the aliases
+            ttl_days: Entries older than this are treated as missing
+            enabled: If False, nothing is read from or written to disk
+        """
+        self.path = Path(path)
+        self.ttl_seconds = ttl_days * 86400
+        self.enabled = enabled
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=30)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS aliases (
+                    qid TEXT PRIMARY KEY,
+                    aliases TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+            """)
+        return self._conn
+
+    def get_fresh(self, qids: Iterable[str]) -> Dict[str, List[str]]:
+        """Stored aliases for the Q-IDs that have an entry younger than the TTL."""
+        if not self.enabled:
+            return {}
+
+        qids = list(qids)
+        cutoff = time.time() - self.ttl_seconds
+        conn = self._connect()
+        found = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(qids), 500):
+            chunk = qids[start:start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT qid, aliases FROM aliases WHERE fetched_at >= ? AND qid IN ({placeholders})",
+                [cutoff] + chunk
+            ).fetchall()
+            for qid, aliases in rows:
+                found[qid] = json.loads(aliases)
+        return found
+
+    def put_many(self, aliases: Dict[str, List[str]]):
+        if not self.enabled or not aliases:
+            return
+
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO aliases (qid, aliases, fetched_at) VALUES (?, ?, ?)",
+                ((qid, json.dumps(values), now) for qid, values in aliases.items())
+            )
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class AliasFetcher:
+    """Fetches aliases for many Q-IDs, store first, then batched SPARQL."""
+
+    def __init__(self, store: AliasStore, endpoint, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.store = store
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+
+        self.cached = 0
+        self.fetched = 0
+        self.queries = 0
+        self.failed: List[str] = []
+
+    def fetch(self, qids: Iterable[str], progress: bool = True) -> Dict[str, List[str]]:
+        """
+        Aliases for each Q-ID (sorted, deduplicated). Q-IDs whose lookup failed
+        are missing from the result and listed in `self.failed`.
+        """
+        qids = sorted(set(qids))
+        malformed = [qid for qid in qids if not QID_PATTERN.match(qid)]
+        if malformed:
+            # Never interpolated into SPARQL
+            print(f"⚠️  Warning: Skipping {len(malformed)} malformed Q-IDs (e.g. {malformed[0]!r})")
+            self.failed.extend(malformed)
+            qids = [qid for qid in qids if QID_PATTERN.match(qid)]
+
+        aliases = self.store.get_fresh(qids)
+        self.cached += len(aliases)
+
+        missing = [qid for qid in qids if qid not in aliases]
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start:start + self.batch_size]
+            fetched = self._fetch_batch(batch)
+            self.store.put_many(fetched)
+            aliases.update(fetched)
+            self.fetched += len(fetched)
+            if progress:
+                print(f"  Progress: {min(start + self.batch_size, len(missing))}/{len(missing)} Q-IDs queried...")
+
+        return aliases
+
+    def _fetch_batch(self, batch: List[str]) -> Dict[str, List[str]]:
+        """Query one VALUES block, splitting it in half on failure."""
+        try:
+            self.queries += 1
+            results = self.endpoint.query(build_alias_query(batch))
+        except RecordingMissingError:
+            # Splitting cannot help a replay that lacks recordings; stop here
+            raise
+        except Exception as e:
+            if len(batch) == 1:
+                print(f"⚠️  Warning: Could not fetch aliases for {batch[0]}: {e}")
+                self.failed.append(batch[0])
+                return {}
+            middle = len(batch) // 2
+            fetched = self._fetch_batch(batch[:middle])
+            fetched.update(self._fetch_batch(batch[middle:]))
+            return fetched
+
+        found: Dict[str, set] = {qid: set() for qid in batch}
+        for binding in results["results"]["bindings"]:
+            qid = binding["item"]["value"].rsplit("/", 1)[-1]
+            if qid in found and "altLabel" in binding:
+                found[qid].add(binding["altLabel"]["value"])
+        return {qid: sorted(values) for qid, values in found.items()}
+
+    def describe(self) -> str:
+        """One-line summary for logs."""
+        summary = (
+            f"aliases: {self.cached} Q-IDs from store, {self.fetched} fetched "
+            f"in {self.queries} queries"
+        )
+        if self.failed:
+            summary += f", {len(self.failed)} failed"
+        return summary
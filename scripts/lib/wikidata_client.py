@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Shared Wikidata HTTP Client
+
+Every Wikidata caller used to pace itself: a module-global timestamp in
+lib/wikidata_search.py (unsafe across threads) and ad-hoc time.sleep calls
+in the research/import scripts, each opening a fresh connection per request.
+WikidataClient is the one place requests to wikidata.org go through:
+
+- Separate token buckets for the Action API (w/api.php) and the SPARQL query
+  service, each lock-protected, so concurrent callers share one budget
+  instead of racing past it or queueing behind a global sleep.
+- At most MAX_CONCURRENT_SPARQL queries in flight (the query service limits
+  parallel queries per client).
+- One keep-alive requests.Session with a connection pool sized for
+  concurrent callers.
+- 429/503 responses honour Retry-After (seconds or HTTP date) and pause the
+  whole bucket, so other threads back off too; connection errors and other
+  5xx responses are retried with exponential backoff. After max_retries the
+  last error is raised as a requests.RequestException, as requests.get did.
+
+Usage:
+    client = get_client()                           # shared per process
+    data = client.action_api({"action": "wbgetentities", "ids": "Q1048"})
+    results = client.sparql("SELECT ?item WHERE { ... }")
+    print(client.describe())
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+WIKIDATA_API_URL = "https://www.wikidata.org/w/api.php"
+WIKIDATA_SPARQL_URL = "https://query.wikidata.org/sparql"
+
+USER_AGENT = "Fictotum/1.0 (https://github.com/gcquraishi/fictotum; Wikidata client)"
+
+# Sustained requests per second and burst size, per API
+ACTION_API_RATE = 5.0
+ACTION_API_BURST = 5
+SPARQL_RATE = 2.0
+SPARQL_BURST = 2
+
+MAX_CONCURRENT_SPARQL = 5
+POOL_SIZE = 16
+
+# Queries longer than this are POSTed (GET URLs are limited in length)
+MAX_SPARQL_GET_LENGTH = 2000
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+        self.waited_seconds = 0.0
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+                self.waited_seconds += wait
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hand out no tokens for `seconds` (e.g. after a Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Seconds from a Retry-After header (delta or HTTP date), if present."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class WikidataClient:
+    """Rate-limited, pooled, retrying client for the Action API and SPARQL."""
+
+    def __init__(
+        self,
+        user_agent: str = USER_AGENT,
+        action_rate: float = ACTION_API_RATE,
+        sparql_rate: float = SPARQL_RATE,
+        max_retries: int = 4,
+        backoff: float = 1.0,
+        pool_size: int = POOL_SIZE
+    ):
+        """
+        Args:
+            user_agent: Default User-Agent (callers may pass their own headers)
+            action_rate: Action API requests per second
+            sparql_rate: SPARQL queries per second
+            max_retries: Retries per request after 429/5xx/connection errors
+            backoff: First retry delay in seconds (doubles each retry)
+            pool_size: Keep-alive connections kept per host
+        """
+        self.buckets = {
+            "action": TokenBucket(action_rate, ACTION_API_BURST),
+            "sparql": TokenBucket(sparql_rate, SPARQL_BURST)
+        }
+        self._sparql_slots = threading.BoundedSemaphore(MAX_CONCURRENT_SPARQL)
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._stats_lock = threading.Lock()
+        self.requests = {"action": 0, "sparql": 0}
+        self.retries = 0
+
+    def request_json(
+        self,
+        api: str,
+        method: str,
+        url: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        timeout: float = 10
+    ) -> Any:
+        """
+        One JSON request against `api` ("action" or "sparql"), rate-limited and retried.
+
+        Raises:
+            requests.RequestException: If the request still fails after retries
+        """
+        bucket = self.buckets[api]
+        attempt = 0
+        while True:
+            bucket.acquire()
+            with self._stats_lock:
+                self.requests[api] += 1
+            try:
+                if api == "sparql":
+                    with self._sparql_slots:
+                        response = self.session.request(
+                            method, url, params=params, data=data, headers=headers, timeout=timeout
+                        )
+                else:
+                    response = self.session.request(
+                        method, url, params=params, data=data, headers=headers, timeout=timeout
+                    )
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff * 2 ** attempt
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    response.raise_for_status()
+                    return response.json()
+                delay = retry_after_seconds(response)
+                if delay is not None:
+                    # Throttled: every caller on this API waits it out
+                    bucket.pause(delay)
+                else:
+                    delay = self.backoff * 2 ** attempt
+
+            attempt += 1
+            with self._stats_lock:
+                self.retries += 1
+            time.sleep(delay)
+
+    def action_api(self, params: Dict, headers: Optional[Dict] = None, timeout: float = 10) -> Any:
+        """GET w/api.php with `params` (format=json is added)."""
+        return self.request_json(
+            "action", "GET", WIKIDATA_API_URL,
+            params=dict(params, format="json"), headers=headers, timeout=timeout
+        )
+
+    def sparql(self, query: str, headers: Optional[Dict] = None, timeout: float = 60) -> Any:
+        """Run a SPARQL query and return the JSON results (POSTed if long)."""
+        headers = dict(headers or {}, Accept="application/sparql-results+json")
+        payload = {"query": query, "format": "json"}
+        if len(query) > MAX_SPARQL_GET_LENGTH:
+            return self.request_json(
+                "sparql", "POST", WIKIDATA_SPARQL_URL, data=payload, headers=headers, timeout=timeout
+            )
+        return self.request_json(
+            "sparql", "GET", WIKIDATA_SPARQL_URL, params=payload, headers=headers, timeout=timeout
+        )
+
+    def describe(self) -> str:
+        """One-line summary for logs."""
+        waited = sum(bucket.waited_seconds for bucket in self.buckets.values())
+        return (
+            f"Wikidata client: {self.requests['action']} Action API / {self.requests['sparql']} SPARQL "
+            f"requests, {self.retries} retries, {waited:.1f}s waiting on rate limits (all threads)"
+        )
+
+    def close(self):
+        self.session.close()
+
+
+_client: Optional[WikidataClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> WikidataClient:
+    """The process-wide client (created on first use)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = WikidataClient()
+        return _client
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Offline Wikidata Entity Store
+
+The import, resolver, audit and series-linking scripts keep asking Wikidata
+the same questions: labels, aliases, P31 type, birth/death dates, P179 series
+and creators. EntityStore holds just those facts for a subset of Wikidata in
+one indexed SQLite file (data/.ingestion-cache/wikidata_entities.sqlite),
+opened read-only and memory-mapped, so lookups are local index seeks with no
+network dependency.
+
+Built by scripts/maintenance/build_wikidata_entity_store.py from a Wikidata
+JSON dump (latest-all.json.gz/.bz2) or a filtered extract (one entity JSON
+per line, the same format wbgetentities returns).
+
+Stored per entity (see entity_record):
+- English label and description, aliases in ALIAS_LANGUAGES
+- item-valued claims for ITEM_PROPERTIES (P31, P179, P50, P57, P170, P178)
+- years from P569 (birth), P570 (death) and P577 (publication)
+
+Lookups:
+- get(qid): the stored record
+- find_by_name(name): entities whose label or alias matches exactly (normalized)
+- search(text): fuzzy label/alias search; candidates come from the rarest
+  title tokens' postings and are scored with difflib, best first
+- works_by_creator(creator_qids): works whose P50/P57/P170/P178 is a creator
+
+Usage:
+    store = EntityStore.open()
+    store.get("Q161531")["label"]                  # 'War and Peace'
+    store.search("war and peace", limit=5)
+"""
+
+import difflib
+import re
+import sqlite3
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+DEFAULT_STORE_PATH = Path('data/.ingestion-cache/wikidata_entities.sqlite')
+
+LABEL_LANGUAGE = "en"
+ALIAS_LANGUAGES = ("en", "la", "it", "fr", "de", "es")
+
+# Item-valued properties kept
+ITEM_PROPERTIES = ("P31", "P179", "P50", "P57", "P170", "P178")
+CREATOR_PROPERTIES = ("P50", "P57", "P170", "P178")
+
+# Time-valued properties kept (as years)
+YEAR_PROPERTIES = {"P569": "birth_year", "P570": "death_year", "P577": "publication_year"}
+
+# Search: tokens with more postings than this are only used if nothing rarer matches
+MAX_TOKEN_POSTINGS = 20_000
+MAX_SEARCH_CANDIDATES = 2_000
+
+# Read connections memory-map up to this many bytes of the file
+MMAP_SIZE = 1 << 30
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, accents folded, punctuation dropped, whitespace collapsed."""
+    folded = unicodedata.normalize("NFKD", text or "")
+    folded = "".join(char for char in folded if not unicodedata.combining(char)).lower()
+    return " ".join(_TOKEN_RE.findall(folded))
+
+
+def qid_number(qid: str) -> Optional[int]:
+    if qid and qid[0] in "Qq" and qid[1:].isdigit():
+        return int(qid[1:])
+    return None
+
+
+def _claim_values(claims: List[Dict]) -> List[Dict]:
+    """Datavalues of the best-ranked, non-deprecated statements."""
+    statements = [claim for claim in claims if claim.get("rank") != "deprecated"]
+    preferred = [claim for claim in statements if claim.get("rank") == "preferred"]
+    values = []
+    for claim in preferred or statements:
+        datavalue = claim.get("mainsnak", {}).get("datavalue")
+        if datavalue:
+            values.append(datavalue.get("value"))
+    return values
+
+
+def _year(value: Any) -> Optional[int]:
+    """Year of a Wikidata time value ("+1869-01-01T00:00:00Z", "-0044-03-15...")."""
+    time_string = value.get("time") if isinstance(value, dict) else None
+    match = re.match(r"^([+-]?)(\d+)-", time_string or "")
+    if not match:
+        return None
+    year = int(match.group(2))
+    return -year if match.group(1) == "-" else year
+
+
+def entity_record(entity: Dict, alias_languages: Iterable[str] = ALIAS_LANGUAGES) -> Optional[Dict[str, Any]]:
+    """
+    Compact record of a Wikidata entity JSON (dump line or wbgetentities entity).
+
+    Returns None for non-items and missing entities.
+    """
+    number = qid_number(entity.get("id", ""))
+    if number is None or "missing" in entity:
+        return None
+
+    aliases = set()
+    for language in alias_languages:
+        for alias in entity.get("aliases", {}).get(language, []):
+            aliases.add(alias["value"])
+
+    claims = entity.get("claims", {})
+    record = {
+        "qid": f"Q{number}",
+        "label": entity.get("labels", {}).get(LABEL_LANGUAGE, {}).get("value"),
+        "description": entity.get("descriptions", {}).get(LABEL_LANGUAGE, {}).get("value"),
+        "aliases": sorted(aliases),
+        "claims": {}
+    }
+    for prop in ITEM_PROPERTIES:
+        targets = []
+        for value in _claim_values(claims.get(prop, [])):
+            target = value.get("numeric-id") if isinstance(value, dict) else None
+            if target is None and isinstance(value, dict):
+                target = qid_number(value.get("id", ""))
+            if target is not None:
+                targets.append(f"Q{target}")
+        if targets:
+            record["claims"][prop] = targets
+    for prop, field in YEAR_PROPERTIES.items():
+        years = [year for year in map(_year, _claim_values(claims.get(prop, []))) if year is not None]
+        record[field] = years[0] if years else None
+    return record
+
+
+class EntityStore:
+    """Indexed, memory-mapped SQLite store of compact Wikidata entity records."""
+
+    def __init__(self, conn: sqlite3.Connection, path: Path):
+        self.conn = conn
+        self.path = path
+
+    # Building
+
+    @classmethod
+    def create(cls, path: Path = DEFAULT_STORE_PATH) -> 'EntityStore':
+        """New, empty store for writing (replaces an existing file)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            path.unlink()
+        conn = sqlite3.connect(str(path))
+        conn.executescript("""
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE entities (
+                id INTEGER PRIMARY KEY,
+                label TEXT,
+                description TEXT,
+                birth_year INTEGER,
+                death_year INTEGER,
+                publication_year INTEGER
+            );
+            CREATE TABLE aliases (id INTEGER NOT NULL, alias TEXT NOT NULL);
+            CREATE TABLE claims (id INTEGER NOT NULL, property TEXT NOT NULL, value INTEGER NOT NULL);
+            CREATE TABLE names (name TEXT NOT NULL, id INTEGER NOT NULL);
+            CREATE TABLE tokens (token TEXT NOT NULL, id INTEGER NOT NULL);
+        """)
+        return cls(conn, path)
+
+    def add_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Insert entity records (from entity_record); returns how many were added."""
+        entities, aliases, claims, names, tokens = [], [], [], [], []
+        for record in records:
+            number = qid_number(record["qid"])
+            entities.append((
+                number, record["label"], record["description"],
+                record["birth_year"], record["death_year"], record["publication_year"]
+            ))
+            aliases.extend((number, alias) for alias in record["aliases"])
+            for prop, targets in record["claims"].items():
+                claims.extend((number, prop, qid_number(target)) for target in targets)
+
+            entity_names = {normalize_text(name) for name in [record["label"]] + record["aliases"] if name}
+            entity_names.discard("")
+            names.extend((name, number) for name in entity_names)
+            entity_tokens = {token for name in entity_names for token in name.split()}
+            tokens.extend((token, number) for token in entity_tokens)
+
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO entities VALUES (?, ?, ?, ?, ?, ?)", entities)
+            self.conn.executemany("INSERT INTO aliases VALUES (?, ?)", aliases)
+            self.conn.executemany("INSERT INTO claims VALUES (?, ?, ?)", claims)
+            self.conn.executemany("INSERT INTO names VALUES (?, ?)", names)
+            self.conn.executemany("INSERT INTO tokens VALUES (?, ?)", tokens)
+        return len(entities)
+
+    def finish(self, meta: Dict[str, Any]):
+        """Build the indexes, record metadata and compact the file."""
+        self.conn.executescript("""
+            CREATE INDEX aliases_id ON aliases (id);
+            CREATE INDEX claims_id ON claims (id, property);
+            CREATE INDEX claims_value ON claims (property, value);
+            CREATE INDEX names_name ON names (name);
+            CREATE INDEX tokens_token ON tokens (token, id);
+            ANALYZE;
+        """)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                ((key, str(value)) for key, value in meta.items())
+            )
+        self.conn.execute("VACUUM")
+        self.conn.close()
+
+    # Reading
+
+    @classmethod
+    def open(cls, path: Path = DEFAULT_STORE_PATH) -> 'EntityStore':
+        """
+        Open a built store read-only.
+
+        Raises:
+            FileNotFoundError: If there is no store at `path`
+        """
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"No Wikidata entity store at {path}")
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+        return cls(conn, path)
+
+    def meta(self) -> Dict[str, str]:
+        return dict(self.conn.execute("SELECT key, value FROM meta"))
+
+    def get(self, qid: str) -> Optional[Dict[str, Any]]:
+        """Stored record for a Q-ID (shaped like entity_record), or None."""
+        number = qid_number(qid)
+        if number is None:
+            return None
+        row = self.conn.execute(
+            "SELECT label, description, birth_year, death_year, publication_year FROM entities WHERE id = ?",
+            (number,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        claims: Dict[str, List[str]] = {}
+        for prop, value in self.conn.execute("SELECT property, value FROM claims WHERE id = ?", (number,)):
+            claims.setdefault(prop, []).append(f"Q{value}")
+        return {
+            "qid": f"Q{number}",
+            "label": row[0],
+            "description": row[1],
+            "aliases": [alias for (alias,) in self.conn.execute(
+                "SELECT alias FROM aliases WHERE id = ? ORDER BY alias", (number,)
+            )],
+            "claims": claims,
+            "birth_year": row[2],
+            "death_year": row[3],
+            "publication_year": row[4]
+        }
+
+    def labels(self, qids: Iterable[str]) -> Dict[str, Optional[str]]:
+        """English label per Q-ID (only Q-IDs present in the store)."""
+        numbers = [number for number in map(qid_number, qids) if number is not None]
+        found = {}
+        for start in range(0, len(numbers), 500):
+            chunk = numbers[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT id, label FROM entities WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+            )
+            found.update((f"Q{number}", label) for number, label in rows)
+        return found
+
+    def find_by_name(self, name: str) -> List[str]:
+        """Q-IDs whose label or an alias equals `name` (normalized)."""
+        return [f"Q{number}" for (number,) in self.conn.execute(
+            "SELECT DISTINCT id FROM names WHERE name = ? ORDER BY id", (normalize_text(name),)
+        )]
+
+    def search(self, text: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Fuzzy label/alias search, best first.
+
+        Returns dicts with qid, label, description and score (difflib ratio of
+        the normalized text against the closest label or alias).
+        """
+        query = normalize_text(text)
+        if not query:
+            return []
+
+        postings = []
+        for token in set(query.split()):
+            (count,) = self.conn.execute("SELECT COUNT(*) FROM tokens WHERE token = ?", (token,)).fetchone()
+            if count:
+                postings.append((count, token))
+        postings.sort()
+        if not postings:
+            return []
+
+        # Rarest tokens first; common ones only if nothing rarer matched
+        usable = [token for count, token in postings if count <= MAX_TOKEN_POSTINGS] or [postings[0][1]]
+        candidates: List[int] = []
+        seen = set()
+        for token in usable:
+            for (number,) in self.conn.execute(
+                "SELECT id FROM tokens WHERE token = ? LIMIT ?", (token, MAX_SEARCH_CANDIDATES)
+            ):
+                if number not in seen:
+                    seen.add(number)
+                    candidates.append(number)
+            if len(candidates) >= MAX_SEARCH_CANDIDATES:
+                break
+
+        best: Dict[int, float] = {}
+        matcher = difflib.SequenceMatcher(None, "", query)
+        for start in range(0, len(candidates), 500):
+            chunk = candidates[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT id, name FROM names WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+            )
+            for number, name in rows:
+                matcher.set_seq1(name)
+                if matcher.real_quick_ratio() <= best.get(number, 0.0):
+                    continue
+                best[number] = max(best.get(number, 0.0), matcher.ratio())
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        results = []
+        for number, score in ranked:
+            label, description = self.conn.execute(
+                "SELECT label, description FROM entities WHERE id = ?", (number,)
+            ).fetchone()
+            results.append({"qid": f"Q{number}", "label": label, "description": description, "score": score})
+        return results
+
+    def works_by_creator(self, creator_qids: Iterable[str], limit: int = 50) -> List[str]:
+        """Q-IDs of works with any creator property (P50/P57/P170/P178) in `creator_qids`."""
+        numbers = [number for number in map(qid_number, creator_qids) if number is not None]
+        if not numbers:
+            return []
+        rows = self.conn.execute(
+            f"SELECT DISTINCT id FROM claims "
+            f"WHERE property IN ({', '.join('?' * len(CREATOR_PROPERTIES))}) "
+            f"AND value IN ({', '.join('?' * len(numbers))}) ORDER BY id LIMIT ?",
+            list(CREATOR_PROPERTIES) + numbers + [limit]
+        )
+        return [f"Q{number}" for (number,) in rows]
+
+    def close(self):
+        self.conn.close()
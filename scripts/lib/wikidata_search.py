@@ -4,12 +4,34 @@ Wikidata Search & Validation Module
 
 Provides robust Q-ID lookup and validation for MediaWork entities.
 Used by both maintenance scripts and live API endpoints.
+
+Requests go through the shared rate-limited client (lib/wikidata_client.py)
+and responses are kept in a persistent HTTP cache (lib/http_cache.py); cache
+hits skip the rate limiter. Call configure_cache() before the first lookup
+to change the cache path, disable it, or run cache-only (offline).
+
+With an offline entity store (lib/wikidata_entity_store.py, built from a
+Wikidata dump) configured via configure_entity_store() or the
+WIKIDATA_ENTITY_STORE environment variable, validation, work search,
+creator search and get_entity() are answered locally; Q-IDs and searches
+the store cannot answer fall back to the network unless fallback=False.
 """
 
+import atexit
+import os
+import re
 import requests
 import difflib
-from typing import Optional, List, Dict
-import time
+from typing import Any, Iterable, Optional, List, Dict, Tuple
+
+from lib.http_cache import HttpCache
+from lib.wikidata_client import WIKIDATA_API_URL, WIKIDATA_SPARQL_URL, get_client
+from lib.wikidata_entity_store import CREATOR_PROPERTIES, EntityStore, entity_record
+
+# wbgetentities accepts at most 50 IDs per request
+MAX_IDS_PER_REQUEST = 50
+
+QID_PATTERN = re.compile(r"^Q\d+$")
 
 
 class WikidataSearchError(Exception):
@@ -17,6 +39,83 @@ class WikidataSearchError(Exception):
     pass
 
 
+_http_cache: Optional[HttpCache] = None
+
+
+def configure_cache(**kwargs) -> HttpCache:
+    """
+    Replace the module's HTTP cache (keyword arguments as for HttpCache).
+
+    Example:
+        configure_cache(cache_only=True)   # offline run from cached responses
+    """
+    global _http_cache
+    if _http_cache is not None:
+        _http_cache.close()
+    _http_cache = HttpCache(**kwargs)
+    return _http_cache
+
+
+def get_cache() -> HttpCache:
+    """The module's HTTP cache (created with defaults on first use)."""
+    global _http_cache
+    if _http_cache is None:
+        _http_cache = HttpCache()
+    return _http_cache
+
+
+@atexit.register
+def _close_cache():
+    if _http_cache is not None:
+        _http_cache.close()
+
+
+_entity_store: Optional[EntityStore] = None
+_entity_store_fallback = True
+_entity_store_checked = False
+
+
+def configure_entity_store(path: Optional[str] = None, fallback: bool = True) -> Optional[EntityStore]:
+    """
+    Answer lookups from an offline entity store (None: stop using one).
+
+    Args:
+        path: Store built by scripts/maintenance/build_wikidata_entity_store.py
+        fallback: Query Wikidata for what the store cannot answer; if False,
+            those lookups fail like network errors
+
+    Raises:
+        FileNotFoundError: If there is no store at `path`
+    """
+    global _entity_store, _entity_store_fallback, _entity_store_checked
+    if _entity_store is not None:
+        _entity_store.close()
+    _entity_store = EntityStore.open(path) if path else None
+    _entity_store_fallback = fallback
+    _entity_store_checked = True
+    return _entity_store
+
+
+def get_entity_store() -> Optional[EntityStore]:
+    """The configured entity store (from WIKIDATA_ENTITY_STORE on first use), or None."""
+    global _entity_store_checked
+    if not _entity_store_checked:
+        _entity_store_checked = True
+        if os.getenv("WIKIDATA_ENTITY_STORE"):
+            configure_entity_store(os.getenv("WIKIDATA_ENTITY_STORE"))
+    return _entity_store
+
+
+def _get_json(endpoint: str, url: str, params: Dict, headers: Dict, timeout: int) -> Any:
+    """GET a JSON response, from the cache if possible (raises requests.RequestException)."""
+    cache = get_cache()
+    data = cache.get(endpoint, url, params)
+    if data is None:
+        data = _fetch_json(url, params, headers, timeout)
+        cache.put(endpoint, url, params, data)
+    return data
+
+
 def search_wikidata_for_work(
     title: str,
     creator: Optional[str] = None,
@@ -46,6 +145,12 @@ def search_wikidata_for_work(
     if not title:
         raise ValueError("Title is required")
 
+    store = get_entity_store()
+    if store is not None:
+        best = _best_work_match(_local_work_results(store, title), title, creator, media_type)
+        if best is not None or not _entity_store_fallback:
+            return best
+
     # Build search query
     search_terms = [title]
     if creator:
@@ -57,7 +162,6 @@ def search_wikidata_for_work(
 
     try:
         # Use Wikidata search API
-        url = "https://www.wikidata.org/w/api.php"
         params = {
             "action": "wbsearchentities",
             "search": search_query,
@@ -70,83 +174,115 @@ def search_wikidata_for_work(
             "User-Agent": "Fictotum/1.0 (https://github.com/fictotum; Q-ID Validation)"
         }
 
-        response = requests.get(url, params=params, headers=headers, timeout=timeout)
-        response.raise_for_status()
-        data = response.json()
+        data = _get_json("wbsearchentities", WIKIDATA_API_URL, params, headers, timeout)
 
         if "search" not in data or len(data["search"]) == 0:
             return None
 
-        # Score each result
-        candidates = []
-        for result in data["search"]:
-            qid = result["id"]
-            result_label = result.get("label", "")
-            result_description = result.get("description", "")
-
-            # Calculate title similarity
-            similarity = difflib.SequenceMatcher(
-                None,
-                title.lower(),
-                result_label.lower()
-            ).ratio()
-
-            # Bonus points for matching creator in description
-            creator_bonus = 0
-            if creator and creator.lower() in result_description.lower():
-                creator_bonus = 0.2
-
-            # Media type filtering (if we can determine from description)
-            media_type_match = True
-            if media_type:
-                media_type_match = _matches_media_type(media_type, result_description)
-
-            score = similarity + creator_bonus
-
-            candidates.append({
-                "qid": qid,
-                "title": result_label,
-                "description": result_description,
-                "similarity": similarity,
-                "score": score,
-                "media_type_match": media_type_match
-            })
+        return _best_work_match(data["search"], title, creator, media_type)
 
-        # Filter by media type if specified
-        if media_type:
-            type_matches = [c for c in candidates if c["media_type_match"]]
-            if type_matches:
-                candidates = type_matches
+    except requests.RequestException as e:
+        raise WikidataSearchError(f"Wikidata API request failed: {e}")
 
-        # Sort by score
-        candidates.sort(key=lambda x: x["score"], reverse=True)
 
-        # Return best match if similarity is good enough
-        best = candidates[0]
+def _local_work_results(store: EntityStore, title: str) -> List[Dict]:
+    """Entity store search hits shaped like wbsearchentities results."""
+    hits = store.search(title, limit=10)
+    results = []
+    for hit in hits:
+        record = store.get(hit["qid"])
+        related = store.labels(
+            record["claims"].get("P31", []) +
+            [qid for prop in CREATOR_PROPERTIES for qid in record["claims"].get(prop, [])]
+        )
+        results.append({
+            "id": hit["qid"],
+            "label": hit["label"] or "",
+            "description": hit["description"] or "",
+            # Types and creators stand in for what the description would mention
+            "match_text": " ".join([hit["description"] or ""] + [label for label in related.values() if label])
+        })
+    return results
+
+
+def _best_work_match(
+    results: List[Dict],
+    title: str,
+    creator: Optional[str],
+    media_type: Optional[str]
+) -> Optional[Dict]:
+    """Score search results (wbsearchentities shape) and return the best confident match."""
+    if not results:
+        return None
 
-        # Confidence thresholds
-        if best["score"] >= 0.9:
-            confidence = "high"
-        elif best["score"] >= 0.7:
-            confidence = "medium"
-        else:
-            confidence = "low"
-
-        # Only return if we have reasonable confidence
-        if best["score"] >= 0.7:
-            return {
-                "qid": best["qid"],
-                "title": best["title"],
-                "description": best["description"],
-                "similarity": best["similarity"],
-                "score": best["score"],
-                "confidence": confidence
-            }
+    # Score each result
+    candidates = []
+    for result in results:
+        qid = result["id"]
+        result_label = result.get("label", "")
+        result_description = result.get("description", "")
+        match_text = result.get("match_text", result_description)
 
-        return None
+        # Calculate title similarity
+        similarity = difflib.SequenceMatcher(
+            None,
+            title.lower(),
+            result_label.lower()
+        ).ratio()
 
-    except requests.RequestException as e:
-        raise WikidataSearchError(f"Wikidata API request failed: {e}")
+        # Bonus points for matching creator in description
+        creator_bonus = 0
+        if creator and creator.lower() in match_text.lower():
+            creator_bonus = 0.2
+
+        # Media type filtering (if we can determine from description)
+        media_type_match = True
+        if media_type:
+            media_type_match = _matches_media_type(media_type, match_text)
+
+        score = similarity + creator_bonus
+
+        candidates.append({
+            "qid": qid,
+            "title": result_label,
+            "description": result_description,
+            "similarity": similarity,
+            "score": score,
+            "media_type_match": media_type_match
+        })
+
+    # Filter by media type if specified
+    if media_type:
+        type_matches = [c for c in candidates if c["media_type_match"]]
+        if type_matches:
+            candidates = type_matches
+
+    # Sort by score
+    candidates.sort(key=lambda x: x["score"], reverse=True)
+
+    # Return best match if similarity is good enough
+    best = candidates[0]
+
+    # Confidence thresholds
+    if best["score"] >= 0.9:
+        confidence = "high"
+    elif best["score"] >= 0.7:
+        confidence = "medium"
+    else:
+        confidence = "low"
+
+    # Only return if we have reasonable confidence
+    if best["score"] >= 0.7:
+        return {
+            "qid": best["qid"],
+            "title": best["title"],
+            "description": best["description"],
+            "similarity": best["similarity"],
+            "score": best["score"],
+            "confidence": confidence
+        }
+
+    return None
 
 
 def _matches_media_type(media_type: str, description: str) -> bool:
@@ -182,74 +318,208 @@ def validate_qid(qid: str, expected_title: str, timeout: int = 10) -> Dict:
         >>> validate_qid("Q161531", "War and Peace")
         {'valid': True, 'wikidata_label': 'War and Peace', 'similarity': 1.0}
     """
+    return validate_qids([(qid, expected_title)], timeout=timeout)[0]
 
-    try:
-        # Fetch entity from Wikidata
-        url = "https://www.wikidata.org/w/api.php"
-        params = {
-            "action": "wbgetentities",
-            "ids": qid,
-            "props": "labels|descriptions",
-            "languages": "en",
-            "format": "json"
-        }
-        headers = {
-            "User-Agent": "Fictotum/1.0 (https://github.com/fictotum; Q-ID Validation)"
-        }
 
-        response = requests.get(url, params=params, headers=headers, timeout=timeout)
-        response.raise_for_status()
-        data = response.json()
+def validate_qids(items: Iterable[Tuple[str, str]], timeout: int = 10) -> List[Dict]:
+    """
+    Validate many Q-IDs, fetching entities MAX_IDS_PER_REQUEST at a time
 
-        if "entities" not in data or qid not in data["entities"]:
-            return {
-                "valid": False,
-                "error": f"Q-ID {qid} not found in Wikidata"
-            }
+    Each entity is cached on its own (as a single-ID request), so later
+    validate_qid/validate_qids calls reuse it whatever the batch.
 
-        entity = data["entities"][qid]
+    Args:
+        items: (qid, expected_title) pairs; a Q-ID may appear more than once
+        timeout: Request timeout in seconds (per request)
 
-        # Check if entity exists (not deleted/missing)
-        if "missing" in entity:
-            return {
-                "valid": False,
-                "error": f"Q-ID {qid} is missing/deleted in Wikidata"
-            }
+    Returns:
+        One dict per item, in input order, shaped like validate_qid's result
 
-        # Get label
-        if "labels" not in entity or "en" not in entity["labels"]:
-            return {
-                "valid": False,
-                "error": f"Q-ID {qid} has no English label"
-            }
+    Example:
+        >>> validate_qids([("Q161531", "War and Peace"), ("Q8337", "Harry Potter")])
+        [{'valid': True, ...}, {'valid': True, ...}]
+    """
+    items = list(items)
+    entities, errors = _fetch_entities([qid for qid, _ in items], timeout)
 
-        wikidata_label = entity["labels"]["en"]["value"]
-        description = entity.get("descriptions", {}).get("en", {}).get("value", "")
+    results = []
+    for qid, expected_title in items:
+        if qid in errors:
+            results.append({"valid": False, "error": errors[qid]})
+        else:
+            results.append(_validation_result(qid, expected_title, entities.get(qid)))
+    return results
 
-        # Calculate similarity
-        similarity = difflib.SequenceMatcher(
-            None,
-            expected_title.lower(),
-            wikidata_label.lower()
-        ).ratio()
 
-        # Validation threshold: 75% similarity
-        is_valid = similarity >= 0.75
+def _entity_params(ids: List[str]) -> Dict:
+    return {
+        "action": "wbgetentities",
+        "ids": "|".join(ids),
+        "props": "labels|descriptions",
+        "languages": "en",
+        "format": "json"
+    }
+
+
+def _fetch_entities(qids: List[str], timeout: int) -> Tuple[Dict[str, Optional[Dict]], Dict[str, str]]:
+    """
+    Entities for the Q-IDs (None if Wikidata has no entity under that ID),
+    and an error message for each Q-ID that could not be fetched.
+    """
+    headers = {
+        "User-Agent": "Fictotum/1.0 (https://github.com/fictotum; Q-ID Validation)"
+    }
+    cache = get_cache()
+    store = get_entity_store()
+    entities: Dict[str, Optional[Dict]] = {}
+    errors: Dict[str, str] = {}
+
+    missing = []
+    for qid in dict.fromkeys(qids):
+        if not QID_PATTERN.match(qid or ""):
+            # One malformed ID makes wbgetentities reject the whole request
+            entities[qid] = None
+            continue
+        if store is not None:
+            record = store.get(qid)
+            if record is not None:
+                entities[qid] = _entity_from_record(record)
+                continue
+            if not _entity_store_fallback:
+                errors[qid] = f"Failed to fetch Q-ID {qid}: not in the offline entity store"
+                continue
+        try:
+            data = cache.get("wbgetentities", WIKIDATA_API_URL, _entity_params([qid]))
+        except requests.RequestException as e:
+            errors[qid] = f"Failed to fetch Q-ID {qid}: {e}"
+            continue
+        if data is None:
+            missing.append(qid)
+        else:
+            entities[qid] = data.get("entities", {}).get(qid)
+
+    for start in range(0, len(missing), MAX_IDS_PER_REQUEST):
+        chunk = missing[start:start + MAX_IDS_PER_REQUEST]
+        try:
+            data = _fetch_json(WIKIDATA_API_URL, _entity_params(chunk), headers, timeout)
+        except requests.RequestException as e:
+            for qid in chunk:
+                errors[qid] = f"Failed to fetch Q-ID {qid}: {e}"
+            continue
+
+        if "entities" not in data:
+            if len(chunk) == 1:
+                # API error for this ID; report it and keep it out of the cache
+                info = data.get("error", {}).get("info", "no entities in response")
+                errors[chunk[0]] = f"Failed to fetch Q-ID {chunk[0]}: Wikidata API error: {info}"
+                continue
+            # Request-level API error; fall back to one ID at a time
+            for qid in chunk:
+                single, single_errors = _fetch_entities([qid], timeout)
+                entities.update(single)
+                errors.update(single_errors)
+            continue
+
+        for qid in chunk:
+            entity = data.get("entities", {}).get(qid)
+            entities[qid] = entity
+            response = {"entities": {qid: entity} if entity is not None else {}}
+            cache.put("wbgetentities", WIKIDATA_API_URL, _entity_params([qid]), response)
+
+    return entities, errors
+
+
+def _entity_from_record(record: Dict) -> Dict:
+    """wbgetentities-shaped entity (labels/descriptions) for an entity store record."""
+    entity: Dict[str, Any] = {"id": record["qid"], "labels": {}, "descriptions": {}}
+    if record["label"]:
+        entity["labels"]["en"] = {"language": "en", "value": record["label"]}
+    if record["description"]:
+        entity["descriptions"]["en"] = {"language": "en", "value": record["description"]}
+    return entity
+
+
+def get_entity(qid: str, timeout: int = 10) -> Optional[Dict]:
+    """
+    Label, description, aliases, types, dates, series and creators of a Q-ID
+
+    Returns:
+        Dict shaped like lib.wikidata_entity_store.entity_record (claims as
+        Q-ID lists per property), or None if the entity does not exist
+
+    Raises:
+        WikidataSearchError: If the entity could not be fetched
+    """
+    store = get_entity_store()
+    if store is not None:
+        record = store.get(qid)
+        if record is not None or not _entity_store_fallback:
+            return record
+    if not QID_PATTERN.match(qid or ""):
+        return None
+
+    params = {
+        "action": "wbgetentities",
+        "ids": qid,
+        "props": "labels|descriptions|aliases|claims",
+        "languages": "en|la|it|fr|de|es",
+        "format": "json"
+    }
+    headers = {
+        "User-Agent": "Fictotum/1.0 (https://github.com/fictotum; Entity Lookup)"
+    }
+    try:
+        data = _get_json("wbgetentities", WIKIDATA_API_URL, params, headers, timeout)
+    except requests.RequestException as e:
+        raise WikidataSearchError(f"Wikidata API request failed: {e}")
+
+    entity = data.get("entities", {}).get(qid)
+    return entity_record(entity) if entity else None
 
+
+def _validation_result(qid: str, expected_title: str, entity: Optional[Dict]) -> Dict:
+    """validate_qid's result for one fetched entity."""
+    if entity is None:
         return {
-            "valid": is_valid,
-            "wikidata_label": wikidata_label,
-            "description": description,
-            "similarity": similarity,
-            "qid": qid
+            "valid": False,
+            "error": f"Q-ID {qid} not found in Wikidata"
         }
 
-    except requests.RequestException as e:
+    # Check if entity exists (not deleted/missing)
+    if "missing" in entity:
+        return {
+            "valid": False,
+            "error": f"Q-ID {qid} is missing/deleted in Wikidata"
+        }
+
+    # Get label
+    if "labels" not in entity or "en" not in entity["labels"]:
         return {
             "valid": False,
-            "error": f"Failed to fetch Q-ID {qid}: {e}"
+            "error": f"Q-ID {qid} has no English label"
         }
 
+    wikidata_label = entity["labels"]["en"]["value"]
+    description = entity.get("descriptions", {}).get("en", {}).get("value", "")
+
+    # Calculate similarity
+    similarity = difflib.SequenceMatcher(
+        None,
+        expected_title.lower(),
+        wikidata_label.lower()
+    ).ratio()
+
+    # Validation threshold: 75% similarity
+    is_valid = similarity >= 0.75
+
+    return {
+        "valid": is_valid,
+        "wikidata_label": wikidata_label,
+        "description": description,
+        "similarity": similarity,
+        "qid": qid
+    }
+
 
 def search_by_creator(creator_name: str, limit: int = 50, timeout: int = 10) -> List[Dict]:
     """
@@ -266,6 +536,12 @@ def search_by_creator(creator_name: str, limit: int = 50, timeout: int = 10) ->
         List of dicts with keys: qid, title, year, type
     """
 
+    store = get_entity_store()
+    if store is not None:
+        creator_qids = store.find_by_name(creator_name)
+        if creator_qids or not _entity_store_fallback:
+            return _local_works_by_creator(store, creator_qids, limit)
+
     try:
         # Use Wikidata SPARQL endpoint
         sparql_query = f"""
@@ -279,20 +555,18 @@ def search_by_creator(creator_name: str, limit: int = 50, timeout: int = 10) ->
         LIMIT {limit}
         """
 
-        url = "https://query.wikidata.org/sparql"
         headers = {
             "User-Agent": "Fictotum/1.0 (https://github.com/fictotum; Creator Search)",
             "Accept": "application/json"
         }
 
-        response = requests.get(
-            url,
-            params={"query": sparql_query, "format": "json"},
-            headers=headers,
-            timeout=timeout
+        data = _get_json(
+            "sparql",
+            WIKIDATA_SPARQL_URL,
+            {"query": sparql_query, "format": "json"},
+            headers,
+            timeout
         )
-        response.raise_for_status()
-        data = response.json()
 
         works = []
         for result in data.get("results", {}).get("bindings", []):
@@ -317,29 +591,23 @@ def search_by_creator(creator_name: str, limit: int = 50, timeout: int = 10) ->
         raise WikidataSearchError(f"Wikidata SPARQL query failed: {e}")
 
 
-# Rate limiting helper
-_last_request_time = 0
-_min_request_interval = 0.5  # 500ms between requests
-
-
-def rate_limited_request(func):
-    """Decorator to rate-limit Wikidata requests"""
-    def wrapper(*args, **kwargs):
-        global _last_request_time
-
-        # Wait if needed
-        elapsed = time.time() - _last_request_time
-        if elapsed < _min_request_interval:
-            time.sleep(_min_request_interval - elapsed)
-
-        result = func(*args, **kwargs)
-        _last_request_time = time.time()
-
-        return result
-
-    return wrapper
-
-
-# Apply rate limiting to public functions
-search_wikidata_for_work = rate_limited_request(search_wikidata_for_work)
-validate_qid = rate_limited_request(validate_qid)
+def _local_works_by_creator(store: EntityStore, creator_qids: List[str], limit: int) -> List[Dict]:
+    """search_by_creator's result from the entity store."""
+    works = []
+    for qid in store.works_by_creator(creator_qids, limit=limit):
+        record = store.get(qid)
+        types = record["claims"].get("P31", [])
+        type_label = store.labels(types[:1]).get(types[0]) if types else None
+        works.append({
+            "qid": qid,
+            "title": record["label"] or "",
+            "year": record["publication_year"],
+            "type": type_label or "literary work"
+        })
+    return works
+
+
+def _fetch_json(url: str, params: Dict, headers: Dict, timeout: int) -> Any:
+    """One GET to Wikidata through the shared rate-limited client (cache misses only)."""
+    api = "sparql" if url == WIKIDATA_SPARQL_URL else "action"
+    return get_client().request_json(api, "GET", url, params=params, headers=headers, timeout=timeout)
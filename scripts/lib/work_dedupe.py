@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+MediaWork Title Deduplication Index
+
+Finding duplicate MediaWork nodes by title used first-word CONTAINS probes at
+import time and a cartesian title join in the disambiguation audit.
+WorkDedupeIndex normalizes titles once and buckets works by media type family
+and release-year window, so fuzzy title scoring only runs between works that
+could be the same release.
+
+Title normalization (normalize_title):
+- case and accents folded, "&" read as "and", punctuation dropped
+- parentheticals removed ("Wolf Hall (novel)")
+- leading articles removed ("The", "A", "Le", "Die", ...)
+- series ordinals unified: "Book Two", "Part II", "Vol. 2nd" all become
+  "2"; installments with different numbers never match
+- the subtitle (after ":" or a dash) is split off; titles are compared in
+  full, and by main title when only one side has a subtitle
+  ("Wolf Hall: A Novel" vs "Wolf Hall")
+
+Bucketing:
+- media types are grouped into families (Book / "literary work" / novel,
+  Film / movie, TVSeries / "television series", ...); works without a type
+  are compared with every family
+- works with a release year go in bucket year // (tolerance + 1), and are
+  compared with the neighbouring buckets, so every pair within the year
+  tolerance is seen; works without a year are compared with all years
+
+Scorers are indel-ratio style similarities on a 0-1 scale (fuzz.ratio,
+token_sort_ratio or a weighted mix of them, as in BatchImporter), which can
+never exceed 2·min(len)/(len1 + len2); pairs whose lengths rule out the
+threshold are not scored.
+
+Usage:
+    index = WorkDedupeIndex(existing_works)          # dicts with title, release_year, media_type
+    for existing, score in index.matches(work, scorer, threshold=0.85):
+        ...
+    for work1, work2, score in index.duplicate_pairs(scorer, threshold=0.85):
+        ...
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+# Release years this far apart can still be the same work
+YEAR_TOLERANCE = 2
+
+ARTICLES = {"the", "a", "an", "le", "la", "les", "l", "el", "los", "las", "il", "lo", "gli", "der", "die", "das"}
+
+# Words introducing an installment number ("Book 3", "Vol. II")
+ORDINAL_MARKERS = {"book", "part", "volume", "vol", "no", "number", "episode", "chapter", "season"}
+
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+    "first": 1, "second": 2, "third": 3, "fourth": 4, "fifth": 5,
+    "sixth": 6, "seventh": 7, "eighth": 8, "ninth": 9, "tenth": 10
+}
+
+MEDIA_TYPE_FAMILIES = {
+    "book": "book", "novel": "book", "literarywork": "book", "novella": "book",
+    "bookseries": "book_series", "novelseries": "book_series", "literaryseries": "book_series",
+    "film": "film", "movie": "film", "feature": "film", "featurefilm": "film",
+    "filmseries": "film_series",
+    "tvseries": "tv", "television": "tv", "televisionseries": "tv", "tv": "tv",
+    "miniseries": "tv", "tvminiseries": "tv", "tvseriescollection": "tv",
+    "game": "game", "videogame": "game", "gameseries": "game_series",
+    "boardgame": "board_game", "boardgameseries": "board_game",
+    "play": "play", "theatre": "play", "stageplay": "play"
+}
+
+_ROMAN_RE = re.compile(r"^(x{0,3})(ix|iv|v?i{0,3})$")
+_ORDINAL_SUFFIX_RE = re.compile(r"^(\d+)(st|nd|rd|th)$")
+_PARENTHETICAL_RE = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+_SUBTITLE_RE = re.compile(r":|\s[-–—]\s")
+_NON_WORD_RE = re.compile(r"[^\w\s]|_")
+_APOSTROPHE_RE = re.compile(r"['’]")
+
+
+def _roman_to_int(token: str) -> Optional[int]:
+    if len(token) < 2 or not _ROMAN_RE.match(token):
+        return None
+    values = {"i": 1, "v": 5, "x": 10}
+    total = 0
+    for current, following in zip(token, token[1:] + " "):
+        value = values[current]
+        total += -value if following != " " and values[following] > value else value
+    return total
+
+
+def _normalize_part(text: str) -> Tuple[str, Set[str]]:
+    """Normalize one title part; returns (normalized text, installment numbers)."""
+    tokens = _NON_WORD_RE.sub(" ", _APOSTROPHE_RE.sub("", text)).split()
+    while tokens and tokens[0] in ARTICLES and len(tokens) > 1:
+        tokens = tokens[1:]
+
+    result = []
+    numbers = set()
+    for position, token in enumerate(tokens):
+        after_marker = position > 0 and tokens[position - 1] in ORDINAL_MARKERS
+        number = None
+        if token.isdigit():
+            number = int(token)
+        elif _ORDINAL_SUFFIX_RE.match(token):
+            number = int(_ORDINAL_SUFFIX_RE.match(token).group(1))
+        elif token in NUMBER_WORDS and after_marker:
+            number = NUMBER_WORDS[token]
+        elif after_marker or position == len(tokens) - 1 and position > 0:
+            # Roman numerals only where an installment number is expected
+            number = _roman_to_int(token)
+        if number is not None:
+            numbers.add(str(number))
+            token = str(number)
+            if after_marker:
+                # "Book 2" and "Part II" both reduce to the number
+                result.pop()
+        result.append(token)
+    return " ".join(result), numbers
+
+
+def normalize_title(title: str) -> Dict[str, object]:
+    """
+    Comparison keys for a title.
+
+    Returns {"full", "main", "has_subtitle", "numbers"}.
+    """
+    text = unicodedata.normalize("NFKD", title or "")
+    text = "".join(char for char in text if not unicodedata.combining(char)).lower()
+    text = _PARENTHETICAL_RE.sub(" ", text.replace("&", " and "))
+
+    parts = _SUBTITLE_RE.split(text, maxsplit=1)
+    main, numbers = _normalize_part(parts[0])
+    subtitle, subtitle_numbers = _normalize_part(parts[1]) if len(parts) > 1 else ("", set())
+    full = f"{main} {subtitle}".strip()
+
+    return {
+        "full": full,
+        "main": main or full,
+        "has_subtitle": bool(subtitle),
+        "numbers": numbers | subtitle_numbers
+    }
+
+
+def _length_bound(title1: str, title2: str) -> float:
+    """Highest indel-ratio score two strings of these lengths can reach."""
+    total = len(title1) + len(title2)
+    return 2 * min(len(title1), len(title2)) / total if total else 1.0
+
+
+def media_type_family(media_type: Optional[str]) -> Optional[str]:
+    """Family of a media_type value; None if unknown/missing (compared with every family)."""
+    if not media_type:
+        return None
+    key = re.sub(r"[^a-z]", "", str(media_type).lower())
+    return MEDIA_TYPE_FAMILIES.get(key, key or None)
+
+
+class WorkDedupeIndex:
+    """Existing works bucketed by media type family and release-year window."""
+
+    def __init__(self, works: List[Dict] = (), year_tolerance: int = YEAR_TOLERANCE):
+        """
+        Args:
+            works: Dicts with title, release_year and media_type (other keys are kept)
+            year_tolerance: Release years further apart than this never match
+        """
+        self.year_tolerance = year_tolerance
+        self._width = year_tolerance + 1
+        self.works: List[Dict] = []
+        self._keys: List[Dict[str, object]] = []
+        # family -> year bucket (None = unknown year) -> positions
+        self._buckets: Dict[Optional[str], Dict[Optional[int], List[int]]] = defaultdict(lambda: defaultdict(list))
+        for work in works:
+            self.add(work)
+
+    def add(self, work: Dict):
+        """Index one more work (e.g. after importing it)."""
+        position = len(self.works)
+        self.works.append(work)
+        self._keys.append(normalize_title(work.get("title")))
+        self._buckets[media_type_family(work.get("media_type"))][self._bucket(work.get("release_year"))].append(position)
+
+    def _bucket(self, year) -> Optional[int]:
+        return year // self._width if isinstance(year, int) else None
+
+    def _candidate_positions(self, release_year, media_type) -> Iterator[int]:
+        family = media_type_family(media_type)
+        families = list(self._buckets) if family is None else [family, None]
+        bucket = self._bucket(release_year)
+
+        for name in families:
+            by_year = self._buckets.get(name)
+            if not by_year:
+                continue
+            if bucket is None:
+                years = list(by_year)
+            else:
+                years = [bucket - 1, bucket, bucket + 1, None]
+            for year in years:
+                yield from by_year.get(year, ())
+
+    def score(
+        self,
+        keys1: Dict[str, object],
+        keys2: Dict[str, object],
+        scorer: Callable[[str, str], float],
+        threshold: float = 0.0
+    ) -> float:
+        """
+        Title similarity of two normalized titles (0 for different installments).
+
+        Comparisons whose length difference alone keeps them below `threshold`
+        are skipped (returning 0).
+        """
+        if keys1["numbers"] and keys2["numbers"] and keys1["numbers"] != keys2["numbers"]:
+            return 0.0
+        if not keys1["full"] or not keys2["full"]:
+            return 0.0
+
+        comparisons = [(keys1["full"], keys2["full"])]
+        if keys1["has_subtitle"] != keys2["has_subtitle"]:
+            comparisons.append((keys1["main"], keys2["main"]))
+
+        similarity = 0.0
+        for title1, title2 in comparisons:
+            if _length_bound(title1, title2) >= threshold:
+                similarity = max(similarity, scorer(title1, title2))
+        return similarity
+
+    def _years_compatible(self, year1, year2) -> bool:
+        if isinstance(year1, int) and isinstance(year2, int):
+            return abs(year1 - year2) <= self.year_tolerance
+        return True
+
+    def matches(
+        self,
+        work: Dict,
+        scorer: Callable[[str, str], float],
+        threshold: float
+    ) -> List[Tuple[Dict, float]]:
+        """Indexed works scoring >= threshold against `work`, best first."""
+        keys = normalize_title(work.get("title"))
+        release_year = work.get("release_year")
+
+        found = []
+        for position in set(self._candidate_positions(release_year, work.get("media_type"))):
+            other = self.works[position]
+            if other is work or not self._years_compatible(release_year, other.get("release_year")):
+                continue
+            similarity = self.score(keys, self._keys[position], scorer, threshold)
+            if similarity >= threshold:
+                found.append((position, similarity))
+
+        found.sort(key=lambda item: (-item[1], item[0]))
+        return [(self.works[position], similarity) for position, similarity in found]
+
+    def duplicate_pairs(
+        self,
+        scorer: Callable[[str, str], float],
+        threshold: float
+    ) -> Iterator[Tuple[Dict, Dict, float]]:
+        """Every pair of indexed works scoring >= threshold, each pair once (in index order)."""
+        for position, work in enumerate(self.works):
+            candidates = sorted(set(self._candidate_positions(work.get("release_year"), work.get("media_type"))))
+            for other_position in candidates:
+                if other_position <= position:
+                    continue
+                other = self.works[other_position]
+                if not self._years_compatible(work.get("release_year"), other.get("release_year")):
+                    continue
+                similarity = self.score(self._keys[position], self._keys[other_position], scorer, threshold)
+                if similarity >= threshold:
+                    yield work, other, similarity
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Build the Offline Wikidata Entity Store
+
+Streams a Wikidata JSON dump (https://dumps.wikimedia.org/wikidatawiki/entities/
+latest-all.json.gz or .bz2) or a filtered extract (one entity JSON per line)
+and writes the compact, indexed store read by lib/wikidata_entity_store.py.
+Only items whose P31 is one of the kept types (humans and the work types we
+ingest, by default) are stored, with just the labels, aliases, types, dates,
+series and creators the scripts use.
+
+Usage:
+    python3 scripts/maintenance/build_wikidata_entity_store.py DUMP [options]
+
+Options:
+    --output PATH        Store file (default: data/.ingestion-cache/wikidata_entities.sqlite)
+    --types Q5,Q11424    P31 values to keep (default: DEFAULT_TYPES)
+    --all-types          Keep every item, whatever its type
+    --qids-file PATH     Also keep these Q-IDs (one per line), whatever their type
+    --limit N            Stop after N dump lines (for trying it out)
+
+Use the store with WIKIDATA_ENTITY_STORE=<path> (read by lib/wikidata_search)
+or batch_import.py --wikidata-entity-store <path>.
+"""
+
+import argparse
+import bz2
+import gzip
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib.wikidata_entity_store import DEFAULT_STORE_PATH, EntityStore, entity_record
+
+# P31 values kept by default
+DEFAULT_TYPES = {
+    "Q5",          # human
+    "Q15632617",   # fictional human
+    "Q7725634",    # literary work
+    "Q47461344",   # written work
+    "Q8261",       # novel
+    "Q277759",     # book series
+    "Q11424",      # film
+    "Q24856",      # film series
+    "Q5398426",    # television series
+    "Q1259759",    # miniseries
+    "Q7889",       # video game
+    "Q7058673",    # video game series
+    "Q25379",      # play
+}
+
+INSERT_BATCH = 10_000
+
+
+def open_dump(path: Path):
+    """Text stream over a plain, gzip or bz2 dump."""
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    if path.suffix == ".bz2":
+        return bz2.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def iter_entities(stream):
+    """Entities of a dump (a JSON array with one entity per line) or an NDJSON extract."""
+    for line in stream:
+        line = line.strip().rstrip(",")
+        if not line or line in ("[", "]"):
+            continue
+        yield json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the offline Wikidata entity store from a dump")
+    parser.add_argument("dump", help="Wikidata JSON dump (.json/.json.gz/.json.bz2) or NDJSON extract")
+    parser.add_argument("--output", default=str(DEFAULT_STORE_PATH), help=f"Store file (default: {DEFAULT_STORE_PATH})")
+    parser.add_argument("--types", help="Comma-separated P31 Q-IDs to keep (default: humans and work types)")
+    parser.add_argument("--all-types", action="store_true", help="Keep every item")
+    parser.add_argument("--qids-file", help="File of extra Q-IDs to keep (one per line)")
+    parser.add_argument("--limit", type=int, help="Stop after N dump lines")
+    args = parser.parse_args()
+
+    dump_path = Path(args.dump)
+    if not dump_path.exists():
+        print(f"❌ Error: File not found: {dump_path}")
+        sys.exit(1)
+
+    types = set(args.types.split(",")) if args.types else DEFAULT_TYPES
+    extra_qids = set()
+    if args.qids_file:
+        with open(args.qids_file, "r") as f:
+            extra_qids = {line.strip() for line in f if line.strip()}
+
+    print("=" * 70)
+    print("Wikidata Entity Store Build")
+    print("=" * 70)
+    print(f"Dump:   {dump_path}")
+    print(f"Output: {args.output}")
+    print(f"Types:  {'all' if args.all_types else ', '.join(sorted(types))}")
+    if extra_qids:
+        print(f"Extra Q-IDs: {len(extra_qids)}")
+    print()
+
+    started = time.time()
+    store = EntityStore.create(Path(args.output))
+    scanned = kept = 0
+    batch = []
+    with open_dump(dump_path) as stream:
+        for entity in iter_entities(stream):
+            scanned += 1
+            record = entity_record(entity)
+            if record is not None and (
+                args.all_types
+                or record["qid"] in extra_qids
+                or types.intersection(record["claims"].get("P31", []))
+            ):
+                batch.append(record)
+            if len(batch) >= INSERT_BATCH:
+                kept += store.add_many(batch)
+                batch = []
+            if scanned % 100_000 == 0:
+                print(f"  {scanned:,} entities scanned, {kept + len(batch):,} kept "
+                      f"({scanned / (time.time() - started):,.0f}/s)")
+            if args.limit and scanned >= args.limit:
+                break
+    kept += store.add_many(batch)
+
+    print("\n🔧 Building indexes...")
+    store.finish({
+        "source": dump_path.name,
+        "built_at": datetime.now().isoformat(),
+        "entities": kept,
+        "types": "all" if args.all_types else ",".join(sorted(types))
+    })
+
+    size_mb = Path(args.output).stat().st_size / 1e6
+    print(f"✅ Stored {kept:,} of {scanned:,} entities in {args.output} "
+          f"({size_mb:.1f} MB, {time.time() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,9 +19,9 @@ import argparse
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
 
-# Add lib directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
-from wikidata_search import search_wikidata_for_work, validate_qid
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from lib.wikidata_search import search_wikidata_for_work, validate_qid
 
 # Load environment variables
 load_dotenv()
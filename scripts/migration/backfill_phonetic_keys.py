@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Migration Script: Backfill Phonetic Keys
+
+Computes Double Metaphone keys (scripts/lib/phonetic_keys.py) for existing
+HistoricalFigure and FictionalCharacter nodes and stores them as indexed
+properties, so duplicate checks can look up sound-alike names by index seek.
+Importers set the keys at write time; this covers nodes written before that.
+
+Schema Changes:
+- HistoricalFigure, FictionalCharacter: Add phonetic_key, phonetic_key_alt,
+  phonetic_first, phonetic_last (STRING), each with a range index
+
+Migration Strategy:
+1. Create the phonetic key indexes (IF NOT EXISTS)
+2. Page through nodes in ID order, BATCH_SIZE at a time
+3. Compute keys client-side and write each page with one UNWIND
+
+Usage:
+    python3 backfill_phonetic_keys.py [--dry-run] [--force] [--batch-size N]
+
+Options:
+    --dry-run       Count nodes that would be updated without writing
+    --force         Recompute keys for every node (e.g. after an encoder change)
+    --batch-size N  Nodes per read/write page (default: 1000)
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from neo4j import GraphDatabase
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from schema import SCHEMA_CONSTRAINTS
+from lib.phonetic_keys import METAPHONE_AVAILABLE, PHONETIC_LABELS, phonetic_keys
+
+# Load environment variables from .env file
+load_dotenv()
+
+NEO4J_URI = os.getenv('NEO4J_URI')
+NEO4J_USERNAME = os.getenv('NEO4J_USERNAME', 'neo4j')
+NEO4J_PASSWORD = os.getenv('NEO4J_PASSWORD')
+
+BATCH_SIZE = 1000
+
+
+def create_indexes(driver):
+    """Create the phonetic key indexes from schema.py."""
+    with driver.session() as session:
+        for statement in SCHEMA_CONSTRAINTS.split(';'):
+            lines = [line for line in statement.strip().splitlines() if not line.startswith('//')]
+            statement = "\n".join(lines).strip()
+            if statement and 'phonetic' in statement:
+                session.run(statement).consume()
+    print("✅ Phonetic key indexes in place")
+
+
+def backfill_label(driver, label: str, id_property: str, batch_size: int, dry_run: bool, force: bool) -> int:
+    """
+    Backfill phonetic keys for one label, paging by ID.
+
+    Returns:
+        Number of nodes updated (or that would be updated)
+    """
+    read_query = f"""
+    MATCH (n:{label})
+    WHERE n.{id_property} > $after AND n.name IS NOT NULL
+      AND ($force OR n.phonetic_key IS NULL)
+    RETURN n.{id_property} AS id, n.name AS name
+    ORDER BY n.{id_property}
+    LIMIT $limit
+    """
+    write_query = f"""
+    UNWIND $rows AS row
+    MATCH (n:{label} {{{id_property}: row.id}})
+    SET n += row.keys
+    """
+
+    updated = 0
+    after = ""
+    with driver.session() as session:
+        while True:
+            page = list(session.run(read_query, after=after, force=force, limit=batch_size))
+            if not page:
+                break
+            after = page[-1]["id"]
+
+            rows = [{"id": record["id"], "keys": phonetic_keys(record["name"])} for record in page]
+            if not dry_run:
+                session.execute_write(lambda tx: tx.run(write_query, rows=rows).consume())
+            updated += len(rows)
+            print(f"  {label}: {updated} nodes {'to update' if dry_run else 'updated'}...")
+
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill phonetic keys on HistoricalFigure/FictionalCharacter")
+    parser.add_argument("--dry-run", action="store_true", help="Count nodes without writing")
+    parser.add_argument("--force", action="store_true", help="Recompute keys for every node")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help=f"Nodes per page (default: {BATCH_SIZE})")
+    args = parser.parse_args()
+
+    if not all([NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD]):
+        print("❌ Error: Missing Neo4j credentials in .env file")
+        print("   Required: NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD")
+        sys.exit(1)
+
+    if not METAPHONE_AVAILABLE:
+        print("❌ Error: Metaphone is not installed (pip install Metaphone)")
+        sys.exit(1)
+
+    print("=" * 70)
+    print("Phonetic Keys Backfill Migration")
+    print("=" * 70)
+    if args.dry_run:
+        print("\n🔍 DRY RUN MODE - No changes will be made\n")
+
+    try:
+        driver = GraphDatabase.driver(
+            NEO4J_URI,
+            auth=(NEO4J_USERNAME, NEO4J_PASSWORD)
+        )
+        driver.verify_connectivity()
+        print("✅ Connected to Neo4j")
+
+        if not args.dry_run:
+            create_indexes(driver)
+
+        totals = {}
+        for label, id_property in PHONETIC_LABELS.items():
+            print(f"\n📥 Backfilling {label}...")
+            totals[label] = backfill_label(driver, label, id_property, args.batch_size, args.dry_run, args.force)
+
+        print("\n" + "=" * 70)
+        for label, count in totals.items():
+            print(f"{'Would update' if args.dry_run else 'Updated'} {count} {label} nodes")
+        print("=" * 70)
+
+        driver.close()
+
+    except Exception as e:
+        print(f"\n❌ Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -10,12 +10,13 @@ Checks all MediaWork nodes with wikidata_id properties and validates that:
 
 import os
 import sys
-import time
-import difflib
-import requests
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
-from typing import Dict, List, Tuple
+from typing import List, Tuple
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from lib.wikidata_search import validate_qids
 
 # Load environment variables
 load_dotenv()
@@ -25,50 +26,6 @@ password = os.getenv('NEO4J_PASSWORD')
 
 driver = GraphDatabase.driver(uri, auth=(username, password))
 
-def fetch_wikidata_label(qid: str) -> str | None:
-    """Fetch English label for a Wikidata Q-ID"""
-    try:
-        # Use the Wikidata API with proper headers
-        url = f'https://www.wikidata.org/w/api.php'
-        params = {
-            'action': 'wbgetentities',
-            'ids': qid,
-            'props': 'labels',
-            'languages': 'en',
-            'format': 'json'
-        }
-        headers = {
-            'User-Agent': 'Fictotum/1.0 (https://github.com/gcquraishi/fictotum; Data Quality Audit)'
-        }
-
-        response = requests.get(url, params=params, headers=headers, timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
-
-        if 'entities' not in data or qid not in data['entities']:
-            return None
-
-        entity = data['entities'][qid]
-
-        # Check if entity was found (not missing)
-        if 'missing' in entity:
-            return None
-
-        # Try English label
-        if 'labels' in entity and 'en' in entity['labels']:
-            return entity['labels']['en']['value']
-
-        return None
-
-    except Exception as e:
-        print(f"    Error fetching {qid}: {e}", file=sys.stderr)
-        return None
-
-def calculate_similarity(str1: str, str2: str) -> float:
-    """Calculate similarity ratio between two strings (0-1)"""
-    return difflib.SequenceMatcher(None, str1.lower(), str2.lower()).ratio()
-
 def audit_media_works():
     """Audit all MediaWork nodes with wikidata_ids"""
 
@@ -105,7 +62,11 @@ def audit_media_works():
         error_count = 0
         suspicious_works: List[Tuple[str, str, str, str, float]] = []
 
-        for i, record in enumerate(records, 1):
+        # Labels are fetched in bulk (50 Q-IDs per request, cached on disk)
+        print("Fetching Wikidata labels...\n")
+        validations = validate_qids((record['wikidata_id'], record['title'] or "") for record in records)
+
+        for i, (record, validation) in enumerate(zip(records, validations), 1):
             media_id = record['media_id']
             db_title = record['title']
             qid = record['wikidata_id']
@@ -114,15 +75,14 @@ def audit_media_works():
 
             print(f"[{i}/{total}] Checking {db_title} ({qid})...", end=' ')
 
-            # Fetch Wikidata label
-            wikidata_label = fetch_wikidata_label(qid)
+            wikidata_label = validation.get('wikidata_label')
 
             if wikidata_label is None:
-                print(f"❌ ERROR: Q-ID not found in Wikidata")
+                print(f"❌ ERROR: {validation.get('error', 'Q-ID not found in Wikidata')}")
                 error_count += 1
                 suspicious_works.append((media_id, db_title, qid, "Q-ID not found", 0.0))
             else:
-                similarity = calculate_similarity(db_title, wikidata_label)
+                similarity = validation['similarity']
 
                 if similarity >= 0.8:  # 80% similarity threshold
                     print(f"✅ OK (similarity: {similarity:.2%})")
@@ -134,10 +94,6 @@ def audit_media_works():
                     suspicious_count += 1
                     suspicious_works.append((media_id, db_title, qid, wikidata_label, similarity))
 
-            # Rate limiting - be nice to Wikidata servers
-            if i < total:
-                time.sleep(0.5)
-
         print()
         print("="*80)
         print("AUDIT SUMMARY")
@@ -15,7 +15,6 @@ Usage:
 
 import os
 import sys
-import requests
 import re
 from datetime import datetime
 from pathlib import Path
@@ -25,6 +24,7 @@ from typing import Optional, List, Dict, Tuple
 sys.path.append(str(Path(__file__).parent.parent))
 
 from neo4j import GraphDatabase
+from lib.wikidata_client import get_client
 
 # Neo4j connection
 NEO4J_URI = os.getenv("NEO4J_URI")
@@ -33,22 +33,18 @@ NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 
 def get_wikidata_entity(qid: str) -> dict:
     """Fetch entity data from Wikidata API"""
-    url = "https://www.wikidata.org/w/api.php"
     params = {
         "action": "wbgetentities",
         "ids": qid,
         "props": "labels|descriptions|claims",
-        "languages": "en",
-        "format": "json"
+        "languages": "en"
     }
     headers = {
         "User-Agent": "Fictotum/1.0 (CHR-79 Series Linking)"
     }
 
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = get_client().action_api(params, headers=headers, timeout=10)
 
         if "entities" in data and qid in data["entities"]:
             entity = data["entities"][qid]
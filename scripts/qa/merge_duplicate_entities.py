@@ -12,28 +12,42 @@ Strategy:
 4. Delete duplicate nodes
 5. Log all merge operations for audit trail
 
+Steps 2-4 run for many (primary, duplicate) pairs at once: each batch of
+MERGE_BATCH_SIZE pairs is one write transaction of UNWIND statements, so a
+cleanup of thousands of duplicates takes a handful of transactions.
+
 Author: Claude Code (Data Architect)
 Date: 2026-01-18
 """
 
 import os
 import sys
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
 
+# Duplicate nodes merged per write transaction
+MERGE_BATCH_SIZE = 500
+
 
 class EntityMerger:
     """Merges duplicate entities in Fictotum database."""
 
-    def __init__(self, uri: str, user: str, pwd: str, dry_run: bool = True):
-        """Initialize Neo4j connection."""
+    def __init__(self, uri: str, user: str, pwd: str, dry_run: bool = True, batch_size: int = MERGE_BATCH_SIZE):
+        """
+        Initialize Neo4j connection.
+
+        Args:
+            batch_size: Duplicate nodes merged per write transaction
+        """
         if uri.startswith("neo4j+s://"):
             uri = uri.replace("neo4j+s://", "neo4j+ssc://")
         self.driver = GraphDatabase.driver(uri, auth=(user, pwd))
         self.dry_run = dry_run
+        self.batch_size = batch_size
         self.merge_log: List[Dict[str, Any]] = []
 
     def close(self):
@@ -68,6 +82,7 @@ class EntityMerger:
 
             print(f"\n🔍 Found {len(duplicates)} Q-IDs with duplicate nodes.")
 
+            merges = []
             for dup_record in duplicates:
                 qid = dup_record["qid"]
                 figures = dup_record["figures"]
@@ -83,127 +98,163 @@ class EntityMerger:
                 print(f"   Duplicates: {duplicate_ids}")
 
                 for dup_id in duplicate_ids:
-                    self._merge_figure_nodes(session, primary_id, dup_id, qid)
+                    merges.append({"primary": primary_id, "duplicate": dup_id, "qid": qid})
+
+            self._merge_figure_nodes(session, merges)
+
+    def _merge_figure_nodes(self, session, merges: List[Dict[str, str]]):
+        """
+        Merge duplicate HistoricalFigure nodes into their primaries.
+
+        `merges` is a list of {"primary", "duplicate", "qid"}. Chains (a
+        primary that is itself merged away by another entry) are resolved to
+        the final primary first. Pairs are then merged batch_size at a time,
+        each batch in one write transaction of UNWIND statements, and every
+        pair gets its own merge_log entry.
+        """
+        merges = self._resolve_merge_chains(merges)
+        if not merges:
+            return
 
-    def _merge_figure_nodes(self, session, primary_id: str, duplicate_id: str, qid: str):
-        """Merge a duplicate HistoricalFigure node into the primary node."""
-        print(f"\n   🔀 Merging: {duplicate_id} → {primary_id}")
+        batches = [merges[i:i + self.batch_size] for i in range(0, len(merges), self.batch_size)]
+        print(f"\n   🔀 Merging {len(merges)} duplicates in {len(batches)} transaction(s)")
 
         if self.dry_run:
             print("      [DRY RUN] Would redirect all APPEARS_IN relationships")
             print("      [DRY RUN] Would redirect all outgoing relationships")
-            print("      [DRY RUN] Would delete duplicate node")
-            self.merge_log.append({
-                "type": "HistoricalFigure",
-                "primary": primary_id,
-                "duplicate": duplicate_id,
-                "qid": qid,
-                "status": "DRY_RUN"
-            })
+            print("      [DRY RUN] Would delete duplicate nodes")
+            for merge in merges:
+                self.merge_log.append({
+                    "type": "HistoricalFigure",
+                    "primary": merge["primary"],
+                    "duplicate": merge["duplicate"],
+                    "qid": merge["qid"],
+                    "status": "DRY_RUN"
+                })
             return
 
-        try:
-            # Step 1: Redirect APPEARS_IN relationships (figure → media)
-            query_redirect_appears_in = """
-            MATCH (dup:HistoricalFigure {canonical_id: $dup_id})-[r:APPEARS_IN]->(m:MediaWork)
-            MATCH (primary:HistoricalFigure {canonical_id: $primary_id})
-            MERGE (primary)-[new_r:APPEARS_IN]->(m)
-            ON CREATE SET new_r = properties(r)
-            DELETE r
-            RETURN COUNT(*) AS redirected_count
-            """
-            result = session.run(query_redirect_appears_in, dup_id=duplicate_id, primary_id=primary_id)
-            redirected = result.single()["redirected_count"]
-            print(f"      ✅ Redirected {redirected} APPEARS_IN relationships")
-
-            # Step 2: Redirect other relationships (INTERACTED_WITH, etc.)
-            query_redirect_outgoing = """
-            MATCH (dup:HistoricalFigure {canonical_id: $dup_id})-[r]->(target)
-            WHERE NOT type(r) = 'APPEARS_IN'
-            MATCH (primary:HistoricalFigure {canonical_id: $primary_id})
-            WITH dup, r, target, primary, type(r) AS rel_type, properties(r) AS rel_props
-            CALL apoc.create.relationship(primary, rel_type, rel_props, target) YIELD rel AS new_r
-            DELETE r
-            RETURN COUNT(*) AS redirected_count
-            """
-            # Since APOC may not be available, use simpler approach
-            query_redirect_simple = """
-            MATCH (dup:HistoricalFigure {canonical_id: $dup_id})-[r:INTERACTED_WITH]->(target)
-            MATCH (primary:HistoricalFigure {canonical_id: $primary_id})
-            MERGE (primary)-[new_r:INTERACTED_WITH]->(target)
-            ON CREATE SET new_r = properties(r)
-            DELETE r
-            RETURN COUNT(*) AS redirected_count
-            """
-            result = session.run(query_redirect_simple, dup_id=duplicate_id, primary_id=primary_id)
-            redirected_other = result.single()["redirected_count"]
-            if redirected_other > 0:
-                print(f"      ✅ Redirected {redirected_other} other relationships")
-
-            # Step 3: Redirect incoming relationships
-            query_redirect_incoming = """
-            MATCH (source)-[r]->(dup:HistoricalFigure {canonical_id: $dup_id})
-            MATCH (primary:HistoricalFigure {canonical_id: $primary_id})
-            MERGE (source)-[new_r:INTERACTED_WITH]->(primary)
-            ON CREATE SET new_r = properties(r)
-            DELETE r
-            RETURN COUNT(*) AS redirected_count
-            """
-            result = session.run(query_redirect_incoming, dup_id=duplicate_id, primary_id=primary_id)
-            redirected_in = result.single()["redirected_count"]
-            if redirected_in > 0:
-                print(f"      ✅ Redirected {redirected_in} incoming relationships")
-
-            # Step 4: Merge properties (if duplicate has any unique data)
-            query_merge_props = """
-            MATCH (dup:HistoricalFigure {canonical_id: $dup_id})
-            MATCH (primary:HistoricalFigure {canonical_id: $primary_id})
-            SET primary = CASE
-                WHEN primary.birth_year IS NULL AND dup.birth_year IS NOT NULL
-                THEN primary {.*, birth_year: dup.birth_year}
-                ELSE primary
-            END
-            SET primary = CASE
-                WHEN primary.death_year IS NULL AND dup.death_year IS NOT NULL
-                THEN primary {.*, death_year: dup.death_year}
-                ELSE primary
-            END
-            SET primary = CASE
-                WHEN primary.title IS NULL AND dup.title IS NOT NULL
-                THEN primary {.*, title: dup.title}
-                ELSE primary
-            END
-            RETURN primary.canonical_id AS merged_id
-            """
-            session.run(query_merge_props, dup_id=duplicate_id, primary_id=primary_id)
-            print(f"      ✅ Merged properties into primary node")
-
-            # Step 5: Delete duplicate node
-            query_delete = """
-            MATCH (dup:HistoricalFigure {canonical_id: $dup_id})
-            DETACH DELETE dup
-            """
-            session.run(query_delete, dup_id=duplicate_id)
-            print(f"      ✅ Deleted duplicate node: {duplicate_id}")
-
-            self.merge_log.append({
-                "type": "HistoricalFigure",
-                "primary": primary_id,
-                "duplicate": duplicate_id,
-                "qid": qid,
-                "status": "MERGED"
-            })
-
-        except Exception as e:
-            print(f"      ❌ ERROR: {e}")
-            self.merge_log.append({
-                "type": "HistoricalFigure",
-                "primary": primary_id,
-                "duplicate": duplicate_id,
-                "qid": qid,
-                "status": "FAILED",
-                "error": str(e)
-            })
+        for number, batch in enumerate(batches, 1):
+            try:
+                counts = session.execute_write(self._merge_figure_batch, batch)
+            except Exception as e:
+                # The transaction rolled back: none of the batch was merged
+                print(f"      ❌ ERROR in batch {number}/{len(batches)}: {e}")
+                for merge in batch:
+                    self.merge_log.append({
+                        "type": "HistoricalFigure",
+                        "primary": merge["primary"],
+                        "duplicate": merge["duplicate"],
+                        "qid": merge["qid"],
+                        "status": "FAILED",
+                        "error": str(e)
+                    })
+                continue
+
+            for merge in batch:
+                self.merge_log.append({
+                    "type": "HistoricalFigure",
+                    "primary": merge["primary"],
+                    "duplicate": merge["duplicate"],
+                    "qid": merge["qid"],
+                    "status": "MERGED",
+                    "redirected": {step: step_counts.get(merge["duplicate"], 0) for step, step_counts in counts.items()}
+                })
+
+            totals = {step: sum(step_counts.values()) for step, step_counts in counts.items()}
+            print(f"      ✅ Batch {number}/{len(batches)}: merged {len(batch)} duplicates "
+                  f"({totals['appears_in']} APPEARS_IN, {totals['outgoing']} other, "
+                  f"{totals['incoming']} incoming relationships redirected)")
+
+    @staticmethod
+    def _resolve_merge_chains(merges: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Point every merge at its final primary and drop repeated or self merges."""
+        target = {}
+        resolved = []
+        for merge in merges:
+            primary = merge["primary"]
+            while primary in target:
+                primary = target[primary]
+            duplicate = merge["duplicate"]
+            if duplicate == primary or duplicate in target:
+                continue
+            target[duplicate] = primary
+            resolved.append(dict(merge, primary=primary))
+
+        # A duplicate merged away later may already be another entry's primary
+        for merge in resolved:
+            while merge["primary"] in target:
+                merge["primary"] = target[merge["primary"]]
+        return resolved
+
+    @staticmethod
+    def _merge_figure_batch(tx, batch: List[Dict[str, str]]) -> Dict[str, Dict[str, int]]:
+        """Redirect, merge properties and delete for one batch; returns {step: {duplicate: count}}."""
+        pairs = [{"primary": merge["primary"], "duplicate": merge["duplicate"]} for merge in batch]
+        counts = {}
+
+        # Step 1: Redirect APPEARS_IN relationships (figure → media)
+        query_redirect_appears_in = """
+        UNWIND $pairs AS pair
+        MATCH (dup:HistoricalFigure {canonical_id: pair.duplicate})-[r:APPEARS_IN]->(m:MediaWork)
+        MATCH (primary:HistoricalFigure {canonical_id: pair.primary})
+        MERGE (primary)-[new_r:APPEARS_IN]->(m)
+        ON CREATE SET new_r = properties(r)
+        DELETE r
+        RETURN pair.duplicate AS duplicate, COUNT(*) AS redirected_count
+        """
+
+        # Step 2: Redirect other relationships (INTERACTED_WITH; APOC may not be available)
+        query_redirect_outgoing = """
+        UNWIND $pairs AS pair
+        MATCH (dup:HistoricalFigure {canonical_id: pair.duplicate})-[r:INTERACTED_WITH]->(target)
+        MATCH (primary:HistoricalFigure {canonical_id: pair.primary})
+        MERGE (primary)-[new_r:INTERACTED_WITH]->(target)
+        ON CREATE SET new_r = properties(r)
+        DELETE r
+        RETURN pair.duplicate AS duplicate, COUNT(*) AS redirected_count
+        """
+
+        # Step 3: Redirect incoming relationships
+        query_redirect_incoming = """
+        UNWIND $pairs AS pair
+        MATCH (source)-[r]->(dup:HistoricalFigure {canonical_id: pair.duplicate})
+        MATCH (primary:HistoricalFigure {canonical_id: pair.primary})
+        MERGE (source)-[new_r:INTERACTED_WITH]->(primary)
+        ON CREATE SET new_r = properties(r)
+        DELETE r
+        RETURN pair.duplicate AS duplicate, COUNT(*) AS redirected_count
+        """
+
+        for step, query in (
+            ("appears_in", query_redirect_appears_in),
+            ("outgoing", query_redirect_outgoing),
+            ("incoming", query_redirect_incoming)
+        ):
+            counts[step] = {
+                record["duplicate"]: record["redirected_count"]
+                for record in tx.run(query, pairs=pairs)
+            }
+
+        # Step 4: Merge properties (if duplicate has any unique data; earlier pairs win)
+        query_merge_props = """
+        UNWIND $pairs AS pair
+        MATCH (dup:HistoricalFigure {canonical_id: pair.duplicate})
+        MATCH (primary:HistoricalFigure {canonical_id: pair.primary})
+        SET primary.birth_year = coalesce(primary.birth_year, dup.birth_year),
+            primary.death_year = coalesce(primary.death_year, dup.death_year),
+            primary.title = coalesce(primary.title, dup.title)
+        """
+        tx.run(query_merge_props, pairs=pairs).consume()
+
+        # Step 5: Delete duplicate nodes
+        query_delete = """
+        UNWIND $pairs AS pair
+        MATCH (dup:HistoricalFigure {canonical_id: pair.duplicate})
+        DETACH DELETE dup
+        """
+        tx.run(query_delete, pairs=pairs).consume()
+
+        return counts
 
     def merge_duplicate_figure_names(self):
         """Merge HistoricalFigure nodes with identical names (likely duplicates)."""
@@ -212,23 +263,8 @@ class EntityMerger:
         print("=" * 80)
 
         with self.driver.session() as session:
-            # Find figures with same name where one has Q-ID and one doesn't
-            query_find = """
-            MATCH (f1:HistoricalFigure)
-            MATCH (f2:HistoricalFigure)
-            WHERE f1.canonical_id < f2.canonical_id
-              AND toLower(f1.name) = toLower(f2.name)
-              AND (
-                  (f1.wikidata_id IS NOT NULL AND NOT f1.wikidata_id STARTS WITH 'PROV:')
-                  OR (f2.wikidata_id IS NOT NULL AND NOT f2.wikidata_id STARTS WITH 'PROV:')
-              )
-            RETURN f1.canonical_id AS id1, f1.name AS name1, f1.wikidata_id AS qid1,
-                   f2.canonical_id AS id2, f2.name AS name2, f2.wikidata_id AS qid2
-            ORDER BY f1.name
-            """
-
-            result = session.run(query_find)
-            duplicates = list(result)
+            duplicates = self._find_identical_name_pairs(session)
+            merges = []
 
             if not duplicates:
                 print("✅ No name-based duplicates requiring merge.")
@@ -268,7 +304,48 @@ class EntityMerger:
                 print(f"   Primary: {primary_id} [{qid}]")
                 print(f"   Duplicate: {duplicate_id}")
 
-                self._merge_figure_nodes(session, primary_id, duplicate_id, qid or "NO_QID")
+                merges.append({"primary": primary_id, "duplicate": duplicate_id, "qid": qid or "NO_QID"})
+
+            self._merge_figure_nodes(session, merges)
+
+    def _find_identical_name_pairs(self, session) -> List[Dict[str, Any]]:
+        """
+        Pairs of figures with the same (case-insensitive) name where at least
+        one has a real Q-ID, ordered by name.
+
+        Figures are grouped by lowercased name client-side in one pass instead
+        of a MATCH (f1), (f2) cartesian product in Cypher.
+        """
+        query_fetch = """
+        MATCH (f:HistoricalFigure)
+        WHERE f.name IS NOT NULL AND f.canonical_id IS NOT NULL
+        RETURN f.canonical_id AS canonical_id, f.name AS name, f.wikidata_id AS qid
+        """
+        by_name = defaultdict(list)
+        for record in session.run(query_fetch):
+            by_name[record["name"].lower()].append(record)
+
+        def has_real_qid(qid) -> bool:
+            return qid is not None and not qid.startswith("PROV:")
+
+        pairs = []
+        for figures in by_name.values():
+            if len(figures) < 2:
+                continue
+            figures = sorted(figures, key=lambda f: f["canonical_id"])
+            for i, f1 in enumerate(figures):
+                for f2 in figures[i + 1:]:
+                    if f1["canonical_id"] == f2["canonical_id"]:
+                        continue
+                    if not (has_real_qid(f1["qid"]) or has_real_qid(f2["qid"])):
+                        continue
+                    pairs.append({
+                        "id1": f1["canonical_id"], "name1": f1["name"], "qid1": f1["qid"],
+                        "id2": f2["canonical_id"], "name2": f2["name"], "qid2": f2["qid"]
+                    })
+
+        pairs.sort(key=lambda pair: (pair["name1"], pair["id1"], pair["id2"]))
+        return pairs
 
     def generate_merge_report(self, output_path: str):
         """Generate markdown report of all merge operations."""
@@ -300,6 +377,10 @@ class EntityMerger:
                 f.write(f"### {status_icon} {merge['type']}: {merge['duplicate']} → {merge['primary']}\n\n")
                 f.write(f"- **Wikidata Q-ID:** {merge['qid']}\n")
                 f.write(f"- **Status:** {merge['status']}\n")
+                if "redirected" in merge:
+                    redirected = merge["redirected"]
+                    f.write(f"- **Redirected:** {redirected['appears_in']} APPEARS_IN, "
+                            f"{redirected['outgoing']} outgoing, {redirected['incoming']} incoming\n")
                 if "error" in merge:
                     f.write(f"- **Error:** {merge['error']}\n")
                 f.write("\n")
@@ -3,31 +3,50 @@ Fictotum: Duplicate Entity Resolver
 Detects potential duplicate HistoricalFigure nodes using multi-pass detection.
 """
 
+import argparse
 import os
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from collections import defaultdict
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
-from SPARQLWrapper import SPARQLWrapper, JSON
 from thefuzz import fuzz
 
-# SPARQL endpoint for Wikidata
-WIKIDATA_SPARQL_ENDPOINT = "https://query.wikidata.org/sparql"
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib.similarity_cache import SimilarityCache, normalize_name
+from lib.pair_scoring import score_pairs
+from lib.audit_state import AuditState, FULL_REBUILD_DAYS, to_epoch_seconds
+from lib.disjoint_set import DisjointSet
+from lib.wikidata_aliases import (
+    AliasFetcher, AliasStore, RecordedSparqlEndpoint, SparqlEndpoint, DEFAULT_TTL_DAYS
+)
 
-# Languages to fetch aliases for
-ALIAS_LANGUAGES = ["en", "la", "it", "fr", "de", "es"]
+# Similarity cache key for pass 3; bump the version if the scoring changes
+FUZZY_ALGORITHM = "fuzz.ratio@1"
+
+# Pass 3 threshold (fuzz.ratio must exceed this)
+FUZZY_THRESHOLD = 90
 
 
 class HistoricalFigureNode:
     """Represents a HistoricalFigure node from Neo4j."""
 
-    def __init__(self, canonical_id: str, name: str, wikidata_id: str = None):
+    def __init__(
+        self,
+        canonical_id: str,
+        name: str,
+        wikidata_id: str = None,
+        touched_at: float = None,
+        ingestion_batch: str = None
+    ):
         self.canonical_id = canonical_id
         self.name = name
         self.wikidata_id = wikidata_id
+        self.touched_at = touched_at  # updated_at (or created_at), epoch seconds
+        self.ingestion_batch = ingestion_batch
         self.aliases: Set[str] = set()
 
     def add_aliases(self, aliases: List[str]):
@@ -60,27 +79,68 @@ class DuplicateCluster:
 class EntityResolver:
     """Main resolver class for detecting duplicate entities."""
 
-    def __init__(self, uri: str, user: str, pwd: str):
-        """Initialize Neo4j connection."""
+    def __init__(
+        self,
+        uri: str,
+        user: str,
+        pwd: str,
+        jobs: int = 1,
+        incremental: bool = False,
+        full_rebuild_days: float = FULL_REBUILD_DAYS,
+        alias_ttl_days: float = DEFAULT_TTL_DAYS,
+        sparql_endpoint=None,
+        use_alias_store: bool = True
+    ):
+        """
+        Initialize Neo4j connection.
+
+        Args:
+            jobs: Worker processes for fuzzy pair scoring (pass 3)
+            incremental: Only check figures new or changed since the last audit
+                (against all figures)
+            full_rebuild_days: In incremental mode, run a full audit anyway if
+                the last one is older than this
+            alias_ttl_days: Refetch stored Wikidata aliases older than this
+            sparql_endpoint: Endpoint for alias queries (default: live Wikidata;
+                pass a RecordedSparqlEndpoint to replay recorded aliases)
+            use_alias_store: If False, neither read nor write the on-disk alias
+                store (every alias query goes to the endpoint)
+        """
         if uri.startswith("neo4j+s://"):
             uri = uri.replace("neo4j+s://", "neo4j+ssc://")
         self.driver = GraphDatabase.driver(uri, auth=(user, pwd))
         self.figures: Dict[str, HistoricalFigureNode] = {}
+        self.similarity_cache = SimilarityCache()
+        self.alias_store = AliasStore(ttl_days=alias_ttl_days, enabled=use_alias_store)
+        self.sparql_endpoint = sparql_endpoint
+        self.jobs = jobs
+
+        # Incremental audits: figures to check (None = all of them)
+        self.incremental = incremental
+        self.full_rebuild_days = full_rebuild_days
+        self.state = AuditState.load()
+        self.changed_ids: Optional[Set[str]] = None
+        self.started_at = time.time()
 
     def close(self):
-        """Close Neo4j connection."""
+        """Close Neo4j connection and persist similarity scores."""
+        self.similarity_cache.close()
+        self.alias_store.close()
         self.driver.close()
 
     def fetch_figures(self):
         """Fetch all HistoricalFigure nodes from Neo4j."""
         print("📊 Fetching HistoricalFigure nodes from Neo4j...")
+        self.started_at = time.time()
 
         with self.driver.session() as session:
             result = session.run("""
                 MATCH (f:HistoricalFigure)
                 RETURN f.canonical_id AS canonical_id,
                        f.name AS name,
-                       f.wikidata_id AS wikidata_id
+                       f.wikidata_id AS wikidata_id,
+                       coalesce(f.updated_at, f.created_at) AS touched_at,
+                       f.ingestion_batch AS ingestion_batch
                 ORDER BY f.canonical_id
             """)
 
@@ -88,172 +148,228 @@ class EntityResolver:
                 fig = HistoricalFigureNode(
                     canonical_id=record["canonical_id"],
                     name=record["name"],
-                    wikidata_id=record.get("wikidata_id")
+                    wikidata_id=record.get("wikidata_id"),
+                    touched_at=to_epoch_seconds(record.get("touched_at")),
+                    ingestion_batch=record.get("ingestion_batch")
                 )
                 self.figures[fig.canonical_id] = fig
 
         print(f"✅ Fetched {len(self.figures)} HistoricalFigure nodes.")
 
-    def enrich_with_wikidata_aliases(self):
-        """Fetch Wikidata aliases for all figures with real Wikidata IDs."""
-        print("🌍 Enriching figures with Wikidata aliases...")
+        if self.incremental:
+            self._select_changed_figures()
 
-        sparql = SPARQLWrapper(WIKIDATA_SPARQL_ENDPOINT)
-        sparql.setReturnFormat(JSON)
+    def _select_changed_figures(self):
+        """Limit the audit to figures new or changed since the last one, if possible."""
+        if self.state.needs_full_rebuild(self.full_rebuild_days):
+            print(f"🔁 No recent full audit (last {self.full_rebuild_days:g} days); running a full audit.")
+            return
 
-        figures_with_qids = [fig for fig in self.figures.values() if fig.has_real_wikidata_id()]
+        self.changed_ids = {
+            fig.canonical_id for fig in self.figures.values()
+            if self.state.is_changed(fig.canonical_id, fig.name, fig.wikidata_id, fig.touched_at, fig.ingestion_batch)
+        }
 
-        for idx, fig in enumerate(figures_with_qids, 1):
-            if idx % 10 == 0:
-                print(f"  Progress: {idx}/{len(figures_with_qids)} figures processed...")
+        # Unchanged figures keep the aliases fetched by earlier audits
+        for fig in self.figures.values():
+            if fig.canonical_id not in self.changed_ids:
+                fig.add_aliases(self.state.cached_aliases(fig.canonical_id))
 
-            try:
-                query = self._build_alias_query(fig.wikidata_id)
-                sparql.setQuery(query)
-                results = sparql.query().convert()
+        watermark = datetime.fromtimestamp(self.state.watermark).isoformat(timespec="seconds")
+        print(f"⏩ Incremental audit: {len(self.changed_ids)} figures new or changed since {watermark}.")
 
-                aliases = []
-                for result in results["results"]["bindings"]:
-                    if "altLabel" in result:
-                        aliases.append(result["altLabel"]["value"])
+    def save_state(self):
+        """Record this audit's watermark and figure snapshot for the next incremental run."""
+        self.state.record_audit(self.figures.values(), self.started_at, full=self.changed_ids is None)
+        self.state.save()
+        print(f"💾 Audit state saved to: {self.state.path}")
 
-                fig.add_aliases(aliases)
+    def enrich_with_wikidata_aliases(self):
+        """Fetch Wikidata aliases for all figures with real Wikidata IDs (batched, via the alias store)."""
+        print("🌍 Enriching figures with Wikidata aliases...")
+
+        figures_with_qids = [
+            fig for fig in self.figures.values()
+            if fig.has_real_wikidata_id() and (self.changed_ids is None or fig.canonical_id in self.changed_ids)
+        ]
 
-            except Exception as e:
-                print(f"⚠️  Warning: Could not fetch aliases for {fig.canonical_id} ({fig.wikidata_id}): {e}")
+        if self.sparql_endpoint is None:
+            self.sparql_endpoint = SparqlEndpoint()
+        fetcher = AliasFetcher(self.alias_store, self.sparql_endpoint)
+        aliases = fetcher.fetch(fig.wikidata_id for fig in figures_with_qids)
 
-        print(f"✅ Alias enrichment complete.")
+        for fig in figures_with_qids:
+            fig.add_aliases(aliases.get(fig.wikidata_id, []))
 
-    def _build_alias_query(self, wikidata_id: str) -> str:
-        """Build SPARQL query to fetch aliases for a Wikidata entity."""
-        lang_filter = " || ".join([f'lang(?altLabel) = "{lang}"' for lang in ALIAS_LANGUAGES])
+        print(f"✅ Alias enrichment complete ({fetcher.describe()}).")
 
-        return f"""
-        SELECT ?altLabel WHERE {{
-          wd:{wikidata_id} skos:altLabel ?altLabel .
-          FILTER({lang_filter})
-        }}
+    def detect_duplicates(self, recall_check: bool = False) -> List[DuplicateCluster]:
         """
+        Run three-pass duplicate detection and return clusters.
 
-    def detect_duplicates(self) -> List[DuplicateCluster]:
-        """Run three-pass duplicate detection and return clusters."""
+        Every pass adds candidate edges to one disjoint set; clusters are its
+        connected components, so a figure matched in pass 1 can still join
+        figures found by passes 2 and 3, and transitive matches (A~B, B~C) do
+        not depend on pass or figure order.
+
+        With recall_check, pass 3 is also run brute force and any pair the
+        blocking index missed is reported. In an incremental audit only
+        clusters containing a new or changed figure are returned.
+        """
         print("🔍 Running three-pass duplicate detection...")
 
-        clusters = []
-        processed_ids = set()
+        edges = DisjointSet()
 
         # Pass 1: Perfect Wikidata ID Match
         print("  Pass 1: Perfect Wikidata ID match...")
-        wikidata_clusters = self._pass1_wikidata_match(processed_ids)
-        clusters.extend(wikidata_clusters)
-        print(f"    Found {len(wikidata_clusters)} clusters with shared Wikidata IDs.")
+        wikidata_edges = self._pass1_wikidata_match(edges)
+        print(f"    Found {wikidata_edges} shared Wikidata ID edges.")
 
         # Pass 2: Alias Match
         print("  Pass 2: Alias and name exact match...")
-        alias_clusters = self._pass2_alias_match(processed_ids)
-        clusters.extend(alias_clusters)
-        print(f"    Found {len(alias_clusters)} clusters with alias matches.")
+        alias_edges = self._pass2_alias_match(edges)
+        print(f"    Found {alias_edges} alias match edges.")
 
         # Pass 3: Fuzzy Match
-        print("  Pass 3: Fuzzy name match (>90% similarity)...")
-        fuzzy_clusters = self._pass3_fuzzy_match(processed_ids)
-        clusters.extend(fuzzy_clusters)
-        print(f"    Found {len(fuzzy_clusters)} clusters with fuzzy matches.")
+        print(f"  Pass 3: Fuzzy name match (>{FUZZY_THRESHOLD}% similarity)...")
+        fuzzy_pairs = self._pass3_fuzzy_match(edges)
+        print(f"    Found {len(fuzzy_pairs)} fuzzy match edges.")
+        print(f"    {self.similarity_cache.describe()}")
+
+        if recall_check:
+            self._check_fuzzy_recall(fuzzy_pairs)
+
+        clusters = self._build_clusters(edges)
+
+        if self.changed_ids is not None:
+            clusters = [
+                cluster for cluster in clusters
+                if cluster.primary.canonical_id in self.changed_ids
+                or any(node.canonical_id in self.changed_ids for node, _ in cluster.duplicates)
+            ]
 
         print(f"✅ Detection complete. Total clusters: {len(clusters)}")
         return clusters
 
-    def _pass1_wikidata_match(self, processed_ids: Set[str]) -> List[DuplicateCluster]:
-        """Pass 1: Find figures with same real Wikidata ID but different canonical IDs."""
+    def _build_clusters(self, edges: DisjointSet) -> List[DuplicateCluster]:
+        """
+        One cluster per connected component. The lowest canonical_id is the
+        primary; each duplicate lists every edge that touches it.
+        """
         clusters = []
+        for members in edges.components():
+            primary = self.figures[members[0]]
+            cluster = DuplicateCluster(primary)
+            for canonical_id in members[1:]:
+                reasons = []
+                for other_id, reason in edges.edges_of(canonical_id):
+                    if other_id != primary.canonical_id:
+                        reason = f"{reason} (via `{other_id}`)"
+                    if reason not in reasons:
+                        reasons.append(reason)
+                cluster.add_duplicate(self.figures[canonical_id], "; ".join(reasons))
+            clusters.append(cluster)
+        return clusters
+
+    def _pass1_wikidata_match(self, edges: DisjointSet) -> int:
+        """Pass 1: Link figures with same real Wikidata ID but different canonical IDs."""
         qid_to_figures = defaultdict(list)
+        added = 0
 
         # Group figures by Wikidata ID
         for fig in self.figures.values():
             if fig.has_real_wikidata_id():
                 qid_to_figures[fig.wikidata_id].append(fig)
 
-        # Find groups with multiple figures
+        # Link each group to its lowest canonical_id
         for qid, figures in qid_to_figures.items():
             if len(figures) > 1:
-                # Sort by canonical_id to ensure consistent primary selection
                 figures.sort(key=lambda f: f.canonical_id)
-                primary = figures[0]
-                cluster = DuplicateCluster(primary)
-
                 for fig in figures[1:]:
-                    cluster.add_duplicate(fig, f"Shared Wikidata ID: {qid}")
-                    processed_ids.add(fig.canonical_id)
+                    edges.union(figures[0].canonical_id, fig.canonical_id, f"Shared Wikidata ID: {qid}")
+                    added += 1
 
-                processed_ids.add(primary.canonical_id)
-                clusters.append(cluster)
+        return added
 
-        return clusters
-
-    def _pass2_alias_match(self, processed_ids: Set[str]) -> List[DuplicateCluster]:
-        """Pass 2: Find figures where name/aliases match other figures' primary names."""
-        clusters = []
+    def _pass2_alias_match(self, edges: DisjointSet) -> int:
+        """Pass 2: Link figures whose aliases match other figures' primary names."""
+        added = 0
 
         # Build a lookup: name (lowercased) -> list of figures with that name
         name_to_figures = defaultdict(list)
         for fig in self.figures.values():
-            if fig.canonical_id not in processed_ids:
-                name_to_figures[fig.name.lower()].append(fig)
+            name_to_figures[fig.name.lower()].append(fig)
 
-        # Check each unprocessed figure
+        # Check if any figure's aliases match another figure's primary name
         for fig in self.figures.values():
-            if fig.canonical_id in processed_ids:
-                continue
-
-            matches = []
-
-            # Check if any of this figure's aliases match another figure's primary name
-            for alias in fig.aliases:
-                if alias in name_to_figures:
-                    for other_fig in name_to_figures[alias]:
-                        if other_fig.canonical_id != fig.canonical_id and other_fig.canonical_id not in processed_ids:
-                            matches.append((other_fig, f"Matched Wikidata Alias '{alias.title()}'"))
-
-            if matches:
-                cluster = DuplicateCluster(fig)
-                for matched_fig, reason in matches:
-                    cluster.add_duplicate(matched_fig, reason)
-                    processed_ids.add(matched_fig.canonical_id)
-
-                processed_ids.add(fig.canonical_id)
-                clusters.append(cluster)
-
-        return clusters
-
-    def _pass3_fuzzy_match(self, processed_ids: Set[str]) -> List[DuplicateCluster]:
-        """Pass 3: Find figures with fuzzy name similarity > 90%."""
-        clusters = []
-        unprocessed = [fig for fig in self.figures.values() if fig.canonical_id not in processed_ids]
-
-        for i, fig1 in enumerate(unprocessed):
-            if fig1.canonical_id in processed_ids:
-                continue
-
-            cluster = None
-
-            for fig2 in unprocessed[i+1:]:
-                if fig2.canonical_id in processed_ids:
-                    continue
-
-                similarity = fuzz.ratio(fig1.name.lower(), fig2.name.lower())
-
-                if similarity > 90:
-                    if cluster is None:
-                        cluster = DuplicateCluster(fig1)
-                        processed_ids.add(fig1.canonical_id)
-
-                    cluster.add_duplicate(fig2, f"Fuzzy Match Score: {similarity}%")
-                    processed_ids.add(fig2.canonical_id)
+            for alias in sorted(fig.aliases):
+                for other_fig in name_to_figures.get(alias, []):
+                    if other_fig.canonical_id != fig.canonical_id:
+                        edges.union(fig.canonical_id, other_fig.canonical_id, f"Matched Wikidata Alias '{alias.title()}'")
+                        added += 1
+
+        return added
+
+    def _pass3_fuzzy_match(
+        self,
+        edges: Optional[DisjointSet],
+        brute_force: bool = False
+    ) -> Set[Tuple[str, str]]:
+        """
+        Pass 3: Link figures with fuzzy name similarity > 90%.
 
-            if cluster:
-                clusters.append(cluster)
+        Only pairs proposed by the name blocking index are scored, unless
+        brute_force is set (used by the recall check). In an incremental audit
+        only pairs involving a new or changed figure are scored. Scoring runs
+        across self.jobs processes (bypassing the similarity cache when
+        jobs > 1); matches are merged in figure order, so the edges do not
+        depend on the number of jobs.
 
-        return clusters
+        Returns the matched (canonical_id, canonical_id) pairs; they are also
+        added to `edges` unless it is None.
+        """
+        figures = list(self.figures.values())
+        names = [normalize_name(fig.name or "") for fig in figures]
+
+        if self.jobs > 1:
+            scorer = fuzz.ratio
+        else:
+            scorer = lambda name1, name2: self.similarity_cache.score(FUZZY_ALGORITHM, name1, name2, fuzz.ratio)
+        focus = None
+        if self.changed_ids is not None:
+            focus = {i for i, fig in enumerate(figures) if fig.canonical_id in self.changed_ids}
+        matches, scored = score_pairs(
+            names, FUZZY_THRESHOLD, scorer, jobs=self.jobs, brute_force=brute_force, focus=focus
+        )
+
+        pairs = set()
+        for i, partners in matches.items():
+            for j, similarity in partners:
+                fig1, fig2 = figures[i], figures[j]
+                pairs.add((fig1.canonical_id, fig2.canonical_id))
+                if edges is not None:
+                    edges.union(fig1.canonical_id, fig2.canonical_id, f"Fuzzy Match Score: {similarity}%")
+
+        all_pairs = len(figures) * (len(figures) - 1) // 2
+        print(f"    Scored {scored} of {all_pairs} possible pairs.")
+        return pairs
+
+    def _check_fuzzy_recall(self, fuzzy_pairs: Set[Tuple[str, str]]):
+        """Compare pass 3 matches with a brute-force run over the same figures."""
+        print("  Recall check: re-running pass 3 brute force...")
+        expected = self._pass3_fuzzy_match(None, brute_force=True)
+
+        missed = expected - fuzzy_pairs
+        extra = fuzzy_pairs - expected
+        if not missed and not extra:
+            print(f"    ✅ Blocking index matches brute force ({len(expected)} pairs).")
+            return
+
+        print(f"    ⚠️  Blocking index differs from brute force: {len(missed)} missed, {len(extra)} extra pairs")
+        for pair in sorted(missed):
+            print(f"      missed: {', '.join(pair)}")
+        for pair in sorted(extra):
+            print(f"      extra:  {', '.join(pair)}")
 
     def generate_report(self, clusters: List[DuplicateCluster], output_path: str):
         """Generate markdown report of merge proposals."""
@@ -263,6 +379,9 @@ class EntityResolver:
             f.write("# Fictotum: Entity Merge Proposals\n\n")
             f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
             f.write(f"**Total Clusters Found:** {len(clusters)}\n\n")
+            if self.changed_ids is not None:
+                f.write(f"**Mode:** Incremental ({len(self.changed_ids)} new or changed figures checked "
+                        f"against all {len(self.figures)})\n\n")
             f.write("---\n\n")
 
             if not clusters:
@@ -294,6 +413,47 @@ class EntityResolver:
 
 def main():
     """Main entry point for the duplicate entity resolver."""
+    parser = argparse.ArgumentParser(description="Detect potential duplicate HistoricalFigure nodes.")
+    parser.add_argument(
+        "--recall-check",
+        action="store_true",
+        help="Also run the fuzzy pass brute force and report clusters the blocking index missed"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for fuzzy pair scoring (default: 1)"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only check figures added or changed since the last audit (against all figures)"
+    )
+    parser.add_argument(
+        "--full-rebuild-days",
+        type=float,
+        default=FULL_REBUILD_DAYS,
+        help=f"With --incremental, run a full audit if the last one is older than this (default: {FULL_REBUILD_DAYS})"
+    )
+    parser.add_argument(
+        "--alias-ttl-days",
+        type=float,
+        default=DEFAULT_TTL_DAYS,
+        help=f"Refetch stored Wikidata aliases older than this (default: {DEFAULT_TTL_DAYS})"
+    )
+    parser.add_argument(
+        "--sparql-replay",
+        metavar="PATH",
+        help="Answer alias queries from aliases recorded in PATH instead of Wikidata (fails if a Q-ID is not recorded)"
+    )
+    parser.add_argument(
+        "--sparql-record",
+        metavar="PATH",
+        help="Query Wikidata for Q-IDs not yet recorded in PATH and save their aliases for --sparql-replay"
+    )
+    args = parser.parse_args()
+
     load_dotenv()
 
     # Check Neo4j credentials
@@ -305,8 +465,23 @@ def main():
         print("❌ Error: NEO4J_URI and NEO4J_PASSWORD environment variables must be set.")
         sys.exit(1)
 
+    sparql_endpoint = None
+    if args.sparql_replay:
+        sparql_endpoint = RecordedSparqlEndpoint(args.sparql_replay)
+    elif args.sparql_record:
+        sparql_endpoint = RecordedSparqlEndpoint(args.sparql_record, live=SparqlEndpoint())
+
     # Initialize resolver
-    resolver = EntityResolver(uri, user, pwd)
+    resolver = EntityResolver(
+        uri, user, pwd,
+        jobs=args.jobs,
+        incremental=args.incremental,
+        full_rebuild_days=args.full_rebuild_days,
+        alias_ttl_days=args.alias_ttl_days,
+        sparql_endpoint=sparql_endpoint,
+        # Recordings must hold every Q-ID, and replays should not depend on local state
+        use_alias_store=sparql_endpoint is None
+    )
 
     try:
         print(f"--- Fictotum Duplicate Entity Resolver: {datetime.now()} ---\n")
@@ -318,12 +493,15 @@ def main():
         resolver.enrich_with_wikidata_aliases()
 
         # Step 3: Run three-pass detection
-        clusters = resolver.detect_duplicates()
+        clusters = resolver.detect_duplicates(recall_check=args.recall_check)
 
         # Step 4: Generate report
         output_path = Path(__file__).parent.parent.parent / "merge_proposals.md"
         resolver.generate_report(clusters, str(output_path))
 
+        # Step 5: Record the watermark for the next incremental run
+        resolver.save_state()
+
         print(f"\n✅ Process complete. Review merge proposals in: {output_path}")
 
     except Exception as e:
@@ -333,6 +511,8 @@ def main():
         sys.exit(1)
 
     finally:
+        if args.sparql_record:
+            sparql_endpoint.save()
         resolver.close()
 
 
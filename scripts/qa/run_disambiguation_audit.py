@@ -8,17 +8,116 @@ Purpose:
 - Identifies relationship integrity issues
 - Generates actionable remediation recommendations
 
+HistoricalFigure, MediaWork and APPEARS_IN are each read once into a
+GraphSnapshot; every check then runs in memory with hash aggregations, so the
+audit is linear in graph size (no per-check scans or name/title self-joins).
+
 Author: Claude Code (Data Architect)
 Date: 2026-01-18
 """
 
 import os
+import re
 import sys
+from collections import Counter, defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from typing import Dict, Iterable, List, Any, Set, Tuple
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
+from thefuzz import fuzz
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib.work_dedupe import WorkDedupeIndex
+
+# Normalized titles at least this similar (0-1) count as the same title
+TITLE_MATCH_THRESHOLD = 0.9
+
+
+QID_PATTERN = re.compile(r"Q[0-9]+")
+
+
+def title_similarity(title1: str, title2: str) -> float:
+    """fuzz.ratio of two normalized titles, 0-1."""
+    return fuzz.ratio(title1, title2) / 100.0
+
+
+def has_real_qid(wikidata_id: Any) -> bool:
+    """Set and not provisional (matches the Cypher `IS NOT NULL AND NOT STARTS WITH 'PROV:'`)."""
+    return wikidata_id is not None and not str(wikidata_id).startswith("PROV:")
+
+
+def distinct(values: Iterable[Any]) -> List[Any]:
+    """Distinct non-null values in first-seen order, like COLLECT(DISTINCT ...)."""
+    return list(dict.fromkeys(value for value in values if value is not None))
+
+
+def cypher_order(value: Any) -> Tuple[bool, Any]:
+    """Sort key placing nulls last, like ORDER BY."""
+    return (value is None, value if value is not None else "")
+
+
+class GraphSnapshot:
+    """
+    Key properties of every HistoricalFigure and MediaWork plus the
+    APPEARS_IN edges between them, read with one streaming query per label.
+
+    All audits run on this snapshot with hash aggregations, so an audit is
+    linear in graph size instead of issuing a Cypher scan (or a cartesian
+    name/title self-join) per check.
+    """
+
+    def __init__(self):
+        # elementId -> properties
+        self.figures: Dict[str, Dict[str, Any]] = {}
+        self.media: Dict[str, Dict[str, Any]] = {}
+        # (figure elementId, media elementId) -> number of APPEARS_IN relationships
+        self.appearances: Counter = Counter()
+        self.figures_with_media: Set[str] = set()
+        self.media_with_figures: Set[str] = set()
+
+    @classmethod
+    def load(cls, session) -> "GraphSnapshot":
+        print("  Loading graph snapshot...")
+        snapshot = cls()
+
+        for record in session.run("""
+            MATCH (f:HistoricalFigure)
+            RETURN elementId(f) AS node_id, f.canonical_id AS canonical_id, f.name AS name,
+                   f.wikidata_id AS wikidata_id, f.era AS era
+        """):
+            snapshot.figures[record["node_id"]] = {
+                "canonical_id": record["canonical_id"],
+                "name": record["name"],
+                "wikidata_id": record["wikidata_id"],
+                "era": record["era"]
+            }
+
+        for record in session.run("""
+            MATCH (m:MediaWork)
+            RETURN elementId(m) AS node_id, m.media_id AS media_id, m.title AS title,
+                   m.wikidata_id AS wikidata_id, m.media_type AS media_type,
+                   m.release_year AS release_year
+        """):
+            snapshot.media[record["node_id"]] = {
+                "media_id": record["media_id"],
+                "title": record["title"],
+                "wikidata_id": record["wikidata_id"],
+                "media_type": record["media_type"],
+                "release_year": record["release_year"]
+            }
+
+        for record in session.run("""
+            MATCH (f:HistoricalFigure)-[:APPEARS_IN]->(m:MediaWork)
+            RETURN elementId(f) AS figure_id, elementId(m) AS media_id
+        """):
+            snapshot.appearances[(record["figure_id"], record["media_id"])] += 1
+            snapshot.figures_with_media.add(record["figure_id"])
+            snapshot.media_with_figures.add(record["media_id"])
+
+        print(f"  Snapshot: {len(snapshot.figures)} figures, {len(snapshot.media)} media works, "
+              f"{sum(snapshot.appearances.values())} APPEARS_IN relationships\n")
+        return snapshot
 
 
 class DisambiguationAuditor:
@@ -48,7 +147,7 @@ class DisambiguationAuditor:
         self.driver.close()
 
     def run_audit(self):
-        """Execute all audit queries and collect results."""
+        """Load a snapshot of the graph once, then run every audit on it in memory."""
         print("=" * 80)
         print("Fictotum Disambiguation Audit")
         print(f"Timestamp: {datetime.now().isoformat()}")
@@ -56,36 +155,38 @@ class DisambiguationAuditor:
         print()
 
         with self.driver.session() as session:
+            snapshot = GraphSnapshot.load(session)
+
             # Section 1: HistoricalFigure Disambiguation
             print("Section 1: HistoricalFigure Disambiguation Audit")
             print("-" * 80)
 
-            self._audit_duplicate_figure_qids(session)
-            self._audit_provisional_figure_qids(session)
-            self._audit_similar_figure_names(session)
-            self._audit_orphaned_figures(session)
+            self._audit_duplicate_figure_qids(snapshot)
+            self._audit_provisional_figure_qids(snapshot)
+            self._audit_similar_figure_names(snapshot)
+            self._audit_orphaned_figures(snapshot)
 
             # Section 2: MediaWork Disambiguation
             print("\nSection 2: MediaWork Disambiguation Audit")
             print("-" * 80)
 
-            self._audit_duplicate_media_qids(session)
-            self._audit_missing_media_qids(session)
-            self._audit_invalid_media_qid_format(session)
-            self._audit_duplicate_media_titles(session)
-            self._audit_orphaned_media(session)
+            self._audit_duplicate_media_qids(snapshot)
+            self._audit_missing_media_qids(snapshot)
+            self._audit_invalid_media_qid_format(snapshot)
+            self._audit_duplicate_media_titles(snapshot)
+            self._audit_orphaned_media(snapshot)
 
             # Section 3: Relationship Integrity
             print("\nSection 3: Relationship Integrity Audit")
             print("-" * 80)
 
-            self._audit_duplicate_relationships(session)
+            self._audit_duplicate_relationships(snapshot)
 
             # Section 4: Statistical Summary
             print("\nSection 4: Statistical Summary")
             print("-" * 80)
 
-            self._gather_statistics(session)
+            self._gather_statistics(snapshot)
 
             # Section 5: Constraints and Indexes
             print("\nSection 5: Schema Integrity")
@@ -93,25 +194,25 @@ class DisambiguationAuditor:
 
             self._verify_constraints(session)
 
-    def _audit_duplicate_figure_qids(self, session):
+    def _audit_duplicate_figure_qids(self, snapshot: "GraphSnapshot"):
         """Detect multiple HistoricalFigure nodes with same Wikidata Q-ID."""
         print("  [1.1] Checking for duplicate Wikidata Q-IDs in HistoricalFigure...")
 
-        query = """
-        MATCH (f:HistoricalFigure)
-        WHERE f.wikidata_id IS NOT NULL
-          AND NOT f.wikidata_id STARTS WITH 'PROV:'
-        WITH f.wikidata_id AS qid,
-             COLLECT(DISTINCT f.canonical_id) AS canonical_ids,
-             COLLECT(DISTINCT f.name) AS names,
-             COUNT(DISTINCT f) AS figure_count
-        WHERE figure_count > 1
-        RETURN qid, figure_count, canonical_ids, names
-        ORDER BY figure_count DESC
-        """
-
-        result = session.run(query)
-        duplicates = list(result)
+        by_qid = defaultdict(list)
+        for fig in snapshot.figures.values():
+            if has_real_qid(fig["wikidata_id"]):
+                by_qid[fig["wikidata_id"]].append(fig)
+
+        duplicates = [
+            {
+                "qid": qid,
+                "figure_count": len(figures),
+                "canonical_ids": distinct(fig["canonical_id"] for fig in figures),
+                "names": distinct(fig["name"] for fig in figures)
+            }
+            for qid, figures in by_qid.items() if len(figures) > 1
+        ]
+        duplicates.sort(key=lambda dup: (-dup["figure_count"], dup["qid"]))
 
         if duplicates:
             print(f"    ❌ CRITICAL: Found {len(duplicates)} Q-IDs shared by multiple figures!")
@@ -128,23 +229,14 @@ class DisambiguationAuditor:
         else:
             print("    ✅ PASS: No duplicate Q-IDs found.")
 
-    def _audit_provisional_figure_qids(self, session):
+    def _audit_provisional_figure_qids(self, snapshot: "GraphSnapshot"):
         """Identify figures with provisional or missing Wikidata IDs."""
         print("  [1.2] Checking for provisional/missing Wikidata IDs...")
 
-        query = """
-        MATCH (f:HistoricalFigure)
-        WHERE f.wikidata_id STARTS WITH 'PROV:'
-           OR f.wikidata_id IS NULL
-        RETURN f.canonical_id AS canonical_id,
-               f.name AS name,
-               f.wikidata_id AS wikidata_id,
-               f.era AS era
-        ORDER BY f.name
-        """
-
-        result = session.run(query)
-        provisional = list(result)
+        provisional = sorted(
+            (fig for fig in snapshot.figures.values() if not has_real_qid(fig["wikidata_id"])),
+            key=lambda fig: cypher_order(fig["name"])
+        )
 
         if provisional:
             print(f"    ⚠️  WARNING: Found {len(provisional)} figures with provisional/missing Q-IDs.")
@@ -163,21 +255,26 @@ class DisambiguationAuditor:
         else:
             print("    ✅ EXCELLENT: All figures have real Wikidata Q-IDs.")
 
-    def _audit_similar_figure_names(self, session):
+    def _audit_similar_figure_names(self, snapshot: "GraphSnapshot"):
         """Detect figures with similar names (potential duplicates)."""
         print("  [1.3] Checking for similar figure names...")
 
-        query = """
-        MATCH (f1:HistoricalFigure)
-        MATCH (f2:HistoricalFigure)
-        WHERE f1.canonical_id < f2.canonical_id
-          AND toLower(f1.name) = toLower(f2.name)
-        RETURN f1.canonical_id AS fig1_id, f1.name AS fig1_name, f1.wikidata_id AS fig1_qid,
-               f2.canonical_id AS fig2_id, f2.name AS fig2_name, f2.wikidata_id AS fig2_qid
-        """
-
-        result = session.run(query)
-        similar = list(result)
+        # Hash on the lowercased name instead of comparing every pair of figures
+        by_name = defaultdict(list)
+        for fig in snapshot.figures.values():
+            if fig["name"] is not None and fig["canonical_id"] is not None:
+                by_name[fig["name"].lower()].append(fig)
+
+        similar = []
+        for name in sorted(by_name):
+            figures = sorted(by_name[name], key=lambda fig: fig["canonical_id"])
+            for i, f1 in enumerate(figures):
+                for f2 in figures[i + 1:]:
+                    if f1["canonical_id"] < f2["canonical_id"]:
+                        similar.append({
+                            "fig1_id": f1["canonical_id"], "fig1_name": f1["name"], "fig1_qid": f1["wikidata_id"],
+                            "fig2_id": f2["canonical_id"], "fig2_name": f2["name"], "fig2_qid": f2["wikidata_id"]
+                        })
 
         if similar:
             print(f"    ⚠️  WARNING: Found {len(similar)} pairs with identical names!")
@@ -196,33 +293,20 @@ class DisambiguationAuditor:
         else:
             print("    ✅ PASS: No exact name duplicates found.")
 
-    def _audit_orphaned_figures(self, session):
+    def _audit_orphaned_figures(self, snapshot: "GraphSnapshot"):
         """Identify figures not connected to any MediaWork."""
         print("  [1.4] Checking for orphaned HistoricalFigure nodes...")
 
-        query = """
-        MATCH (f:HistoricalFigure)
-        WHERE NOT (f)-[:APPEARS_IN]->(:MediaWork)
-        RETURN COUNT(f) AS orphan_count
-        """
-
-        result = session.run(query)
-        count = result.single()["orphan_count"]
+        orphans = [
+            fig for node_id, fig in snapshot.figures.items()
+            if node_id not in snapshot.figures_with_media
+        ]
+        count = len(orphans)
 
         if count > 0:
             print(f"    ⚠️  INFO: Found {count} orphaned figures (no media relationships).")
             # Get sample
-            query_sample = """
-            MATCH (f:HistoricalFigure)
-            WHERE NOT (f)-[:APPEARS_IN]->(:MediaWork)
-            RETURN f.canonical_id AS canonical_id,
-                   f.name AS name,
-                   f.era AS era
-            ORDER BY f.name
-            LIMIT 10
-            """
-            result = session.run(query_sample)
-            orphans = list(result)
+            orphans = sorted(orphans, key=lambda fig: cypher_order(fig["name"]))[:10]
             for fig in orphans:
                 self.issues["orphaned_figures"].append({
                     "canonical_id": fig["canonical_id"],
@@ -235,23 +319,25 @@ class DisambiguationAuditor:
         else:
             print("    ✅ EXCELLENT: All figures are connected to at least one media work.")
 
-    def _audit_duplicate_media_qids(self, session):
+    def _audit_duplicate_media_qids(self, snapshot: "GraphSnapshot"):
         """Detect multiple MediaWork nodes with same Wikidata Q-ID."""
         print("  [2.1] Checking for duplicate Wikidata Q-IDs in MediaWork...")
 
-        query = """
-        MATCH (m:MediaWork)
-        WHERE m.wikidata_id IS NOT NULL
-        WITH m.wikidata_id AS qid, COUNT(*) AS count,
-             COLLECT(m.media_id) AS media_ids,
-             COLLECT(m.title) AS titles
-        WHERE count > 1
-        RETURN qid, count, media_ids, titles
-        ORDER BY count DESC
-        """
-
-        result = session.run(query)
-        duplicates = list(result)
+        by_qid = defaultdict(list)
+        for media in snapshot.media.values():
+            if media["wikidata_id"] is not None:
+                by_qid[media["wikidata_id"]].append(media)
+
+        duplicates = [
+            {
+                "qid": qid,
+                "count": len(works),
+                "media_ids": [media["media_id"] for media in works],
+                "titles": [media["title"] for media in works]
+            }
+            for qid, works in by_qid.items() if len(works) > 1
+        ]
+        duplicates.sort(key=lambda dup: (-dup["count"], dup["qid"]))
 
         if duplicates:
             print(f"    ❌ CRITICAL: Found {len(duplicates)} Q-IDs shared by multiple media works!")
@@ -268,22 +354,14 @@ class DisambiguationAuditor:
         else:
             print("    ✅ PASS: No duplicate Q-IDs found.")
 
-    def _audit_missing_media_qids(self, session):
+    def _audit_missing_media_qids(self, snapshot: "GraphSnapshot"):
         """Identify MediaWork nodes missing Wikidata Q-IDs."""
         print("  [2.2] Checking for missing Wikidata Q-IDs in MediaWork...")
 
-        query = """
-        MATCH (m:MediaWork)
-        WHERE m.wikidata_id IS NULL OR m.wikidata_id = ''
-        RETURN m.media_id AS media_id,
-               m.title AS title,
-               m.media_type AS media_type,
-               m.release_year AS release_year
-        ORDER BY m.title
-        """
-
-        result = session.run(query)
-        missing = list(result)
+        missing = sorted(
+            (media for media in snapshot.media.values() if not media["wikidata_id"]),
+            key=lambda media: cypher_order(media["title"])
+        )
 
         if missing:
             print(f"    ❌ CRITICAL: Found {len(missing)} media works WITHOUT Q-IDs!")
@@ -302,23 +380,17 @@ class DisambiguationAuditor:
         else:
             print("    ✅ EXCELLENT: All media works have Wikidata Q-IDs.")
 
-    def _audit_invalid_media_qid_format(self, session):
+    def _audit_invalid_media_qid_format(self, snapshot: "GraphSnapshot"):
         """Detect MediaWork nodes with invalid Q-ID format."""
         print("  [2.3] Checking for invalid Wikidata Q-ID formats...")
 
-        query = """
-        MATCH (m:MediaWork)
-        WHERE m.wikidata_id IS NOT NULL
-          AND NOT m.wikidata_id =~ '^Q[0-9]+$'
-        RETURN m.media_id AS media_id,
-               m.title AS title,
-               m.wikidata_id AS wikidata_id,
-               m.media_type AS media_type
-        ORDER BY m.title
-        """
-
-        result = session.run(query)
-        invalid = list(result)
+        invalid = sorted(
+            (
+                media for media in snapshot.media.values()
+                if media["wikidata_id"] is not None and not QID_PATTERN.fullmatch(str(media["wikidata_id"]))
+            ),
+            key=lambda media: cypher_order(media["title"])
+        )
 
         if invalid:
             print(f"    ⚠️  WARNING: Found {len(invalid)} media works with invalid Q-ID format!")
@@ -333,24 +405,28 @@ class DisambiguationAuditor:
         else:
             print("    ✅ PASS: All Q-IDs match valid format (Q followed by digits).")
 
-    def _audit_duplicate_media_titles(self, session):
-        """Detect media works with same title but different Q-IDs."""
+    def _audit_duplicate_media_titles(self, snapshot: "GraphSnapshot"):
+        """Detect media works with the same (normalized) title but different Q-IDs."""
         print("  [2.4] Checking for duplicate titles with different Q-IDs...")
 
-        query = """
-        MATCH (m1:MediaWork)
-        MATCH (m2:MediaWork)
-        WHERE m1.media_id < m2.media_id
-          AND toLower(m1.title) = toLower(m2.title)
-          AND m1.wikidata_id <> m2.wikidata_id
-        RETURN m1.media_id AS id1, m1.title AS title1, m1.wikidata_id AS qid1,
-               m2.media_id AS id2, m2.title AS title2, m2.wikidata_id AS qid2
-        ORDER BY m1.title
-        LIMIT 20
-        """
-
-        result = session.run(query)
-        duplicates = list(result)
+        # Normalized titles are only compared within media type / release-year buckets
+        works = [
+            media for media in snapshot.media.values()
+            if media["title"] is not None and media["media_id"] is not None and media["wikidata_id"] is not None
+        ]
+        pairs = []
+        for m1, m2, _ in WorkDedupeIndex(works).duplicate_pairs(title_similarity, TITLE_MATCH_THRESHOLD):
+            if m1["wikidata_id"] != m2["wikidata_id"]:
+                pairs.append((m1, m2) if m1["media_id"] < m2["media_id"] else (m2, m1))
+        pairs.sort(key=lambda pair: (pair[0]["title"], pair[0]["media_id"], pair[1]["media_id"]))
+
+        duplicates = [
+            {
+                "id1": m1["media_id"], "title1": m1["title"], "qid1": m1["wikidata_id"],
+                "id2": m2["media_id"], "title2": m2["title"], "qid2": m2["wikidata_id"]
+            }
+            for m1, m2 in pairs[:20]
+        ]
 
         if duplicates:
             print(f"    ⚠️  WARNING: Found {len(duplicates)} title duplicates with different Q-IDs!")
@@ -368,34 +444,21 @@ class DisambiguationAuditor:
         else:
             print("    ✅ PASS: No duplicate titles with different Q-IDs.")
 
-    def _audit_orphaned_media(self, session):
+    def _audit_orphaned_media(self, snapshot: "GraphSnapshot"):
         """Identify MediaWork nodes not connected to any HistoricalFigure."""
         print("  [2.5] Checking for orphaned MediaWork nodes...")
 
-        query = """
-        MATCH (m:MediaWork)
-        WHERE NOT (m)<-[:APPEARS_IN]-(:HistoricalFigure)
-        RETURN COUNT(m) AS orphan_count
-        """
-
-        result = session.run(query)
-        count = result.single()["orphan_count"]
+        orphans = [
+            media for node_id, media in snapshot.media.items()
+            if node_id not in snapshot.media_with_figures
+        ]
+        count = len(orphans)
 
         if count > 0:
             print(f"    ℹ️  INFO: Found {count} orphaned media works (no figure relationships).")
             print(f"       Note: These may be fiction-only works or incomplete ingestions.")
             # Get sample
-            query_sample = """
-            MATCH (m:MediaWork)
-            WHERE NOT (m)<-[:APPEARS_IN]-(:HistoricalFigure)
-            RETURN m.media_id AS media_id,
-                   m.title AS title,
-                   m.media_type AS media_type
-            ORDER BY m.title
-            LIMIT 10
-            """
-            result = session.run(query_sample)
-            orphans = list(result)
+            orphans = sorted(orphans, key=lambda media: cypher_order(media["title"]))[:10]
             for media in orphans:
                 self.issues["orphaned_media"].append({
                     "media_id": media["media_id"],
@@ -405,60 +468,46 @@ class DisambiguationAuditor:
         else:
             print("    ✅ EXCELLENT: All media works are connected to at least one figure.")
 
-    def _audit_duplicate_relationships(self, session):
+    def _audit_duplicate_relationships(self, snapshot: "GraphSnapshot"):
         """Detect duplicate APPEARS_IN relationships."""
         print("  [3.1] Checking for duplicate APPEARS_IN relationships...")
 
-        query = """
-        MATCH (f:HistoricalFigure)-[r:APPEARS_IN]->(m:MediaWork)
-        WITH f, m, COUNT(r) AS rel_count
-        WHERE rel_count > 1
-        RETURN f.canonical_id, f.name, m.media_id, m.title, rel_count
-        ORDER BY rel_count DESC
-        """
-
-        result = session.run(query)
-        duplicates = list(result)
+        duplicates = [
+            (snapshot.figures[fig_id], snapshot.media[media_id], rel_count)
+            for (fig_id, media_id), rel_count in snapshot.appearances.items()
+            if rel_count > 1
+        ]
+        duplicates.sort(key=lambda dup: (-dup[2], cypher_order(dup[0]["canonical_id"]), cypher_order(dup[1]["media_id"])))
 
         if duplicates:
             print(f"    ❌ CRITICAL: Found {len(duplicates)} duplicate relationships!")
-            for dup in duplicates:
+            for fig, media, rel_count in duplicates:
                 self.issues["duplicate_relationships"].append({
-                    "figure_id": dup["f.canonical_id"],
-                    "figure_name": dup["f.name"],
-                    "media_id": dup["m.media_id"],
-                    "media_title": dup["m.title"],
-                    "count": dup["rel_count"]
+                    "figure_id": fig["canonical_id"],
+                    "figure_name": fig["name"],
+                    "media_id": media["media_id"],
+                    "media_title": media["title"],
+                    "count": rel_count
                 })
-                print(f"       - {dup['f.name']} → {dup['m.title']}: {dup['rel_count']} relationships")
+                print(f"       - {fig['name']} → {media['title']}: {rel_count} relationships")
         else:
             print("    ✅ PASS: No duplicate relationships found.")
 
-    def _gather_statistics(self, session):
+    def _gather_statistics(self, snapshot: "GraphSnapshot"):
         """Gather overall database statistics."""
         print("  [4.1] Gathering database statistics...")
 
-        query = """
-        MATCH (f:HistoricalFigure)
-        WITH COUNT(f) AS total_figures,
-             COUNT(CASE WHEN f.wikidata_id IS NOT NULL AND NOT f.wikidata_id STARTS WITH 'PROV:' THEN 1 END) AS figures_with_qid,
-             COUNT(CASE WHEN f.wikidata_id STARTS WITH 'PROV:' OR f.wikidata_id IS NULL THEN 1 END) AS figures_without_qid
-        MATCH (m:MediaWork)
-        WITH total_figures, figures_with_qid, figures_without_qid,
-             COUNT(m) AS total_media,
-             COUNT(CASE WHEN m.wikidata_id IS NOT NULL THEN 1 END) AS media_with_qid,
-             COUNT(CASE WHEN m.wikidata_id IS NULL THEN 1 END) AS media_without_qid
-        MATCH (:HistoricalFigure)-[r:APPEARS_IN]->(:MediaWork)
-        WITH total_figures, figures_with_qid, figures_without_qid,
-             total_media, media_with_qid, media_without_qid,
-             COUNT(r) AS total_portrayals
-        RETURN total_figures, figures_with_qid, figures_without_qid,
-               total_media, media_with_qid, media_without_qid,
-               total_portrayals
-        """
-
-        result = session.run(query)
-        stats = result.single()
+        figures_with_qid = sum(1 for fig in snapshot.figures.values() if has_real_qid(fig["wikidata_id"]))
+        media_with_qid = sum(1 for media in snapshot.media.values() if media["wikidata_id"] is not None)
+        stats = {
+            "total_figures": len(snapshot.figures),
+            "figures_with_qid": figures_with_qid,
+            "figures_without_qid": len(snapshot.figures) - figures_with_qid,
+            "total_media": len(snapshot.media),
+            "media_with_qid": media_with_qid,
+            "media_without_qid": len(snapshot.media) - media_with_qid,
+            "total_portrayals": sum(snapshot.appearances.values())
+        }
 
         self.stats = {
             "total_figures": stats["total_figures"],
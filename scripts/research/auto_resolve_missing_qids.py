@@ -5,43 +5,76 @@ Attempts to resolve missing Wikidata Q-IDs for HistoricalFigure nodes using SPAR
 Strategy:
 1. Fetch all figures with NULL or PROV: wikidata_ids
 2. For each figure, query Wikidata SPARQL endpoint with name + birth/death year
-3. If exactly 1 match found, update figure with resolved Q-ID
+   (concurrently, within a global SPARQL rate budget; outcomes are cached in
+   data/.ingestion-cache/qid_resolution_cache.json so reruns resume)
+3. If exactly 1 match found, update figure with resolved Q-ID (batched UNWIND writes)
 4. If 0 or >1 matches, flag for manual review
 5. Generate resolution report with success rate and review queue
 
+Usage:
+    python3 auto_resolve_missing_qids.py [--execute] [--workers N] [--sparql-rate R]
+
 Author: Claude Code (Data Architect)
 Date: 2026-01-18
 """
 
+import argparse
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
-from SPARQLWrapper import SPARQLWrapper, JSON
-import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib.wikidata_client import SPARQL_RATE, WikidataClient, get_client
+from lib.qid_resolution_cache import DEFAULT_TTL_DAYS, ResolutionCache
+
+DEFAULT_WORKERS = 4
+WRITE_BATCH_SIZE = 200
 
 
 class QIDResolver:
     """Resolves missing Wikidata Q-IDs for historical figures."""
 
-    def __init__(self, uri: str, user: str, pwd: str, dry_run: bool = True):
-        """Initialize Neo4j connection and SPARQL endpoint."""
+    def __init__(
+        self,
+        uri: str,
+        user: str,
+        pwd: str,
+        dry_run: bool = True,
+        workers: int = DEFAULT_WORKERS,
+        write_batch_size: int = WRITE_BATCH_SIZE,
+        wikidata: Optional[WikidataClient] = None,
+        cache: Optional[ResolutionCache] = None
+    ):
+        """
+        Initialize Neo4j connection and the Wikidata client.
+
+        Args:
+            workers: Concurrent Wikidata lookups (paced by the client's SPARQL budget)
+            write_batch_size: Resolved figures per UNWIND write
+            wikidata: Client to use (default: the shared client)
+            cache: Lookup outcome cache (default: on-disk ResolutionCache)
+        """
         if uri.startswith("neo4j+s://"):
             uri = uri.replace("neo4j+s://", "neo4j+ssc://")
         self.driver = GraphDatabase.driver(uri, auth=(user, pwd))
-        self.sparql = SPARQLWrapper("https://query.wikidata.org/sparql")
-        self.sparql.setReturnFormat(JSON)
+        self.wikidata = wikidata or get_client()
+        self.cache = cache if cache is not None else ResolutionCache()
         self.dry_run = dry_run
+        self.workers = max(1, workers)
+        self.write_batch_size = write_batch_size
 
         self.stats = {
             "total_figures": 0,
             "auto_resolved": 0,
             "ambiguous": 0,
             "no_match": 0,
-            "errors": 0
+            "errors": 0,
+            "cached": 0
         }
 
         self.resolutions: List[Dict] = []
@@ -77,21 +110,16 @@ class QIDResolver:
 
             return figures
 
-    def resolve_qid_for_figure(self, figure: Dict) -> Optional[str]:
-        """
-        Query Wikidata for Q-ID using name and lifespan.
-        Returns Q-ID if unique match found, None otherwise.
-        """
-        name = figure["name"]
+    def build_query(self, figure: Dict) -> str:
+        """SPARQL query for humans labelled with the figure's name (and lifespan, if known)."""
+        # Escape for the SPARQL string literal
+        name = figure["name"].replace("\\", "\\\\").replace('"', '\\"')
         birth_year = figure.get("birth_year")
         death_year = figure.get("death_year")
 
-        print(f"🔍 Resolving: {name} ({birth_year or '?'} - {death_year or '?'})")
-
-        # Build SPARQL query
         if birth_year and death_year:
             # Use both birth and death years for precision
-            query = f"""
+            return f"""
             SELECT ?person ?personLabel ?birth ?death WHERE {{
               ?person wdt:P31 wd:Q5 .  # instance of human
               ?person rdfs:label "{name}"@en .
@@ -105,7 +133,7 @@ class QIDResolver:
             """
         elif birth_year:
             # Use birth year only
-            query = f"""
+            return f"""
             SELECT ?person ?personLabel ?birth WHERE {{
               ?person wdt:P31 wd:Q5 .  # instance of human
               ?person rdfs:label "{name}"@en .
@@ -117,7 +145,7 @@ class QIDResolver:
             """
         else:
             # Name-only search (risky, likely to have multiple matches)
-            query = f"""
+            return f"""
             SELECT ?person ?personLabel WHERE {{
               ?person wdt:P31 wd:Q5 .  # instance of human
               ?person rdfs:label "{name}"@en .
@@ -126,84 +154,95 @@ class QIDResolver:
             LIMIT 10
             """
 
-        try:
-            self.sparql.setQuery(query)
-            results = self.sparql.query().convert()
-
-            # Rate limiting - be nice to Wikidata
-            time.sleep(0.5)
-
-            bindings = results["results"]["bindings"]
-
-            if len(bindings) == 1:
-                # Unique match found!
-                qid = bindings[0]["person"]["value"].split("/")[-1]
-                print(f"   ✅ Resolved to {qid}\n")
-                self.stats["auto_resolved"] += 1
-                return qid
-
-            elif len(bindings) == 0:
-                # No matches found
-                print(f"   ⚠️  No matches found in Wikidata\n")
-                self.stats["no_match"] += 1
-                self.manual_review_queue.append({
-                    "canonical_id": figure["canonical_id"],
-                    "name": name,
-                    "reason": "No Wikidata matches found",
-                    "suggestion": "Verify name spelling or check if figure exists in Wikidata"
-                })
-                return None
+    def fetch_candidates(self, figure: Dict) -> List[Dict[str, str]]:
+        """
+        Distinct Wikidata candidates for a figure (runs on worker threads).
 
-            else:
-                # Multiple matches - needs manual review
-                print(f"   ⚠️  Multiple matches ({len(bindings)}) - manual review required")
-                for binding in bindings[:5]:  # Show first 5
-                    candidate_qid = binding["person"]["value"].split("/")[-1]
-                    candidate_label = binding.get("personLabel", {}).get("value", "Unknown")
-                    print(f"      - {candidate_qid}: {candidate_label}")
-                print()
-
-                self.stats["ambiguous"] += 1
-                self.manual_review_queue.append({
-                    "canonical_id": figure["canonical_id"],
-                    "name": name,
-                    "reason": f"Ambiguous ({len(bindings)} candidates)",
-                    "candidates": [
-                        {
-                            "qid": b["person"]["value"].split("/")[-1],
-                            "label": b.get("personLabel", {}).get("value", "Unknown")
-                        }
-                        for b in bindings[:10]
-                    ]
-                })
-                return None
-
-        except Exception as e:
-            print(f"   ❌ ERROR: {e}\n")
-            self.stats["errors"] += 1
+        A person with several recorded birth/death dates comes back as several
+        rows; they count as one candidate.
+        """
+        results = self.wikidata.sparql(self.build_query(figure))
+
+        candidates = {}
+        for binding in results["results"]["bindings"]:
+            qid = binding["person"]["value"].split("/")[-1]
+            candidates.setdefault(qid, binding.get("personLabel", {}).get("value", "Unknown"))
+        return [{"qid": qid, "label": label} for qid, label in candidates.items()]
+
+    def score_candidates(self, figure: Dict, candidates: List[Dict[str, str]]) -> Optional[str]:
+        """
+        Classify a figure's candidates and record the outcome.
+        Returns Q-ID if unique match found, None otherwise.
+        """
+        name = figure["name"]
+
+        if len(candidates) == 1:
+            # Unique match found!
+            qid = candidates[0]["qid"]
+            print(f"   ✅ {name}: resolved to {qid}")
+            self.stats["auto_resolved"] += 1
+            return qid
+
+        elif len(candidates) == 0:
+            # No matches found
+            print(f"   ⚠️  {name}: no matches found in Wikidata")
+            self.stats["no_match"] += 1
+            self.manual_review_queue.append({
+                "canonical_id": figure["canonical_id"],
+                "name": name,
+                "reason": "No Wikidata matches found",
+                "suggestion": "Verify name spelling or check if figure exists in Wikidata"
+            })
+            return None
+
+        else:
+            # Multiple matches - needs manual review
+            print(f"   ⚠️  {name}: multiple matches ({len(candidates)}) - manual review required")
+            for candidate in candidates[:5]:  # Show first 5
+                print(f"      - {candidate['qid']}: {candidate['label']}")
+            self.stats["ambiguous"] += 1
+            self.manual_review_queue.append({
+                "canonical_id": figure["canonical_id"],
+                "name": name,
+                "reason": f"Ambiguous ({len(candidates)} candidates)",
+                "candidates": candidates
+            })
             return None
 
-    def update_figure_qid(self, canonical_id: str, new_qid: str):
-        """Update HistoricalFigure node with resolved Q-ID."""
+    def update_figure_qids(self, resolutions: List[Dict]):
+        """Write resolved Q-IDs back with one UNWIND per batch."""
+        if not resolutions:
+            return
         if self.dry_run:
-            print(f"   [DRY RUN] Would update {canonical_id} with Q-ID: {new_qid}")
+            for res in resolutions:
+                print(f"   [DRY RUN] Would update {res['canonical_id']} with Q-ID: {res['new_qid']}")
             return
 
-        with self.driver.session() as session:
-            query = """
-            MATCH (f:HistoricalFigure {canonical_id: $canonical_id})
-            SET f.wikidata_id = $new_qid
-            RETURN f.canonical_id AS updated_id
-            """
+        query = """
+        UNWIND $rows AS row
+        MATCH (f:HistoricalFigure {canonical_id: row.canonical_id})
+        WHERE f.wikidata_id IS NULL OR f.wikidata_id STARTS WITH 'PROV:'
+        SET f.wikidata_id = row.new_qid
+        RETURN count(f) AS updated
+        """
+        rows = [{"canonical_id": res["canonical_id"], "new_qid": res["new_qid"]} for res in resolutions]
 
-            session.run(query, canonical_id=canonical_id, new_qid=new_qid)
-            print(f"   ✅ Updated {canonical_id} → {new_qid}")
+        with self.driver.session() as session:
+            updated = session.execute_write(lambda tx: tx.run(query, rows=rows).single()["updated"])
+        print(f"   💾 Updated {updated} figures with resolved Q-IDs")
 
     def run_resolution(self):
-        """Main resolution workflow."""
+        """
+        Main resolution workflow.
+
+        Lookups run on `workers` threads, paced by the shared client's SPARQL
+        budget; outcomes are cached (and reused on the next run) and resolved
+        Q-IDs are written back `write_batch_size` at a time.
+        """
         print("=" * 80)
         print("Fictotum Automated Q-ID Resolution")
         print(f"Mode: {'DRY RUN' if self.dry_run else 'LIVE EXECUTION'}")
+        print(f"Workers: {self.workers}")
         print("=" * 80)
         print()
 
@@ -214,22 +253,70 @@ class QIDResolver:
             print("✅ All figures already have Wikidata Q-IDs!")
             return
 
-        # Attempt resolution for each figure
-        for idx, figure in enumerate(figures, 1):
-            print(f"[{idx}/{len(figures)}] ", end="")
-
-            resolved_qid = self.resolve_qid_for_figure(figure)
-
-            if resolved_qid:
-                self.resolutions.append({
-                    "canonical_id": figure["canonical_id"],
-                    "name": figure["name"],
-                    "old_qid": figure.get("current_qid"),
-                    "new_qid": resolved_qid,
-                    "status": "RESOLVED"
-                })
+        # Figures sharing a name and lifespan share one lookup
+        by_key: Dict[str, List[Dict]] = {}
+        for figure in figures:
+            key = ResolutionCache.key(figure["name"], figure.get("birth_year"), figure.get("death_year"))
+            by_key.setdefault(key, []).append(figure)
+
+        pending_writes: List[Dict] = []
+
+        def record(key: str, candidates: List[Dict[str, str]]):
+            for figure in by_key[key]:
+                resolved_qid = self.score_candidates(figure, candidates)
+                if resolved_qid:
+                    resolution = {
+                        "canonical_id": figure["canonical_id"],
+                        "name": figure["name"],
+                        "old_qid": figure.get("current_qid"),
+                        "new_qid": resolved_qid,
+                        "status": "RESOLVED"
+                    }
+                    self.resolutions.append(resolution)
+                    pending_writes.append(resolution)
+            if len(pending_writes) >= self.write_batch_size:
+                self.update_figure_qids(pending_writes)
+                pending_writes.clear()
+
+        to_fetch = []
+        for key in by_key:
+            cached = self.cache.get(key)
+            if cached is None:
+                to_fetch.append(key)
+            else:
+                self.stats["cached"] += len(by_key[key])
+                record(key, cached["candidates"])
+        if self.stats["cached"]:
+            print(f"♻️  Reused cached lookups for {self.stats['cached']} figures\n")
 
-                self.update_figure_qid(figure["canonical_id"], resolved_qid)
+        print(f"🔍 Querying Wikidata for {len(to_fetch)} distinct names...")
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = {
+                    executor.submit(self.fetch_candidates, by_key[key][0]): key
+                    for key in to_fetch
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    key = futures[future]
+                    try:
+                        candidates = future.result()
+                    except Exception as e:
+                        # Not cached: retried on the next run
+                        print(f"   ❌ {by_key[key][0]['name']}: ERROR: {e}")
+                        self.stats["errors"] += len(by_key[key])
+                        continue
+                    status = "resolved" if len(candidates) == 1 else "no_match" if not candidates else "ambiguous"
+                    self.cache.put(key, status, candidates)
+                    record(key, candidates)
+                    if done % 100 == 0:
+                        print(f"  Progress: {done}/{len(to_fetch)} lookups ({self.wikidata.describe()})")
+        finally:
+            self.update_figure_qids(pending_writes)
+            self.cache.save()
+
+        # Report in name order regardless of completion order
+        self.resolutions.sort(key=lambda res: (res["name"] or "", res["canonical_id"]))
+        self.manual_review_queue.sort(key=lambda item: (item["name"] or "", item["canonical_id"]))
 
     def generate_report(self, output_path: str):
         """Generate markdown report of resolution results."""
@@ -248,7 +335,8 @@ class QIDResolver:
             f.write(f"- **Auto-Resolved:** {self.stats['auto_resolved']} ({100.0 * self.stats['auto_resolved'] / max(self.stats['total_figures'], 1):.1f}%)\n")
             f.write(f"- **Ambiguous (Multiple Matches):** {self.stats['ambiguous']}\n")
             f.write(f"- **No Matches Found:** {self.stats['no_match']}\n")
-            f.write(f"- **Errors:** {self.stats['errors']}\n\n")
+            f.write(f"- **Errors:** {self.stats['errors']}\n")
+            f.write(f"- **Answered From Cache:** {self.stats['cached']}\n\n")
 
             # Successful resolutions
             if self.resolutions:
@@ -302,6 +390,8 @@ class QIDResolver:
         print(f"Auto-resolved: {self.stats['auto_resolved']} ({100.0 * self.stats['auto_resolved'] / max(self.stats['total_figures'], 1):.1f}%)")
         print(f"Manual review: {len(self.manual_review_queue)}")
         print(f"Errors: {self.stats['errors']}")
+        print(f"From cache: {self.stats['cached']}")
+        print(self.wikidata.describe())
         print()
 
         if self.dry_run:
@@ -320,8 +410,20 @@ def main():
         print("❌ Error: NEO4J_URI and NEO4J_PASSWORD must be set in .env")
         sys.exit(1)
 
-    # Parse command line arguments
-    dry_run = "--execute" not in sys.argv
+    parser = argparse.ArgumentParser(description="Resolve missing Wikidata Q-IDs for HistoricalFigure nodes")
+    parser.add_argument("--execute", action="store_true", help="Write resolved Q-IDs (default: dry run)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Concurrent Wikidata lookups (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--sparql-rate", type=float, default=SPARQL_RATE,
+                        help=f"SPARQL queries per second across all workers (default: {SPARQL_RATE})")
+    parser.add_argument("--write-batch-size", type=int, default=WRITE_BATCH_SIZE,
+                        help=f"Resolved figures per database write (default: {WRITE_BATCH_SIZE})")
+    parser.add_argument("--cache-ttl-days", type=float, default=DEFAULT_TTL_DAYS,
+                        help=f"Re-query cached lookups older than this (default: {DEFAULT_TTL_DAYS})")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and don't update the lookup cache")
+    args = parser.parse_args()
+
+    dry_run = not args.execute
 
     if dry_run:
         print("\n" + "⚠️ " * 20)
@@ -337,7 +439,14 @@ def main():
             sys.exit(0)
         print("🟢" * 20 + "\n")
 
-    resolver = QIDResolver(uri, user, pwd, dry_run=dry_run)
+    resolver = QIDResolver(
+        uri, user, pwd,
+        dry_run=dry_run,
+        workers=args.workers,
+        write_batch_size=args.write_batch_size,
+        wikidata=WikidataClient(sparql_rate=args.sparql_rate),
+        cache=ResolutionCache(ttl_days=args.cache_ttl_days, enabled=not args.no_cache)
+    )
 
     try:
         resolver.run_resolution()
@@ -1,12 +1,13 @@
 import json
-import time
-import ssl
-from SPARQLWrapper import SPARQLWrapper, JSON
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib.wikidata_client import get_client
 
 def harvest_centuries():
-    # Bypass SSL verification
-    ssl._create_default_https_context = ssl._create_unverified_context
-    sparql = SPARQLWrapper("https://query.wikidata.org/sparql")
+    # Shared rate-limited client (paces and retries the queries)
+    wikidata = get_client()
     
     # 1. Get Centuries 10th BC -> 21st AD
     # We'll fetch all centuries and filter in python or query logic
@@ -26,9 +27,7 @@ def harvest_centuries():
     ORDER BY ?start
     """
     
-    sparql.setQuery(century_query)
-    sparql.setReturnFormat(JSON)
-    results = sparql.query().convert()
+    results = wikidata.sparql(century_query)
     
     centuries = results["results"]["bindings"]
     print(f"✅ Found {len(centuries)} centuries to harvest.")
@@ -59,11 +58,8 @@ def harvest_centuries():
         LIMIT 20
         """
         
-        sparql.setQuery(work_query)
-        sparql.setReturnFormat(JSON)
-        
         try:
-            work_results = sparql.query().convert()
+            work_results = wikidata.sparql(work_query)
             bindings = work_results["results"]["bindings"]
             
             for item in bindings:
@@ -95,9 +91,6 @@ def harvest_centuries():
             
         except Exception as e:
             print(f"      ❌ Error harvesting {century_name}: {e}")
-            
-        # Polite delay
-        time.sleep(0.5)
 
     # 3. Save
     with open("century_harvest.json", "w") as f:
@@ -207,6 +207,16 @@ CREATE INDEX location_type_idx IF NOT EXISTS FOR (l:Location) ON (l.location_typ
 CREATE INDEX era_name_idx IF NOT EXISTS FOR (e:Era) ON (e.name);
 CREATE INDEX era_years_idx IF NOT EXISTS FOR (e:Era) ON (e.start_year, e.end_year);
 
+// Phonetic (Double Metaphone) keys for sound-alike duplicate lookups (scripts/lib/phonetic_keys.py)
+CREATE INDEX figure_phonetic_key_idx IF NOT EXISTS FOR (f:HistoricalFigure) ON (f.phonetic_key);
+CREATE INDEX figure_phonetic_key_alt_idx IF NOT EXISTS FOR (f:HistoricalFigure) ON (f.phonetic_key_alt);
+CREATE INDEX figure_phonetic_first_idx IF NOT EXISTS FOR (f:HistoricalFigure) ON (f.phonetic_first);
+CREATE INDEX figure_phonetic_last_idx IF NOT EXISTS FOR (f:HistoricalFigure) ON (f.phonetic_last);
+CREATE INDEX fictional_character_phonetic_key_idx IF NOT EXISTS FOR (c:FictionalCharacter) ON (c.phonetic_key);
+CREATE INDEX fictional_character_phonetic_key_alt_idx IF NOT EXISTS FOR (c:FictionalCharacter) ON (c.phonetic_key_alt);
+CREATE INDEX fictional_character_phonetic_first_idx IF NOT EXISTS FOR (c:FictionalCharacter) ON (c.phonetic_first);
+CREATE INDEX fictional_character_phonetic_last_idx IF NOT EXISTS FOR (c:FictionalCharacter) ON (c.phonetic_last);
+
 // Composite indexes for efficient filtering and discovery
 CREATE INDEX location_type_name_idx IF NOT EXISTS FOR (l:Location) ON (l.location_type, l.name);
 CREATE INDEX era_type_name_idx IF NOT EXISTS FOR (e:Era) ON (e.era_type, e.name);